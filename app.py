@@ -12,7 +12,7 @@ import random
 from PIL import Image
 import io
 import base64
-import requests
+from backend.services.http_client import http_get
 
 # Import chatbot components
 try:
@@ -79,8 +79,7 @@ def geocode_location(location_name):
             "format": "json",
             "limit": 1
         }
-        headers = {"User-Agent": "SmartTrafficSystem/1.0"}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, "nominatim", params=params)
         data = response.json()
         if data:
             return {
@@ -103,7 +102,7 @@ def get_route(start_coords, end_coords, alternatives=True):
             "geometries": "geojson",
             "alternatives": "true" if alternatives else "false"
         }
-        response = requests.get(url, params=params, timeout=15)
+        response = http_get(url, "osrm", params=params)
         data = response.json()
         
         if data["code"] == "Ok":
@@ -6,6 +6,7 @@ Version: 2.0
 
 import streamlit as st
 from backend.config import config
+from backend.models import warmup_models
 from backend.services import get_live_location
 from frontend.components import (
     login_page,
@@ -61,6 +62,7 @@ def init_session():
         'traffic_type': None,
         'confidence': None,
         'vehicle_count': None,
+        'vehicle_details': None,
         'clear_time': None,
         
         # Route Planning
@@ -71,9 +73,7 @@ def init_session():
         'dest_name': '',
         
         # Heatmap
-        'heatmap_data': None,
-        'heatmap_timestamp': None,
-        'heatmap_location': None
+        'heatmap_data': None
     }
     
     for key, value in defaults.items():
@@ -85,6 +85,20 @@ def init_session():
 init_session()
 
 
+# ============================================================================
+# MODEL WARMUP
+# ============================================================================
+
+@st.cache_resource(show_spinner="🤖 Loading traffic models...")
+def load_models():
+    """Load and warm up ML models once per server process"""
+    return warmup_models()
+
+
+if config.WARMUP_MODELS_ON_STARTUP:
+    load_models()
+
+
 # ============================================================================
 # APPLY THEME
 # ============================================================================
@@ -12,6 +12,59 @@ MODEL_DIR = BASE_DIR / "data" / "models"
 TRAFFICNET_MODEL = MODEL_DIR / "trafficnet_image_model.h5"
 YOLO_MODEL = MODEL_DIR / "yolov8n.pt"
 
+# TrafficNet backend: "keras", or the ONNX Runtime exports "onnx" (float32) / "onnx-int8"
+# (create them with: python -m backend.models.onnx_export --quantize)
+TRAFFICNET_BACKEND = "keras"
+TRAFFICNET_ONNX_MODEL = MODEL_DIR / "trafficnet.onnx"
+TRAFFICNET_ONNX_INT8_MODEL = MODEL_DIR / "trafficnet.int8.onnx"
+ONNX_INTRA_OP_THREADS = 0               # 0 = ONNX Runtime default (all cores)
+
+# Model input configuration (must match trin_model.py)
+MODEL_IMG_SIZE = 224
+
+# TrafficNet output classes, in the alphabetical order used by flow_from_directory
+# (accident, dense_traffic, fire, sparse_traffic)
+TRAFFICNET_CLASSES = ["Accident", "Heavy Traffic", "Fire", "Light Traffic"]
+
+# COCO class ids counted as vehicles by YOLO
+YOLO_VEHICLE_CLASSES = {2: "cars", 3: "bikes", 5: "buses", 7: "trucks"}
+YOLO_CONFIDENCE = 0.25
+YOLO_IMG_SIZE = 640                     # detector input side; frames are letterboxed, not squashed
+
+# Maximum frames per forward pass for batched inference
+MAX_BATCH_SIZE = 32
+
+# Headless camera ingestion (python -m backend.services.ingestion)
+CAMERA_CONFIG_PATH = BASE_DIR / "data" / "cameras.json"
+INGEST_DEFAULT_FPS = 1.0                # frames read per camera per second
+INGEST_QUEUE_SIZE = 4                   # frames buffered per camera; the oldest is dropped
+INGEST_DECODE_WORKERS = 4               # decode/resize threads
+INGEST_MAX_IN_FLIGHT = 32               # frames decoding or waiting for the model
+INGEST_BATCH_SIZE = 16                  # frames per micro-batch
+INGEST_BATCH_WAIT = 0.25                # seconds to wait for a micro-batch to fill
+INGEST_INFERENCE_WORKERS = 0            # >0 runs the models in that many worker processes
+INGEST_FRAME_GATE = True                # reuse results for frames that barely changed
+
+# Frame difference gate (backend.models.frame_gate)
+FRAME_GATE_SIZE = 32                    # grayscale thumbnail side compared between frames
+FRAME_GATE_PIXEL_DELTA = 8              # grey levels a thumbnail cell must move to count as changed
+FRAME_GATE_THRESHOLD = 0.005            # fraction of changed cells (5 of 1024) that triggers analysis
+FRAME_GATE_MAX_AGE = 60                 # seconds before a camera is re-analysed regardless
+
+# Inference worker processes (backend.models.worker_pool)
+INFERENCE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+INFERENCE_THREADS_PER_WORKER = 1        # framework threads per worker, so workers don't oversubscribe cores
+INFERENCE_START_METHOD = "spawn"        # TensorFlow and PyTorch are not fork-safe
+
+# Analysis result cache (keyed by image content hash + model version)
+ANALYSIS_CACHE_MAX_ENTRIES = 256
+ANALYSIS_CACHE_MAX_BYTES = 1_000_000
+ANALYSIS_CACHE_DISK = True
+ANALYSIS_CACHE_DIR = BASE_DIR / "data" / "cache" / "analysis"
+
+# Load and warm up models when the server process starts
+WARMUP_MODELS_ON_STARTUP = True
+
 # API Configuration
 NOMINATIM_API = "https://nominatim.openstreetmap.org"
 OSRM_API = "https://router.project-osrm.org"
@@ -48,6 +101,85 @@ DEFAULT_LOCATION = {
 # Request Timeout
 API_TIMEOUT = 15
 
+# HTTP client: per-service timeouts as (connect, read) seconds
+SERVICE_TIMEOUTS = {
+    "nominatim": (3.05, API_TIMEOUT),
+    "osrm": (3.05, API_TIMEOUT),
+    "ip": (3.05, 5)
+}
+
+# Keep-alive connections per host
+HTTP_POOL_SIZES = {
+    "default": 10,
+    "nominatim": 4,
+    "osrm": 10,
+    "ip": 2
+}
+
+# Client-side rate limits as (requests per second, burst); Nominatim's
+# usage policy allows at most one request per second
+SERVICE_RATE_LIMITS = {
+    "nominatim": (1.0, 1)
+}
+
+# Retries on connection errors, 429 and 5xx (exponential backoff)
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+
+# Routing backend: "osrm" (HTTP API) or "local" (in-process over ROAD_GRAPH_PATH)
+ROUTING_BACKEND = "osrm"
+ROAD_GRAPH_PATH = BASE_DIR / "data" / "road_graph.npz"
+CH_INDEX_PATH = BASE_DIR / "data" / "road_graph.ch.npz"   # optional contraction-hierarchy index
+LOCAL_ROUTING_ALT_PENALTY = 1.4         # cost multiplier on primary-route edges
+LOCAL_ROUTING_ALT_MAX_OVERLAP = 0.8     # max share of nodes an alternative may reuse
+
+# OSRM response geometry: "polyline6" (compact), "polyline" or "geojson"
+OSRM_GEOMETRY_FORMAT = "polyline6"
+
+# Route cache (shared across sessions)
+ROUTE_CACHE_GRID_M = 50                 # endpoints snapped to this grid (metres)
+ROUTE_CACHE_TTL = 15 * 60               # seconds
+ROUTE_CACHE_MAX_ENTRIES = 512
+ROUTE_CACHE_MAX_POINTS = 2_000_000      # total polyline points held in memory
+
+# Travel-time matrices: cached cell pairs and OSRM /table request size
+TRAVEL_TIME_CACHE_MAX_ENTRIES = 100_000
+OSRM_TABLE_MAX_COORDS = 100             # public OSRM server limit per request
+
+# Route rendering: max deviation (screen pixels) when simplifying polylines
+ROUTE_SIMPLIFY_PIXELS = 1.0
+
+# Live traffic overlay: analysis results attached to nearby road segments
+TRAFFIC_OVERLAY_GRID_M = 100            # segment cell size (metres)
+TRAFFIC_OVERLAY_RADIUS_M = 250          # cells covered around each camera
+TRAFFIC_OVERLAY_TTL = 30 * 60           # seconds an observation stays live
+TRAFFIC_OVERLAY_ROUTE_CACHE_ENTRIES = 64  # routes whose grid cells are kept for re-ranking
+
+# Observation store: analysis results indexed by geohash cell
+OBSERVATION_GEOHASH_PRECISION = 6       # ~1.2 km x 0.6 km cells
+OBSERVATION_RETENTION = 24 * 3600       # seconds
+RED_ZONE_RADIUS_M = 1500                # observations counted around a locality
+RED_ZONE_MAX_AGE = 60 * 60              # seconds
+
+# Heat map: observations binned on a fixed grid around the map centre
+HEATMAP_GRID_SIZE = 40                  # cells per side
+HEATMAP_EXTENT_M = 10_000               # side of the covered square (metres)
+HEATMAP_HALF_LIFE = 30 * 60             # seconds for an observation's weight to halve
+HEATMAP_REBUILD_INTERVAL = 10 * 60      # seconds between full re-aggregations
+
+# Offline gazetteer consulted before Nominatim
+GAZETTEER_PATH = BASE_DIR / "data" / "gazetteer" / "mumbai_localities.csv"
+GAZETTEER_FUZZY_MIN_SCORE = 0.65        # trigram Dice similarity for typo matches
+GAZETTEER_FUZZY_MIN_LENGTH_RATIO = 0.8  # shorter / longer length of a typo and the name it matches
+
+# Geocoding cache (in-memory LRU + SQLite under data/)
+GEOCODE_CACHE_PATH = BASE_DIR / "data" / "cache" / "geocode.sqlite3"
+GEOCODE_CACHE_MAX_ENTRIES = 2048
+GEOCODE_CACHE_TTL = 7 * 24 * 3600       # seconds
+GEOCODE_NEGATIVE_TTL = 24 * 3600        # seconds, for "not found" results
+GEOCODE_COORD_PRECISION = 4             # decimal places (~11 m) for reverse lookups
+GEOCODE_BATCH_WORKERS = 2               # overlaps request latency; the rate limit still applies
+
 class Config:
     """Configuration class"""
     
@@ -56,6 +188,24 @@ class Config:
         self.MODEL_DIR = MODEL_DIR
         self.TRAFFICNET_MODEL = TRAFFICNET_MODEL
         self.YOLO_MODEL = YOLO_MODEL
+        self.TRAFFICNET_BACKEND = TRAFFICNET_BACKEND
+        self.TRAFFICNET_ONNX_MODEL = TRAFFICNET_ONNX_MODEL
+        self.TRAFFICNET_ONNX_INT8_MODEL = TRAFFICNET_ONNX_INT8_MODEL
+        self.ONNX_INTRA_OP_THREADS = ONNX_INTRA_OP_THREADS
+        self.MODEL_IMG_SIZE = MODEL_IMG_SIZE
+        self.TRAFFICNET_CLASSES = TRAFFICNET_CLASSES
+        self.YOLO_VEHICLE_CLASSES = YOLO_VEHICLE_CLASSES
+        self.YOLO_CONFIDENCE = YOLO_CONFIDENCE
+        self.YOLO_IMG_SIZE = YOLO_IMG_SIZE
+        self.MAX_BATCH_SIZE = MAX_BATCH_SIZE
+        self.INFERENCE_WORKERS = INFERENCE_WORKERS
+        self.INFERENCE_THREADS_PER_WORKER = INFERENCE_THREADS_PER_WORKER
+        self.INFERENCE_START_METHOD = INFERENCE_START_METHOD
+        self.ANALYSIS_CACHE_MAX_ENTRIES = ANALYSIS_CACHE_MAX_ENTRIES
+        self.ANALYSIS_CACHE_MAX_BYTES = ANALYSIS_CACHE_MAX_BYTES
+        self.ANALYSIS_CACHE_DISK = ANALYSIS_CACHE_DISK
+        self.ANALYSIS_CACHE_DIR = ANALYSIS_CACHE_DIR
+        self.WARMUP_MODELS_ON_STARTUP = WARMUP_MODELS_ON_STARTUP
         self.NOMINATIM_API = NOMINATIM_API
         self.OSRM_API = OSRM_API
         self.IPGEOLOCATION_API = IPGEOLOCATION_API
@@ -71,5 +221,57 @@ class Config:
         self.MEDIUM_TRAFFIC_THRESHOLD = MEDIUM_TRAFFIC_THRESHOLD
         self.DEFAULT_LOCATION = DEFAULT_LOCATION
         self.API_TIMEOUT = API_TIMEOUT
+        self.SERVICE_TIMEOUTS = SERVICE_TIMEOUTS
+        self.HTTP_POOL_SIZES = HTTP_POOL_SIZES
+        self.SERVICE_RATE_LIMITS = SERVICE_RATE_LIMITS
+        self.HTTP_MAX_RETRIES = HTTP_MAX_RETRIES
+        self.HTTP_BACKOFF_FACTOR = HTTP_BACKOFF_FACTOR
+        self.ROUTING_BACKEND = ROUTING_BACKEND
+        self.ROAD_GRAPH_PATH = ROAD_GRAPH_PATH
+        self.CH_INDEX_PATH = CH_INDEX_PATH
+        self.LOCAL_ROUTING_ALT_PENALTY = LOCAL_ROUTING_ALT_PENALTY
+        self.LOCAL_ROUTING_ALT_MAX_OVERLAP = LOCAL_ROUTING_ALT_MAX_OVERLAP
+        self.OSRM_GEOMETRY_FORMAT = OSRM_GEOMETRY_FORMAT
+        self.ROUTE_CACHE_GRID_M = ROUTE_CACHE_GRID_M
+        self.ROUTE_CACHE_TTL = ROUTE_CACHE_TTL
+        self.ROUTE_CACHE_MAX_ENTRIES = ROUTE_CACHE_MAX_ENTRIES
+        self.ROUTE_CACHE_MAX_POINTS = ROUTE_CACHE_MAX_POINTS
+        self.TRAVEL_TIME_CACHE_MAX_ENTRIES = TRAVEL_TIME_CACHE_MAX_ENTRIES
+        self.OSRM_TABLE_MAX_COORDS = OSRM_TABLE_MAX_COORDS
+        self.CAMERA_CONFIG_PATH = CAMERA_CONFIG_PATH
+        self.INGEST_DEFAULT_FPS = INGEST_DEFAULT_FPS
+        self.INGEST_QUEUE_SIZE = INGEST_QUEUE_SIZE
+        self.INGEST_DECODE_WORKERS = INGEST_DECODE_WORKERS
+        self.INGEST_MAX_IN_FLIGHT = INGEST_MAX_IN_FLIGHT
+        self.INGEST_BATCH_SIZE = INGEST_BATCH_SIZE
+        self.INGEST_BATCH_WAIT = INGEST_BATCH_WAIT
+        self.INGEST_INFERENCE_WORKERS = INGEST_INFERENCE_WORKERS
+        self.INGEST_FRAME_GATE = INGEST_FRAME_GATE
+        self.FRAME_GATE_SIZE = FRAME_GATE_SIZE
+        self.FRAME_GATE_PIXEL_DELTA = FRAME_GATE_PIXEL_DELTA
+        self.FRAME_GATE_THRESHOLD = FRAME_GATE_THRESHOLD
+        self.FRAME_GATE_MAX_AGE = FRAME_GATE_MAX_AGE
+        self.ROUTE_SIMPLIFY_PIXELS = ROUTE_SIMPLIFY_PIXELS
+        self.TRAFFIC_OVERLAY_GRID_M = TRAFFIC_OVERLAY_GRID_M
+        self.TRAFFIC_OVERLAY_RADIUS_M = TRAFFIC_OVERLAY_RADIUS_M
+        self.TRAFFIC_OVERLAY_TTL = TRAFFIC_OVERLAY_TTL
+        self.TRAFFIC_OVERLAY_ROUTE_CACHE_ENTRIES = TRAFFIC_OVERLAY_ROUTE_CACHE_ENTRIES
+        self.OBSERVATION_GEOHASH_PRECISION = OBSERVATION_GEOHASH_PRECISION
+        self.OBSERVATION_RETENTION = OBSERVATION_RETENTION
+        self.RED_ZONE_RADIUS_M = RED_ZONE_RADIUS_M
+        self.RED_ZONE_MAX_AGE = RED_ZONE_MAX_AGE
+        self.HEATMAP_GRID_SIZE = HEATMAP_GRID_SIZE
+        self.HEATMAP_EXTENT_M = HEATMAP_EXTENT_M
+        self.HEATMAP_HALF_LIFE = HEATMAP_HALF_LIFE
+        self.HEATMAP_REBUILD_INTERVAL = HEATMAP_REBUILD_INTERVAL
+        self.GAZETTEER_PATH = GAZETTEER_PATH
+        self.GAZETTEER_FUZZY_MIN_SCORE = GAZETTEER_FUZZY_MIN_SCORE
+        self.GAZETTEER_FUZZY_MIN_LENGTH_RATIO = GAZETTEER_FUZZY_MIN_LENGTH_RATIO
+        self.GEOCODE_CACHE_PATH = GEOCODE_CACHE_PATH
+        self.GEOCODE_CACHE_MAX_ENTRIES = GEOCODE_CACHE_MAX_ENTRIES
+        self.GEOCODE_CACHE_TTL = GEOCODE_CACHE_TTL
+        self.GEOCODE_NEGATIVE_TTL = GEOCODE_NEGATIVE_TTL
+        self.GEOCODE_COORD_PRECISION = GEOCODE_COORD_PRECISION
+        self.GEOCODE_BATCH_WORKERS = GEOCODE_BATCH_WORKERS
 
 config = Config()
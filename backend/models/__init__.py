@@ -1,5 +1,42 @@
 """ML Models Package"""
-from .traffic_predictor import predict_traffic
-from .vehicle_counter import count_vehicles
+from .registry import registry
+from .preprocessing import PreparedImage, prepare_image
+from .traffic_predictor import predict_traffic, predict_traffic_batch
+from .vehicle_counter import count_vehicles, count_vehicles_batch
+from .result_cache import analysis_cache, analyze_image
+from .worker_pool import InferencePool
+from .frame_gate import FrameGate, frame_signature
 
-__all__ = ['predict_traffic', 'count_vehicles']
+
+def warmup_models() -> dict:
+    """Load and warm up all registered models once per process"""
+    return registry.warmup()
+
+
+def get_cache_stats() -> dict:
+    """Get hit/miss counters of the analysis result cache"""
+    return analysis_cache.stats()
+
+
+def get_model_stats() -> dict:
+    """Get load time and memory footprint of each registered model"""
+    return registry.stats()
+
+
+__all__ = [
+    'predict_traffic',
+    'predict_traffic_batch',
+    'count_vehicles',
+    'count_vehicles_batch',
+    'analyze_image',
+    'analysis_cache',
+    'InferencePool',
+    'FrameGate',
+    'frame_signature',
+    'PreparedImage',
+    'prepare_image',
+    'registry',
+    'warmup_models',
+    'get_model_stats',
+    'get_cache_stats'
+]
@@ -0,0 +1,70 @@
+"""
+ONNX Runtime Backend
+Runs the exported TrafficNet classifier (float32 or INT8) with ONNX Runtime on CPU
+
+Export the models with:
+    python -m backend.models.onnx_export --quantize
+"""
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from backend.config import config
+
+
+class OnnxClassifier:
+    """
+    ONNX Runtime session with the Keras ``predict`` interface used by
+    predict_traffic_batch, so either backend can sit in the model registry
+    """
+
+    def __init__(self, path: Path, threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = config.ONNX_INTRA_OP_THREADS if threads is None else threads
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.path = Path(path)
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch: np.ndarray, batch_size: Optional[int] = None, verbose: int = 0) -> np.ndarray:
+        """
+        Class probabilities for a batch
+
+        Args:
+            batch: (N, H, W, 3) float32 array normalized to [0, 1]
+            batch_size: Maximum images per session run (all at once if None)
+            verbose: Ignored (Keras compatibility)
+
+        Returns:
+            (N, num_classes) array of probabilities
+        """
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        step = batch_size or len(batch)
+        outputs = [
+            self.session.run(None, {self.input_name: batch[start:start + step]})[0]
+            for start in range(0, len(batch), step)
+        ]
+        return np.concatenate(outputs) if outputs else np.empty((0, len(config.TRAFFICNET_CLASSES)), np.float32)
+
+
+def load_onnx_classifier(path: Path) -> OnnxClassifier:
+    """
+    Load an exported TrafficNet ONNX model
+
+    Args:
+        path: .onnx file
+
+    Returns:
+        OnnxClassifier
+
+    Raises:
+        FileNotFoundError: If the model has not been exported yet
+        ImportError: If onnxruntime is not installed
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"TrafficNet ONNX model not found: {path} (run python -m backend.models.onnx_export)")
+    return OnnxClassifier(path)
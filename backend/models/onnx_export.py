@@ -0,0 +1,231 @@
+"""
+TrafficNet ONNX Export
+Converts the Keras model to ONNX, optionally quantizes it to INT8, and reports
+accuracy against latency for Keras float32, ONNX float32 and ONNX INT8 on CPU
+
+Usage:
+    python -m backend.models.onnx_export --quantize --report
+
+INT8 quantization is static (QDQ format, per-channel weights): activation
+ranges are calibrated on images sampled from the training set, preprocessed
+exactly as at inference time. Select the runtime backend with
+config.TRAFFICNET_BACKEND ("onnx" or "onnx-int8").
+"""
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from backend.config import config
+from .onnx_backend import OnnxClassifier
+from .preprocessing import prepare_image
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+DEFAULT_TRAIN_DIR = config.BASE_DIR / "trafficnet_dataset_v1" / "train"
+DEFAULT_TEST_DIR = config.BASE_DIR / "trafficnet_dataset_v1" / "test"
+
+
+def labelled_images(directory: Path, per_class: Optional[int] = None, seed: int = 0) -> List[Tuple[Path, int]]:
+    """
+    Image paths and class indices from a class-per-folder dataset
+
+    Folders are taken in alphabetical order, as flow_from_directory does,
+    so the indices line up with config.TRAFFICNET_CLASSES.
+
+    Args:
+        directory: Dataset split (e.g. trafficnet_dataset_v1/train)
+        per_class: Randomly sample at most this many images per class (all if None)
+        seed: Sampling seed
+
+    Returns:
+        List of (path, class index)
+    """
+    rng = random.Random(seed)
+    samples = []
+    for label, class_dir in enumerate(sorted(p for p in Path(directory).iterdir() if p.is_dir())):
+        paths = sorted(p for p in class_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        if per_class is not None and len(paths) > per_class:
+            paths = rng.sample(paths, per_class)
+        samples.extend((path, label) for path in paths)
+    return samples
+
+
+def load_batch(paths: List[Path]) -> np.ndarray:
+    """(N, H, W, 3) float32 model input for image files, preprocessed as at inference"""
+    return np.stack([prepare_image(path.read_bytes()).float32 for path in paths])
+
+
+def export_onnx(model_path: Path, output: Path, opset: int = 13):
+    """
+    Convert the Keras model to a float32 ONNX model with a dynamic batch axis
+
+    Args:
+        model_path: Keras model (.h5 / .keras)
+        output: ONNX file to write
+        opset: ONNX opset version
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(model_path)
+    size = config.MODEL_IMG_SIZE
+    signature = (tf.TensorSpec((None, size, size, 3), tf.float32, name="input"),)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tf2onnx.convert.from_keras(model, input_signature=signature, opset=opset, output_path=str(output))
+
+
+def quantize_int8(fp32_path: Path, output: Path, calibration_dir: Path, samples: int = 256, batch_size: int = 16):
+    """
+    Static INT8 quantization calibrated on training images
+
+    Args:
+        fp32_path: Float32 ONNX model
+        output: INT8 ONNX file to write
+        calibration_dir: Class-per-folder image directory to sample from
+        samples: Total number of calibration images (spread over the classes)
+        batch_size: Images per calibration batch
+    """
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    class_count = sum(1 for p in Path(calibration_dir).iterdir() if p.is_dir())
+    paths = [path for path, _ in labelled_images(calibration_dir, per_class=max(1, samples // max(class_count, 1)))]
+    input_name = OnnxClassifier(fp32_path).input_name
+
+    class ImageReader(CalibrationDataReader):
+        def __init__(self):
+            self._batches = iter(range(0, len(paths), batch_size))
+
+        def get_next(self):
+            start = next(self._batches, None)
+            if start is None:
+                return None
+            return {input_name: load_batch(paths[start:start + batch_size])}
+
+    # Shape inference and graph cleanup make more ops quantizable; optional step
+    source = fp32_path
+    prepared = output.with_suffix(".prep.onnx")
+    try:
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+        quant_pre_process(str(fp32_path), str(prepared))
+        source = prepared
+    except ImportError:
+        pass
+
+    try:
+        quantize_static(
+            str(source),
+            str(output),
+            ImageReader(),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8
+        )
+    finally:
+        if source != fp32_path:
+            source.unlink(missing_ok=True)
+
+
+def _measure(predict: Callable[[np.ndarray], np.ndarray], images: np.ndarray, batch_size: int) -> Dict:
+    """Predictions, single-image latency and batched throughput of one backend"""
+    predict(images[:1])  # warm up
+
+    latencies = []
+    for image in images[:min(len(images), 50)]:
+        start = time.perf_counter()
+        predict(image[None])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    probs = np.concatenate([predict(images[i:i + batch_size]) for i in range(0, len(images), batch_size)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "predictions": probs.argmax(axis=1),
+        "latency_ms": 1000 * statistics.median(latencies),
+        "throughput": len(images) / elapsed
+    }
+
+
+def report(model_paths: Dict[str, Path], test_dir: Path, per_class: int = 100, batch_size: int = 32) -> str:
+    """
+    Compare backends on the test split
+
+    Args:
+        model_paths: Backend name -> model file ("keras" entries use Keras, others ONNX Runtime)
+        test_dir: Class-per-folder test images
+        per_class: Test images sampled per class
+        batch_size: Batch size for the throughput measurement
+
+    Returns:
+        Markdown table with accuracy, agreement with the first backend,
+        median batch-1 latency, batched throughput and file size
+    """
+    samples = labelled_images(test_dir, per_class=per_class)
+    images = load_batch([path for path, _ in samples])
+    labels = np.array([label for _, label in samples])
+
+    results = {}
+    for name, path in model_paths.items():
+        if name == "keras":
+            from tensorflow import keras
+            model = keras.models.load_model(path)
+            predict = lambda batch, model=model: model.predict(batch, batch_size=len(batch), verbose=0)
+        else:
+            predict = OnnxClassifier(path).predict
+        results[name] = _measure(predict, images, batch_size)
+
+    reference = next(iter(results.values()))["predictions"]
+    lines = [
+        f"TrafficNet on {len(images)} test images (CPU, batch-1 latency is the median of "
+        f"{min(len(images), 50)} runs)",
+        "",
+        "| backend | accuracy | agreement | batch-1 latency | throughput (batch "
+        f"{batch_size}) | size |",
+        "|---|---|---|---|---|---|"
+    ]
+    for name, result in results.items():
+        lines.append(
+            f"| {name} | {(result['predictions'] == labels).mean():.2%} "
+            f"| {(result['predictions'] == reference).mean():.2%} "
+            f"| {result['latency_ms']:.1f} ms | {result['throughput']:.0f} img/s "
+            f"| {model_paths[name].stat().st_size / 1e6:.1f} MB |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export TrafficNet to ONNX (optionally INT8) and compare backends")
+    parser.add_argument("--model", type=Path, default=config.TRAFFICNET_MODEL, help="Keras model to export")
+    parser.add_argument("--output", type=Path, default=config.TRAFFICNET_ONNX_MODEL, help="Float32 ONNX output")
+    parser.add_argument("--quantize", action="store_true", help="Also write an INT8 model")
+    parser.add_argument("--int8-output", type=Path, default=config.TRAFFICNET_ONNX_INT8_MODEL, help="INT8 ONNX output")
+    parser.add_argument("--calibration-dir", type=Path, default=DEFAULT_TRAIN_DIR, help="Images for INT8 calibration")
+    parser.add_argument("--calibration-samples", type=int, default=256, help="Number of calibration images")
+    parser.add_argument("--report", action="store_true", help="Compare accuracy and latency on the test split")
+    parser.add_argument("--test-dir", type=Path, default=DEFAULT_TEST_DIR, help="Images for the report")
+    parser.add_argument("--report-path", type=Path, default=config.MODEL_DIR / "trafficnet_onnx_report.md",
+                        help="Where to write the report")
+    args = parser.parse_args()
+
+    export_onnx(args.model, args.output)
+    print(f"✅ Exported {args.model} → {args.output}")
+
+    if args.quantize:
+        quantize_int8(args.output, args.int8_output, args.calibration_dir, args.calibration_samples)
+        print(f"✅ Quantized to INT8 → {args.int8_output}")
+
+    if args.report:
+        model_paths = {"keras": args.model, "onnx": args.output}
+        if args.int8_output.exists():
+            model_paths["onnx-int8"] = args.int8_output
+        table = report(model_paths, args.test_dir)
+        args.report_path.write_text(table + "\n", encoding="utf-8")
+        print(table)
+        print(f"\nReport written to {args.report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Image Preprocessing Pipeline
+Decodes an image once and shares the resized arrays between all models
+"""
+import io
+import math
+from typing import BinaryIO, Optional, Union
+import numpy as np
+from PIL import Image
+from backend.config import config
+
+
+class PreparedImage:
+    """
+    A decoded image with the inputs of both models, ready for inference
+
+    The upload is decoded once. The classifier input (squashed to the
+    TrafficNet size, with a normalized float32 copy) and the detector input
+    (letterboxed to the YOLO size) are each computed on first access, so no
+    model decodes or resizes the same upload twice.
+    """
+
+    def __init__(self, image: Optional[Image.Image], content: Optional[bytes] = None):
+        self.image = image
+        self.content = content
+        self._uint8 = None
+        self._float32 = None
+        self._detector = None
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, detector: Optional[np.ndarray] = None) -> "PreparedImage":
+        """
+        Wrap arrays that are already at the model input sizes
+
+        Args:
+            array: (H, W, 3) uint8 classifier input (used as is, not copied)
+            detector: Letterboxed BGR detector input (derived from array if None)
+
+        Returns:
+            PreparedImage without a PIL image
+        """
+        prepared = cls(None)
+        prepared._uint8 = array
+        prepared._detector = detector
+        return prepared
+
+    @property
+    def uint8(self) -> np.ndarray:
+        """(H, W, 3) uint8 array at the model input size"""
+        if self._uint8 is None:
+            size = config.MODEL_IMG_SIZE
+            resized = self.image.convert("RGB").resize((size, size), Image.BILINEAR)
+            self._uint8 = np.asarray(resized, dtype=np.uint8)
+        return self._uint8
+
+    @property
+    def float32(self) -> np.ndarray:
+        """(H, W, 3) float32 array normalized to [0, 1]"""
+        if self._float32 is None:
+            self._float32 = self.uint8.astype(np.float32) / 255.0
+        return self._float32
+
+    @property
+    def detector(self) -> np.ndarray:
+        """(S, S, 3) uint8 BGR array letterboxed to the YOLO input size"""
+        if self._detector is None:
+            image = self.image if self.image is not None else Image.fromarray(self._uint8)
+            self._detector = letterbox(image, config.YOLO_IMG_SIZE)
+        return self._detector
+
+
+def letterbox(image: Image.Image, size: int) -> np.ndarray:
+    """
+    Fit an image into a square canvas without changing its aspect ratio
+
+    Args:
+        image: PIL Image
+        size: Canvas side
+
+    Returns:
+        (size, size, 3) uint8 array in BGR order (what Ultralytics expects
+        from arrays), padded with grey like Ultralytics' own letterbox
+    """
+    image = image.convert("RGB")
+    scale = size / max(image.size)
+    width, height = (max(1, round(side * scale)) for side in image.size)
+    if (width, height) != image.size:
+        image = image.resize((width, height), Image.BILINEAR)
+
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top, left = (size - height) // 2, (size - width) // 2
+    canvas[top:top + height, left:left + width] = np.asarray(image)[:, :, ::-1]
+    return canvas
+
+
+def decode_image(content: bytes) -> Image.Image:
+    """
+    Decode image bytes, letting JPEGs downscale during decode
+
+    Args:
+        content: Encoded image bytes
+
+    Returns:
+        Decoded PIL Image (large enough for both model inputs when possible)
+    """
+    image = Image.open(io.BytesIO(content))
+
+    if image.format == "JPEG":
+        # Draft mode picks the smallest DCT scale (1/2, 1/4, 1/8) that still
+        # covers the requested size, which is far cheaper than a full decode.
+        # Request the letterboxed detector size, and at least the classifier size
+        scale = min(1.0, config.YOLO_IMG_SIZE / max(image.size))
+        image.draft("RGB", tuple(
+            max(math.ceil(side * scale), min(side, config.MODEL_IMG_SIZE)) for side in image.size
+        ))
+
+    image.load()
+    return image
+
+
+def prepare_image(source: Union[PreparedImage, Image.Image, bytes, BinaryIO]) -> PreparedImage:
+    """
+    Prepare an image for model input
+
+    Args:
+        source: PreparedImage, PIL Image, encoded bytes or a file-like upload
+
+    Returns:
+        PreparedImage wrapping the decoded image
+    """
+    if isinstance(source, PreparedImage):
+        return source
+    if isinstance(source, Image.Image):
+        return PreparedImage(source)
+
+    if isinstance(source, bytes):
+        content = source
+    elif hasattr(source, "getvalue"):
+        # Streamlit UploadedFile / BytesIO
+        content = source.getvalue()
+    else:
+        content = source.read()
+
+    return PreparedImage(decode_image(content), content)
@@ -0,0 +1,153 @@
+"""
+Model Registry
+Loads each ML model once per process and shares it across all sessions
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+def _current_rss_bytes() -> int:
+    """
+    Get resident memory of the current process
+
+    Returns:
+        Resident set size in bytes (0 if it cannot be determined)
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+class ModelRegistry:
+    """
+    Thread-safe, process-wide registry of lazily loaded models
+
+    Models are registered with a loader (and optional warmup) callable and
+    loaded on first use. Streamlit imports modules once per server process,
+    so a module-level registry is shared by every session and rerun.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Register a model loader
+
+        Args:
+            name: Model name used for lookups
+            loader: Callable returning the loaded model
+            warmup: Optional callable run once on the loaded model
+        """
+        with self._lock:
+            self._entries[name] = {
+                "loader": loader,
+                "warmup": warmup,
+                "lock": threading.Lock(),
+                "loaded": False,
+                "model": None,
+                "stats": {"status": "not loaded"}
+            }
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Get a model, loading it on first access
+
+        Args:
+            name: Registered model name
+
+        Returns:
+            Loaded model, or None if it is unavailable
+        """
+        entry = self._entries[name]
+        if entry["loaded"]:
+            return entry["model"]
+
+        with entry["lock"]:
+            # Another thread may have finished loading while we waited
+            if not entry["loaded"]:
+                self._load(entry)
+        return entry["model"]
+
+    def _load(self, entry: Dict[str, Any]):
+        """Run the loader for an entry and record timing and memory usage"""
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+
+        try:
+            model = entry["loader"]()
+        except (ImportError, OSError) as e:
+            # Missing framework or weights: callers fall back to the stub
+            entry["stats"] = {"status": "unavailable", "error": str(e)}
+            entry["loaded"] = True
+            return
+
+        load_time = time.perf_counter() - start
+        entry["model"] = model
+        entry["stats"] = {
+            "status": "loaded",
+            "load_time": load_time,
+            "memory_bytes": max(0, _current_rss_bytes() - rss_before),
+            "warmup_time": None
+        }
+        entry["loaded"] = True
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Load models and run their warmup pass
+
+        Args:
+            names: Model names to warm up (all registered models if None)
+
+        Returns:
+            Stats for every registered model
+        """
+        for name in names or list(self._entries):
+            model = self.get(name)
+            entry = self._entries[name]
+
+            with entry["lock"]:
+                stats = entry["stats"]
+                if model is None or entry["warmup"] is None or stats.get("warmup_time") is not None:
+                    continue
+
+                start = time.perf_counter()
+                entry["warmup"](model)
+                stats["warmup_time"] = time.perf_counter() - start
+
+        return self.stats()
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a model has been loaded successfully"""
+        entry = self._entries.get(name)
+        return bool(entry and entry["model"] is not None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get load statistics for all registered models
+
+        Returns:
+            Dictionary mapping model name to status, load time and memory footprint
+        """
+        return {name: dict(entry["stats"]) for name, entry in self._entries.items()}
+
+
+# Process-wide registry instance
+registry = ModelRegistry()
@@ -0,0 +1,198 @@
+"""
+Analysis Result Cache
+Caches image analysis results by content hash and model version
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from backend.config import config
+from backend.utils.cache import LRUCache
+from .preprocessing import PreparedImage, prepare_image
+from .traffic_predictor import ImageInput, predict_traffic, trafficnet_weights
+from .vehicle_counter import get_vehicle_details
+
+
+def model_version() -> str:
+    """
+    Identify the models currently producing results
+
+    Returns:
+        Version string that changes whenever a weight file is replaced
+    """
+    parts = [config.APP_VERSION]
+    for path in (trafficnet_weights(), config.YOLO_MODEL):
+        try:
+            stat = path.stat()
+            parts.append(f"{path.name}:{stat.st_size}:{int(stat.st_mtime)}")
+        except OSError:
+            parts.append(f"{path.name}:demo")
+    return "|".join(parts)
+
+
+def image_key(image: PreparedImage, version: Optional[str] = None) -> str:
+    """
+    Build a cache key from image content and model version
+
+    Args:
+        image: Prepared image (hashes the original upload bytes when available,
+            else the decoded image, else the model input array)
+        version: Model version (defaults to model_version())
+
+    Returns:
+        Hex digest identifying the analysis result
+    """
+    digest = hashlib.sha256()
+    digest.update((version or model_version()).encode())
+
+    if image.content is not None:
+        digest.update(image.content)
+    elif image.image is not None:
+        digest.update(f"{image.image.mode}:{image.image.size}".encode())
+        digest.update(image.image.tobytes())
+    else:
+        # PreparedImage.from_array: only the model input arrays exist
+        digest.update(f"array:{image.uint8.shape}".encode())
+        digest.update(image.uint8.tobytes())
+
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of analysis results
+
+    Results live in an in-memory LRU bounded by entries and bytes, and are
+    optionally mirrored to JSON files under ``data/`` so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 1_000_000,
+        disk_dir: Optional[Path] = None
+    ):
+        self._memory = LRUCache(
+            max_entries=max_entries,
+            max_size=max_bytes,
+            sizeof=lambda value: len(json.dumps(value))
+        )
+        self._disk_dir = disk_dir
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+
+        if disk_dir is not None:
+            try:
+                disk_dir.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                self._disk_dir = None
+
+    def _disk_path(self, key: str) -> Path:
+        return self._disk_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a result in memory, then on disk
+
+        Args:
+            key: Key from image_key()
+
+        Returns:
+            Cached result dictionary or None
+        """
+        result = self._memory.get(key)
+        if result is not None or self._disk_dir is None:
+            return result
+
+        try:
+            with open(self._disk_path(key)) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._memory.put(key, result)
+        return result
+
+    def put(self, key: str, result: Dict):
+        """
+        Store a result in memory and on disk
+
+        Args:
+            key: Key from image_key()
+            result: JSON-serializable result dictionary
+        """
+        self._memory.put(key, result)
+
+        if self._disk_dir is None:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Disk tier is best effort; the memory tier still holds the result
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss counters
+
+        Returns:
+            Dictionary with memory hits, disk hits, misses and memory usage
+        """
+        memory = self._memory.stats()
+        return {
+            "entries": memory["entries"],
+            "bytes": memory["size"],
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits
+        }
+
+
+# Process-wide cache instance
+analysis_cache = AnalysisCache(
+    max_entries=config.ANALYSIS_CACHE_MAX_ENTRIES,
+    max_bytes=config.ANALYSIS_CACHE_MAX_BYTES,
+    disk_dir=config.ANALYSIS_CACHE_DIR if config.ANALYSIS_CACHE_DISK else None
+)
+
+
+def analyze_image(image: ImageInput, use_cache: bool = True) -> Dict:
+    """
+    Run both models on an image, reusing cached results for identical content
+
+    Args:
+        image: PIL Image or PreparedImage
+        use_cache: Whether to consult and fill the result cache
+
+    Returns:
+        Dictionary with traffic_type, confidence, vehicle_count and vehicles
+    """
+    prepared = prepare_image(image)
+    key = image_key(prepared) if use_cache else None
+
+    if key is not None:
+        cached = analysis_cache.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+
+    traffic_type, confidence = predict_traffic(prepared)
+    vehicles = get_vehicle_details(prepared)
+    result = {
+        "traffic_type": traffic_type,
+        "confidence": confidence,
+        "vehicle_count": vehicles["total"],
+        "vehicles": vehicles
+    }
+
+    if key is not None:
+        analysis_cache.put(key, result)
+    return dict(result, cached=False)
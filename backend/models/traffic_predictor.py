@@ -3,27 +3,63 @@ Traffic Type Prediction Model
 Uses ML model to classify traffic conditions
 """
 import random
-from typing import Tuple
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
 from PIL import Image
+from backend.config import config
+from .onnx_backend import load_onnx_classifier
+from .preprocessing import PreparedImage, prepare_image
+from .registry import registry
 
-# TODO: Replace with actual model loading
-# from tensorflow import keras
-# from backend.config import config
-# model = keras.models.load_model(config.TRAFFICNET_MODEL)
+ImageInput = Union[Image.Image, PreparedImage]
 
-def predict_traffic(image: Image.Image) -> Tuple[str, float]:
+
+def trafficnet_weights() -> Path:
     """
-    Predict traffic type from image
-    
-    Args:
-        image: PIL Image object
-        
+    Weight file used by the configured TrafficNet backend
+
     Returns:
-        Tuple of (traffic_type, confidence)
+        Keras model path, or the float32 / INT8 ONNX export
+
+    Raises:
+        ValueError: If config.TRAFFICNET_BACKEND is not "keras", "onnx" or "onnx-int8"
     """
-    # TODO: Implement actual model prediction
-    # Currently using stub for demo
-    
+    weights = {
+        "keras": config.TRAFFICNET_MODEL,
+        "onnx": config.TRAFFICNET_ONNX_MODEL,
+        "onnx-int8": config.TRAFFICNET_ONNX_INT8_MODEL
+    }
+    backend = config.TRAFFICNET_BACKEND
+    if backend not in weights:
+        raise ValueError(f"Unknown TRAFFICNET_BACKEND {backend!r} (expected one of: {', '.join(weights)})")
+    return weights[backend]
+
+
+def _load_trafficnet():
+    """Load TrafficNet for the configured backend (Keras or ONNX Runtime)"""
+    weights = trafficnet_weights()
+    if config.TRAFFICNET_BACKEND != "keras":
+        return load_onnx_classifier(weights)
+
+    from tensorflow import keras
+
+    if not weights.exists():
+        raise FileNotFoundError(f"TrafficNet weights not found: {weights}")
+    return keras.models.load_model(weights)
+
+
+def _warmup_trafficnet(model):
+    """Run one dummy forward pass so the first real prediction is fast"""
+    size = config.MODEL_IMG_SIZE
+    model.predict(np.zeros((1, size, size, 3), dtype=np.float32), verbose=0)
+
+
+registry.register("trafficnet", _load_trafficnet, _warmup_trafficnet)
+
+
+def _stub_prediction() -> Tuple[str, float]:
+    """Demo prediction used when model weights are not available"""
     traffic_types = [
         "Clear",
         "Light Traffic",
@@ -33,13 +69,58 @@ def predict_traffic(image: Image.Image) -> Tuple[str, float]:
         "Construction"
     ]
     
-    # Stub implementation
     traffic_type = random.choice(traffic_types)
     confidence = random.uniform(0.78, 0.97)
     
     return traffic_type, confidence
 
 
+def predict_traffic_batch(
+    images: Sequence[ImageInput],
+    max_batch_size: Optional[int] = None
+) -> List[Tuple[str, float]]:
+    """
+    Predict traffic type for many images with batched forward passes
+    
+    Args:
+        images: PIL Images or PreparedImages
+        max_batch_size: Maximum images per forward pass (defaults to config.MAX_BATCH_SIZE)
+        
+    Returns:
+        List of (traffic_type, confidence) tuples in input order
+    """
+    model = registry.get("trafficnet")
+    
+    if model is None:
+        return [_stub_prediction() for _ in images]
+    
+    batch_size = max_batch_size or config.MAX_BATCH_SIZE
+    results = []
+    
+    for start in range(0, len(images), batch_size):
+        batch = np.stack([prepare_image(image).float32 for image in images[start:start + batch_size]])
+        probs = model.predict(batch, batch_size=len(batch), verbose=0)
+        
+        for row in probs:
+            idx = int(row.argmax())
+            results.append((config.TRAFFICNET_CLASSES[idx], float(row[idx])))
+    
+    return results
+
+
+def predict_traffic(image: ImageInput) -> Tuple[str, float]:
+    """
+    Predict traffic type from image
+    
+    Args:
+        image: PIL Image or PreparedImage
+        
+    Returns:
+        Tuple of (traffic_type, confidence)
+    """
+    return predict_traffic_batch([image])[0]
+
+
 def analyze_traffic_severity(traffic_type: str) -> dict:
     """
     Analyze severity level of traffic condition
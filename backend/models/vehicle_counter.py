@@ -3,46 +3,111 @@ Vehicle Counting Model
 Uses YOLO/ML model to count vehicles in traffic images
 """
 import random
+from typing import List, Optional, Sequence, Union
+import numpy as np
 from PIL import Image
+from backend.config import config
+from .preprocessing import PreparedImage, prepare_image
+from .registry import registry
 
-# TODO: Replace with actual YOLO model
-# from ultralytics import YOLO
-# from backend.config import config
-# model = YOLO(config.YOLO_MODEL)
+ImageInput = Union[Image.Image, PreparedImage]
 
-def count_vehicles(image: Image.Image) -> int:
+
+def _load_yolo():
+    """Load the YOLO detector from disk"""
+    from ultralytics import YOLO
+
+    if not config.YOLO_MODEL.exists():
+        raise FileNotFoundError(f"YOLO weights not found: {config.YOLO_MODEL}")
+    return YOLO(str(config.YOLO_MODEL))
+
+
+def _warmup_yolo(model):
+    """Run one dummy detection so the first real frame is fast"""
+    size = config.YOLO_IMG_SIZE
+    model(np.zeros((size, size, 3), dtype=np.uint8), imgsz=size, verbose=False)
+
+
+registry.register("yolo", _load_yolo, _warmup_yolo)
+
+
+def _summarize(result) -> dict:
+    """Break a YOLO result down by vehicle type"""
+    counts = {name: 0 for name in config.YOLO_VEHICLE_CLASSES.values()}
+    
+    for cls in result.boxes.cls.tolist():
+        name = config.YOLO_VEHICLE_CLASSES.get(int(cls))
+        if name:
+            counts[name] += 1
+    
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def _detect_batch(model, images: Sequence[ImageInput], max_batch_size: Optional[int] = None) -> List[dict]:
+    """Run YOLO over images in batches and summarize each result"""
+    batch_size = max_batch_size or config.MAX_BATCH_SIZE
+    summaries = []
+    
+    for start in range(0, len(images), batch_size):
+        # Letterboxed BGR frames at the detector size, not the classifier's 224x224 RGB input
+        batch = [prepare_image(image).detector for image in images[start:start + batch_size]]
+        results = model(batch, imgsz=config.YOLO_IMG_SIZE, conf=config.YOLO_CONFIDENCE, verbose=False)
+        summaries.extend(_summarize(result) for result in results)
+    
+    return summaries
+
+
+def count_vehicles_batch(
+    images: Sequence[ImageInput],
+    max_batch_size: Optional[int] = None
+) -> List[int]:
     """
-    Count vehicles in the given image
+    Count vehicles in many images with batched detection
     
     Args:
-        image: PIL Image object
+        images: PIL Images or PreparedImages
+        max_batch_size: Maximum images per forward pass (defaults to config.MAX_BATCH_SIZE)
         
     Returns:
-        Number of vehicles detected
+        Vehicle counts in input order
     """
-    # TODO: Implement actual YOLO detection
-    # Currently using stub for demo
+    model = registry.get("yolo")
     
-    # results = model(image)
-    # vehicle_count = len(results[0].boxes)
+    if model is None:
+        # Stub implementation (model weights not available)
+        return [random.randint(8, 145) for _ in images]
     
-    # Stub implementation
-    vehicle_count = random.randint(8, 145)
+    return [summary["total"] for summary in _detect_batch(model, images, max_batch_size)]
+
+
+def count_vehicles(image: ImageInput) -> int:
+    """
+    Count vehicles in the given image
     
-    return vehicle_count
+    Args:
+        image: PIL Image or PreparedImage
+        
+    Returns:
+        Number of vehicles detected
+    """
+    return count_vehicles_batch([image])[0]
 
 
-def get_vehicle_details(image: Image.Image) -> dict:
+def get_vehicle_details(image: ImageInput) -> dict:
     """
     Get detailed vehicle information
     
     Args:
-        image: PIL Image object
+        image: PIL Image or PreparedImage
         
     Returns:
         Dictionary with vehicle type breakdown
     """
-    # TODO: Implement actual vehicle classification
+    model = registry.get("yolo")
+    
+    if model is not None:
+        return _detect_batch(model, [image])[0]
     
     total = count_vehicles(image)
     
@@ -0,0 +1,178 @@
+"""
+Inference Worker Pool
+Runs both models in worker processes so inference is not limited by one GIL
+
+Each worker loads the models once. Frames are passed through a block of
+shared memory split into fixed-size slots; each slot holds both model
+inputs of one frame (the classifier's resized uint8 image and the
+detector's letterboxed one). The parent copies a prepared image into a free
+slot and sends only the slot numbers, and the worker sends back
+(traffic_type, confidence, vehicle_count) tuples.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.config import config
+from .preprocessing import PreparedImage, prepare_image
+from .registry import registry
+from .traffic_predictor import ImageInput, predict_traffic_batch
+from .vehicle_counter import count_vehicles_batch
+
+# Set in each worker process by _init_worker
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_frames: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+def _slot_shapes() -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+    """Classifier and detector input shapes of one frame"""
+    return (
+        (config.MODEL_IMG_SIZE, config.MODEL_IMG_SIZE, 3),
+        (config.YOLO_IMG_SIZE, config.YOLO_IMG_SIZE, 3)
+    )
+
+
+def _slot_bytes() -> int:
+    return sum(int(np.prod(shape)) for shape in _slot_shapes())
+
+
+def _slot_views(buffer, slots: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Classifier and detector regions of the shared block, one row per slot"""
+    classifier_shape, detector_shape = _slot_shapes()
+    classifier = np.ndarray((slots, *classifier_shape), dtype=np.uint8, buffer=buffer)
+    detector = np.ndarray((slots, *detector_shape), dtype=np.uint8, buffer=buffer, offset=classifier.nbytes)
+    return classifier, detector
+
+
+def _init_worker(shm_name: str, slots: int, threads: int):
+    """Attach to the frame slots and load the models (runs once per worker)"""
+    global _worker_shm, _worker_frames
+
+    # Must be set before TensorFlow / PyTorch are imported by the model loaders
+    for var in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ.setdefault(var, str(threads))
+    config.ONNX_INTRA_OP_THREADS = threads
+
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_frames = _slot_views(_worker_shm.buf, slots)
+    registry.warmup()
+
+
+def _analyse_slots(slot_ids: List[int]) -> List[Tuple[str, float, int]]:
+    """Run both models on frames already in shared memory (runs in a worker)"""
+    classifier, detector = _worker_frames
+    images = [PreparedImage.from_array(classifier[slot], detector[slot]) for slot in slot_ids]
+    predictions = predict_traffic_batch(images)
+    counts = count_vehicles_batch(images)
+    return [
+        (traffic_type, confidence, int(count))
+        for (traffic_type, confidence), count in zip(predictions, counts)
+    ]
+
+
+class InferencePool:
+    """
+    Process pool running predict_traffic_batch and count_vehicles_batch
+
+    Use as a context manager, or call shutdown() when done. At most ``slots``
+    frames are in flight; submit() blocks until enough slots are free. Each
+    slot takes about 1.4 MB of shared memory at the default model sizes.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        slots: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        start_method: Optional[str] = None
+    ):
+        self.workers = workers or config.INFERENCE_WORKERS
+        # One model batch per worker: a slot holds a full detector frame, so they are not cheap
+        self.slots = slots or self.workers * config.MAX_BATCH_SIZE
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slots * _slot_bytes())
+        self._classifier, self._detector = _slot_views(self._shm.buf, self.slots)
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._alloc_lock = threading.Lock()
+
+        # Spawned workers do not inherit framework state (TensorFlow is not fork-safe)
+        context = multiprocessing.get_context(start_method or config.INFERENCE_START_METHOD)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._shm.name, self.slots, threads_per_worker or config.INFERENCE_THREADS_PER_WORKER)
+        )
+
+    def __enter__(self) -> "InferencePool":
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def warmup(self):
+        """Start every worker and wait until all of them have loaded the models"""
+        futures = [self._executor.submit(_analyse_slots, []) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, images: Sequence[ImageInput]) -> Future:
+        """
+        Analyse a batch of images in a worker process
+
+        Args:
+            images: PIL Images or PreparedImages (at most ``slots``)
+
+        Returns:
+            Future resolving to a list of (traffic_type, confidence, vehicle_count)
+        """
+        if len(images) > self.slots:
+            raise ValueError(f"Batch of {len(images)} frames exceeds the {self.slots} shared-memory slots")
+
+        # Allocate all slots of a batch together so concurrent callers cannot deadlock
+        with self._alloc_lock:
+            slot_ids = [self._free.get() for _ in images]
+
+        for slot, image in zip(slot_ids, images):
+            prepared = prepare_image(image)
+            self._classifier[slot] = prepared.uint8
+            self._detector[slot] = prepared.detector
+
+        future = self._executor.submit(_analyse_slots, slot_ids)
+        future.add_done_callback(lambda _: [self._free.put(slot) for slot in slot_ids])
+        return future
+
+    def analyse_batch(self, images: Sequence[ImageInput]) -> List[Dict]:
+        """
+        Analyse images spread over all workers
+
+        Args:
+            images: PIL Images or PreparedImages
+
+        Returns:
+            List of dicts with traffic_type, confidence and vehicle_count in input order
+        """
+        if not images:
+            return []
+
+        # One chunk per worker, each no larger than a model batch
+        chunk = min(config.MAX_BATCH_SIZE, -(-len(images) // self.workers))
+        futures = [self.submit(images[start:start + chunk]) for start in range(0, len(images), chunk)]
+
+        return [
+            {"traffic_type": traffic_type, "confidence": confidence, "vehicle_count": vehicle_count}
+            for future in futures
+            for traffic_type, confidence, vehicle_count in future.result()
+        ]
+
+    def shutdown(self):
+        """Stop the workers and release the shared memory"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        del self._classifier, self._detector
+        self._shm.close()
+        self._shm.unlink()
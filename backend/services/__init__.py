@@ -1,18 +1,35 @@
 """Backend Services Package"""
-from .geocoding import geocode_location, reverse_geocode
-from .routing import get_route, calculate_route_metrics
+from .geocoding import geocode_location, geocode_many, reverse_geocode
+from .routing import get_route, get_travel_time_matrix, calculate_route_metrics
 from .location import get_live_location, get_location_from_ip, format_location_display
 from .traffic_analysis import estimate_clear_time, analyze_traffic_condition, should_reroute
+from .gazetteer import lookup_locality, autocomplete_locality
+from .async_api import plan_route, plan_route_async
+from .observations import observation_store
+from .traffic_overlay import traffic_overlay, record_observation, rank_routes
+from .heatmap import get_heatmap_grid, heatmap_cells
 
 __all__ = [
     'geocode_location',
+    'geocode_many',
     'reverse_geocode',
     'get_route',
+    'get_travel_time_matrix',
     'calculate_route_metrics',
     'get_live_location',
     'get_location_from_ip',
     'format_location_display',
     'estimate_clear_time',
     'analyze_traffic_condition',
-    'should_reroute'
+    'should_reroute',
+    'observation_store',
+    'traffic_overlay',
+    'record_observation',
+    'rank_routes',
+    'get_heatmap_grid',
+    'heatmap_cells',
+    'lookup_locality',
+    'autocomplete_locality',
+    'plan_route',
+    'plan_route_async'
 ]
@@ -0,0 +1,142 @@
+"""
+Async Service API
+asyncio variants of the blocking services plus a sync facade for Streamlit pages
+
+The services share one pooled requests.Session (see http_client); the async
+variants run them on worker threads with asyncio.to_thread, so caching,
+request coalescing and rate limiting behave exactly as in the sync calls.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from backend.config import config
+from .geocoding import geocode_location, reverse_geocode
+from .observations import observation_store
+from .routing import get_route, get_travel_time_matrix
+
+
+def _with_script_ctx(func: Callable, ctx) -> Callable:
+    """Wrap func so it runs with the given Streamlit script context attached"""
+    def run(*args, **kwargs):
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            add_script_run_ctx(thread, None)
+    return run
+
+
+async def _to_thread(func: Callable, *args, **kwargs):
+    """
+    Run a blocking call on a worker thread that can still use st.* calls
+
+    The caller's Streamlit script context is attached to the worker for the
+    duration of the call, so st.error() from a service reaches the page.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return await asyncio.to_thread(_with_script_ctx(func, ctx), *args, **kwargs)
+
+
+async def geocode_location_async(location_name: str) -> Optional[Dict]:
+    """Async variant of geocode_location"""
+    return await _to_thread(geocode_location, location_name)
+
+
+async def reverse_geocode_async(lat: float, lon: float) -> Optional[str]:
+    """Async variant of reverse_geocode"""
+    return await _to_thread(reverse_geocode, lat, lon)
+
+
+async def get_route_async(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -> Optional[List[Dict]]:
+    """Async variant of get_route"""
+    return await _to_thread(get_route, start_coords, end_coords, alternatives)
+
+
+async def get_travel_time_matrix_async(
+    origins: Sequence[Dict],
+    destinations: Sequence[Dict]
+) -> Optional[np.ndarray]:
+    """Async variant of get_travel_time_matrix"""
+    return await _to_thread(get_travel_time_matrix, origins, destinations)
+
+
+async def nearby_traffic_async(lat: float, lon: float) -> Optional[Dict]:
+    """Async summary of recent observations around a point (see ObservationStore.summarize)"""
+    return await _to_thread(
+        observation_store.summarize, lat, lon, config.RED_ZONE_RADIUS_M, config.RED_ZONE_MAX_AGE
+    )
+
+
+async def plan_route_async(start_query: str, dest_query: str, alternatives: bool = True) -> Dict:
+    """
+    Geocode both endpoints concurrently, then fetch routes and nearby traffic together
+
+    The route lookup (cache, local engine or OSRM) runs alongside the
+    observation-store lookups around both endpoints. With a simulated 300 ms
+    round trip and no client rate limit, a fresh request takes 0.60 s
+    instead of 0.90 s when sequential. Against the public Nominatim server
+    two uncached geocodes still queue on its 1 request/s limit (1.6 s either
+    way), so there the saving needs a gazetteer or cache hit on one endpoint.
+
+    Args:
+        start_query: Start location name
+        dest_query: Destination location name
+        alternatives: Whether to include alternative routes
+
+    Returns:
+        Dictionary with 'start' and 'dest' geocoding results, 'routes'
+        (None when either endpoint was not found or routing failed) and
+        'traffic' with observation summaries near 'start' and 'dest'
+        (None where nothing was observed)
+    """
+    start, dest = await asyncio.gather(
+        geocode_location_async(start_query),
+        geocode_location_async(dest_query)
+    )
+
+    routes = None
+    traffic = {"start": None, "dest": None}
+    if start and dest:
+        routes, traffic["start"], traffic["dest"] = await asyncio.gather(
+            get_route_async(
+                {"lat": start["lat"], "lon": start["lon"]},
+                {"lat": dest["lat"], "lon": dest["lon"]},
+                alternatives
+            ),
+            nearby_traffic_async(start["lat"], start["lon"]),
+            nearby_traffic_async(dest["lat"], dest["lon"])
+        )
+
+    return {"start": start, "dest": dest, "routes": routes, "traffic": traffic}
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code
+
+    Streamlit scripts have no running event loop, so asyncio.run is used
+    directly; if one is already running in this thread the coroutine runs
+    on a helper thread instead.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(_with_script_ctx(asyncio.run, get_script_run_ctx(suppress_warning=True)), coro).result()
+
+
+def plan_route(start_query: str, dest_query: str, alternatives: bool = True) -> Dict:
+    """Sync facade over plan_route_async for Streamlit pages"""
+    return run_sync(plan_route_async(start_query, dest_query, alternatives))
@@ -0,0 +1,123 @@
+"""
+Camera Sources
+Local stand-ins for traffic camera streams that yield encoded JPEG frames
+
+A camera is described by a dict such as
+    {"id": "andheri-east", "source": "data/cameras/andheri", "lat": 19.1136, "lon": 72.8697, "fps": 1}
+where source is a folder of JPEG/PNG frames or an MJPEG file (concatenated
+JPEGs, as recorded from most IP cameras). Sources loop by default so a few
+recorded minutes can stand in for a live RTSP feed.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+FRAME_SUFFIXES = {".jpg", ".jpeg", ".png"}
+MJPEG_SUFFIXES = {".mjpg", ".mjpeg"}
+
+_SOI = b"\xff\xd8"
+_EOI = b"\xff\xd9"
+
+
+class FrameSource:
+    """Iterable of encoded frames; pacing is left to the reader"""
+
+    def __init__(self, path: Path, loop: bool = True):
+        self.path = Path(path)
+        self.loop = loop
+
+    def _read_once(self) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            produced = False
+            for content in self._read_once():
+                produced = True
+                yield content
+            if not (self.loop and produced):
+                return
+
+
+class FolderSource(FrameSource):
+    """Image files of a folder in name order (re-listed on every loop)"""
+
+    def _read_once(self) -> Iterator[bytes]:
+        for path in sorted(self.path.iterdir()):
+            if path.suffix.lower() in FRAME_SUFFIXES:
+                try:
+                    yield path.read_bytes()
+                except OSError:
+                    # File removed or still being written: skip this frame
+                    continue
+
+
+class MJPEGFileSource(FrameSource):
+    """JPEG frames split out of a Motion-JPEG file by their SOI/EOI markers"""
+
+    CHUNK_SIZE = 256 * 1024
+
+    def _read_once(self) -> Iterator[bytes]:
+        buffer = b""
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    return
+                buffer += chunk
+
+                while True:
+                    start = buffer.find(_SOI)
+                    if start < 0:
+                        buffer = buffer[-1:]
+                        break
+                    end = buffer.find(_EOI, start + 2)
+                    if end < 0:
+                        buffer = buffer[start:]
+                        break
+                    yield buffer[start:end + 2]
+                    buffer = buffer[end + 2:]
+
+
+def open_source(spec: Dict) -> FrameSource:
+    """
+    Create the frame source for a camera
+
+    Args:
+        spec: Camera dict with 'source' and optional 'loop' (default True)
+
+    Returns:
+        FolderSource or MJPEGFileSource
+
+    Raises:
+        ValueError: If the source is neither a folder nor an MJPEG file
+    """
+    path = Path(spec["source"])
+    loop = spec.get("loop", True)
+
+    if path.is_dir():
+        return FolderSource(path, loop)
+    if path.suffix.lower() in MJPEG_SUFFIXES and path.is_file():
+        return MJPEGFileSource(path, loop)
+    raise ValueError(f"Unsupported camera source for {spec.get('id', path)}: {path}")
+
+
+def load_cameras(path: Path) -> List[Dict]:
+    """
+    Load camera definitions from a JSON file
+
+    Args:
+        path: JSON list of camera dicts (id, source, lat, lon, optional fps and loop)
+
+    Returns:
+        List of camera dicts (relative sources are resolved against the file's folder)
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        cameras = json.load(f)
+
+    for camera in cameras:
+        source = Path(camera["source"])
+        if not source.is_absolute():
+            camera["source"] = str(path.parent / source)
+    return cameras
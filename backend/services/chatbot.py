@@ -7,6 +7,10 @@ from datetime import datetime
 import random
 import re
 from typing import Optional, Dict, Any, Tuple
+from backend.config import config
+from backend.utils import is_peak_hour
+from .gazetteer import get_gazetteer
+from .observations import observation_store
 
 
 class TrafficChatbot:
@@ -122,6 +126,40 @@ You can answer ANY question the user asks - you are not limited to traffic topic
             "timestamp": datetime.now().strftime("%I:%M %p")
         }
 
+    def _get_observed_traffic_data(self, location: str) -> Optional[Dict[str, Any]]:
+        """Summarize real analysis results recorded near a locality, if any"""
+        place = get_gazetteer().lookup(location)
+        if place is None:
+            return None
+        
+        summary = observation_store.summarize(
+            place["lat"], place["lon"], config.RED_ZONE_RADIUS_M, config.RED_ZONE_MAX_AGE
+        )
+        if summary is None:
+            return None
+        
+        vehicle_count = int(round(summary["avg_vehicles"]))
+        critical = summary["traffic_type"] in ["Accident", "Fire", "Heavy Traffic"]
+        if critical or vehicle_count >= config.MEDIUM_TRAFFIC_THRESHOLD:
+            density, color = "High", "red"
+        elif vehicle_count >= config.LOW_TRAFFIC_THRESHOLD:
+            density, color = "Medium", "orange"
+        else:
+            density, color = "Low", "green"
+        
+        return {
+            "location": location,
+            "vehicle_count": vehicle_count,
+            "density": density,
+            # Roughly 15 seconds per queued vehicle, as in estimate_clear_time
+            "delay_minutes": int(vehicle_count * 0.25),
+            "color": color,
+            "anomaly": summary["traffic_type"].lower() if summary["traffic_type"] in ["Accident", "Fire"] else None,
+            "is_peak_hour": is_peak_hour()[0],
+            "observations": summary["count"],
+            "timestamp": datetime.fromtimestamp(summary["timestamp"]).strftime("%I:%M %p")
+        }
+
     def _get_prediction_data(self, location: str, minutes_ahead: int = 15) -> Dict[str, Any]:
         """Generate traffic prediction for future"""
         current_data = self._get_mock_traffic_data(location)
@@ -178,7 +216,7 @@ You can answer ANY question the user asks - you are not limited to traffic topic
         
         red_zones = []
         for loc in all_locations:
-            data = self._get_mock_traffic_data(loc)
+            data = self._get_observed_traffic_data(loc) or self._get_mock_traffic_data(loc)
             if data["density"] == "High":
                 red_zones.append({
                     "location": loc,
@@ -251,23 +289,17 @@ You can answer ANY question the user asks - you are not limited to traffic topic
         
         # Query intents - traffic status
         if any(phrase in message_lower for phrase in ["traffic at", "traffic in", "traffic density", "current traffic", "status at", "status in", "how is traffic"]):
-            # Extract location
-            locations = ["ghatkopar", "dadar", "andheri", "bandra", "kurla", "kanjurmarg", 
-                        "vidya vihar", "mulund", "thane", "powai", "bkc", "worli", "lower parel",
-                        "cst", "churchgate", "marine drive", "borivali", "malad", "goregaon",
-                        "jogeshwari", "santacruz", "vile parle", "mumbai airport", "chembur"]
-            for loc in locations:
-                if loc in message_lower:
-                    return "query_traffic", {"location": loc.title()}
+            # Extract location from the gazetteer (tolerates typos like "ghatkoper")
+            location = get_gazetteer().find_in_text(message)
+            if location:
+                return "query_traffic", {"location": location}
             return "query_traffic", {}
         
         # Prediction intent
         if any(phrase in message_lower for phrase in ["will be congested", "prediction", "predict", "going to be busy", "will there be traffic"]):
-            locations = ["ghatkopar", "dadar", "andheri", "bandra", "kurla", "kanjurmarg",
-                        "vidya vihar", "mulund", "thane", "powai", "bkc", "worli"]
-            for loc in locations:
-                if loc in message_lower:
-                    return "query_prediction", {"location": loc.title()}
+            location = get_gazetteer().find_in_text(message)
+            if location:
+                return "query_prediction", {"location": location}
             return "query_prediction", {}
         
         # Historical data intent
@@ -324,7 +356,8 @@ You can answer ANY question the user asks - you are not limited to traffic topic
         
         elif intent == "query_traffic":
             if "location" in intent_data:
-                traffic_data = self._get_mock_traffic_data(intent_data["location"])
+                traffic_data = (self._get_observed_traffic_data(intent_data["location"])
+                                or self._get_mock_traffic_data(intent_data["location"]))
                 context += f"Current traffic data for {intent_data['location']}: {traffic_data}\n"
                 context += "Provide a helpful response about traffic conditions using this data."
             else:
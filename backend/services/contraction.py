@@ -0,0 +1,402 @@
+"""
+Contraction Hierarchies
+Offline preprocessing and fast point-to-point queries over a RoadGraph
+
+Build an index from a road graph with:
+    python -m backend.services.contraction data/road_graph.npz data/road_graph.ch.npz
+"""
+import argparse
+import heapq
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .road_graph import RoadGraph
+
+# Witness searches give up after settling this many nodes (adds a few
+# unnecessary shortcuts but keeps preprocessing fast)
+WITNESS_SETTLE_LIMIT = 60
+
+
+def _witness_search(
+    out_edges: List[Dict[int, Tuple[float, int]]],
+    source: int,
+    excluded: int,
+    max_cost: float
+) -> Dict[int, float]:
+    """Bounded Dijkstra from source that avoids the node being contracted"""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+
+    while heap and settled < WITNESS_SETTLE_LIMIT:
+        cost, node = heapq.heappop(heap)
+        if cost > max_cost:
+            break
+        if cost > dist[node]:
+            continue
+        settled += 1
+
+        for neighbour, (weight, _) in out_edges[node].items():
+            if neighbour == excluded:
+                continue
+            new_cost = cost + weight
+            if new_cost < dist.get(neighbour, math.inf):
+                dist[neighbour] = new_cost
+                heapq.heappush(heap, (new_cost, neighbour))
+
+    return dist
+
+
+def _needed_shortcuts(
+    out_edges: List[Dict[int, Tuple[float, int]]],
+    in_edges: List[Dict[int, Tuple[float, int]]],
+    node: int
+) -> List[Tuple[int, int, float]]:
+    """Shortcuts (u, w, cost) required to contract node without losing shortest paths"""
+    shortcuts = []
+    outgoing = out_edges[node]
+    if not outgoing:
+        return shortcuts
+
+    for u, (w_in, _) in in_edges[node].items():
+        targets = {w: w_in + w_out for w, (w_out, _) in outgoing.items() if w != u}
+        if not targets:
+            continue
+
+        dist = _witness_search(out_edges, u, node, max(targets.values()))
+        for w, cost in targets.items():
+            if dist.get(w, math.inf) > cost:
+                shortcuts.append((u, w, cost))
+
+    return shortcuts
+
+
+def _to_csr(rows: List[List[Tuple[int, float, int]]]):
+    """Pack per-node (neighbour, weight, middle) lists into CSR arrays"""
+    counts = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    flat = [edge for row in rows for edge in row]
+    indices = np.fromiter((e[0] for e in flat), dtype=np.int32, count=len(flat))
+    weights = np.fromiter((e[1] for e in flat), dtype=np.float32, count=len(flat))
+    middle = np.fromiter((e[2] for e in flat), dtype=np.int32, count=len(flat))
+    return indptr, indices, weights, middle
+
+
+class ContractionHierarchy:
+    """
+    Contraction-hierarchy index for point-to-point travel-time queries
+
+    ``fwd_*`` arrays hold upward edges u -> v (rank[v] > rank[u]) indexed by
+    u; ``bwd_*`` arrays hold upward edges u -> v (rank[u] > rank[v]) indexed
+    by v, so both query directions only ever move up the hierarchy.
+    ``middle`` is the contracted node a shortcut bypasses (-1 for road edges).
+    """
+
+    ARRAYS = (
+        "rank",
+        "fwd_indptr", "fwd_indices", "fwd_weight", "fwd_middle",
+        "bwd_indptr", "bwd_indices", "bwd_weight", "bwd_middle"
+    )
+
+    def __init__(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self._lists = None
+        self._middle_map = None
+
+    @classmethod
+    def build(cls, graph: RoadGraph, weights: Optional[np.ndarray] = None) -> "ContractionHierarchy":
+        """
+        Contract every node of a road graph
+
+        Nodes are contracted in order of edge difference (shortcuts added
+        minus edges removed) plus the number of already-contracted
+        neighbours, with lazy priority updates.
+
+        Args:
+            graph: Road graph
+            weights: Per-edge costs (defaults to travel time in seconds)
+
+        Returns:
+            ContractionHierarchy
+        """
+        n = graph.num_nodes
+        weights = graph.duration_s if weights is None else weights
+        out_edges: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        in_edges: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+
+        for u, v, w in zip(graph.edge_sources().tolist(), graph.indices.tolist(), weights.tolist()):
+            if u != v and w < out_edges[u].get(v, (math.inf,))[0]:
+                out_edges[u][v] = (w, -1)
+                in_edges[v][u] = (w, -1)
+
+        deleted_neighbours = [0] * n
+
+        def priority(node: int, shortcuts: list) -> int:
+            return (len(shortcuts) - len(in_edges[node]) - len(out_edges[node])
+                    + deleted_neighbours[node])
+
+        heap = [(priority(v, _needed_shortcuts(out_edges, in_edges, v)), v) for v in range(n)]
+        heapq.heapify(heap)
+
+        rank = np.empty(n, dtype=np.int32)
+        fwd: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        bwd: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        order = 0
+
+        while heap:
+            _, node = heapq.heappop(heap)
+            shortcuts = _needed_shortcuts(out_edges, in_edges, node)
+
+            # Lazy update: if the node got more expensive, try the next one first
+            new_priority = priority(node, shortcuts)
+            if heap and new_priority > heap[0][0]:
+                heapq.heappush(heap, (new_priority, node))
+                continue
+
+            rank[node] = order
+            order += 1
+
+            # Remaining neighbours are all contracted later, i.e. ranked higher
+            fwd[node] = [(w, cost, mid) for w, (cost, mid) in out_edges[node].items()]
+            bwd[node] = [(u, cost, mid) for u, (cost, mid) in in_edges[node].items()]
+
+            for u in in_edges[node]:
+                del out_edges[u][node]
+                deleted_neighbours[u] += 1
+            for w in out_edges[node]:
+                del in_edges[w][node]
+                deleted_neighbours[w] += 1
+            out_edges[node] = {}
+            in_edges[node] = {}
+
+            for u, w, cost in shortcuts:
+                if cost < out_edges[u].get(w, (math.inf,))[0]:
+                    out_edges[u][w] = (cost, node)
+                    in_edges[w][u] = (cost, node)
+
+        f_indptr, f_indices, f_weight, f_middle = _to_csr(fwd)
+        b_indptr, b_indices, b_weight, b_middle = _to_csr(bwd)
+
+        return cls(
+            rank=rank,
+            fwd_indptr=f_indptr, fwd_indices=f_indices, fwd_weight=f_weight, fwd_middle=f_middle,
+            bwd_indptr=b_indptr, bwd_indices=b_indices, bwd_weight=b_weight, bwd_middle=b_middle
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ContractionHierarchy":
+        """Load an index saved with save()"""
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls.ARRAYS})
+
+    def save(self, path: Path):
+        """Save the index as an uncompressed .npz (fast to load)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the index arrays in bytes"""
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    def _adjacency(self):
+        """Plain-Python views of the index arrays, built once"""
+        if self._lists is None:
+            self._lists = tuple(getattr(self, name).tolist() for name in self.ARRAYS)
+        return self._lists
+
+    def _middles(self) -> Dict[Tuple[int, int], int]:
+        """(u, v) -> middle node of the cheapest hierarchy edge, built once for unpacking"""
+        if self._middle_map is None:
+            _, f_ptr, f_idx, f_w, f_mid, b_ptr, b_idx, b_w, b_mid = self._adjacency()
+            best: Dict[Tuple[int, int], Tuple[float, int]] = {}
+            for node in range(len(f_ptr) - 1):
+                for edge in range(f_ptr[node], f_ptr[node + 1]):
+                    key = (node, f_idx[edge])
+                    if f_w[edge] < best.get(key, (math.inf,))[0]:
+                        best[key] = (f_w[edge], f_mid[edge])
+                for edge in range(b_ptr[node], b_ptr[node + 1]):
+                    key = (b_idx[edge], node)
+                    if b_w[edge] < best.get(key, (math.inf,))[0]:
+                        best[key] = (b_w[edge], b_mid[edge])
+            self._middle_map = {key: middle for key, (_, middle) in best.items()}
+        return self._middle_map
+
+    def _unpack(self, nodes: List[int]) -> List[int]:
+        """Expand a path of hierarchy edges into original road nodes"""
+        middles = self._middles()
+        path = [nodes[0]]
+        for u, v in zip(nodes, nodes[1:]):
+            stack = [(u, v)]
+            while stack:
+                a, b = stack.pop()
+                middle = middles[(a, b)]
+                if middle == -1:
+                    path.append(b)
+                else:
+                    # Process (a, middle) first, so push it last
+                    stack.append((middle, b))
+                    stack.append((a, middle))
+        return path
+
+    def query(self, source: int, target: int) -> Tuple[float, Optional[List[int]]]:
+        """
+        Shortest path between two nodes
+
+        Runs a bidirectional Dijkstra where both searches only relax upward
+        edges (with stall-on-demand pruning), stopping once neither queue can
+        improve the best meeting point.
+
+        Args:
+            source: Start node
+            target: End node
+
+        Returns:
+            Tuple of (cost, node path) or (inf, None) if unreachable
+        """
+        if source == target:
+            return 0.0, [source]
+
+        _, f_ptr, f_idx, f_w, _, b_ptr, b_idx, b_w, _ = self._adjacency()
+
+        dist = ({source: 0.0}, {target: 0.0})
+        parent = ({source: -1}, {target: -1})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        adjacency = ((f_ptr, f_idx, f_w), (b_ptr, b_idx, b_w))
+        best, meeting = math.inf, -1
+
+        while heaps[0] or heaps[1]:
+            tops = [heap[0][0] if heap else math.inf for heap in heaps]
+            if min(tops) >= best:
+                break
+
+            side = 0 if tops[0] <= tops[1] else 1
+            cost, node = heapq.heappop(heaps[side])
+            if cost > dist[side][node]:
+                continue
+
+            other = dist[1 - side].get(node)
+            if other is not None and cost + other < best:
+                best, meeting = cost + other, node
+
+            own_dist, own_parent = dist[side], parent[side]
+
+            # Stall-on-demand: if a higher-ranked node already reaches this one
+            # more cheaply via a downward edge, its search cannot lead anywhere useful
+            s_ptr, s_idx, s_w = adjacency[1 - side]
+            if any(
+                own_dist.get(s_idx[edge], math.inf) + s_w[edge] < cost
+                for edge in range(s_ptr[node], s_ptr[node + 1])
+            ):
+                continue
+
+            ptr, idx, weight = adjacency[side]
+            for edge in range(ptr[node], ptr[node + 1]):
+                neighbour = idx[edge]
+                new_cost = cost + weight[edge]
+                if new_cost < own_dist.get(neighbour, math.inf):
+                    own_dist[neighbour] = new_cost
+                    own_parent[neighbour] = node
+                    heapq.heappush(heaps[side], (new_cost, neighbour))
+
+        if meeting == -1:
+            return math.inf, None
+
+        forward = [meeting]
+        while parent[0][forward[-1]] != -1:
+            forward.append(parent[0][forward[-1]])
+        backward = [meeting]
+        while parent[1][backward[-1]] != -1:
+            backward.append(parent[1][backward[-1]])
+
+        return best, self._unpack(forward[::-1] + backward[1:])
+
+    def _upward_search(self, origin: int, forward: bool) -> Dict[int, float]:
+        """
+        Exhaustive upward Dijkstra from one node (with stall-on-demand)
+
+        Args:
+            origin: Start node
+            forward: True to follow edges out of origin, False for edges into it
+
+        Returns:
+            Dictionary of settled, non-stalled node -> cost
+        """
+        _, f_ptr, f_idx, f_w, _, b_ptr, b_idx, b_w, _ = self._adjacency()
+        ptr, idx, weight = (f_ptr, f_idx, f_w) if forward else (b_ptr, b_idx, b_w)
+        s_ptr, s_idx, s_w = (b_ptr, b_idx, b_w) if forward else (f_ptr, f_idx, f_w)
+
+        dist = {origin: 0.0}
+        settled = {}
+        heap = [(0.0, origin)]
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > dist[node] or node in settled:
+                continue
+            if any(
+                dist.get(s_idx[edge], math.inf) + s_w[edge] < cost
+                for edge in range(s_ptr[node], s_ptr[node + 1])
+            ):
+                continue
+            settled[node] = cost
+
+            for edge in range(ptr[node], ptr[node + 1]):
+                neighbour = idx[edge]
+                new_cost = cost + weight[edge]
+                if new_cost < dist.get(neighbour, math.inf):
+                    dist[neighbour] = new_cost
+                    heapq.heappush(heap, (new_cost, neighbour))
+
+        return settled
+
+    def many_to_many(self, sources: Sequence[int], targets: Sequence[int]) -> np.ndarray:
+        """
+        Shortest-path costs between every source and target
+
+        Bucket-based: one backward upward search per target leaves
+        (target, cost) entries at every node it settles, then one forward
+        upward search per source scans the buckets it meets. Costs |S| + |T|
+        searches instead of |S| x |T| queries.
+
+        Args:
+            sources: Start nodes
+            targets: End nodes
+
+        Returns:
+            (len(sources), len(targets)) float64 array of costs (inf if unreachable)
+        """
+        buckets: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+        for j, target in enumerate(targets):
+            for node, cost in self._upward_search(target, forward=False).items():
+                buckets[node].append((j, cost))
+
+        result = np.full((len(sources), len(targets)), math.inf)
+        for i, source in enumerate(sources):
+            row = [math.inf] * len(targets)
+            for node, cost in self._upward_search(source, forward=True).items():
+                for j, to_target in buckets.get(node, ()):
+                    if cost + to_target < row[j]:
+                        row[j] = cost + to_target
+            result[i] = row
+
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a contraction-hierarchy index for a road graph")
+    parser.add_argument("graph", type=Path, help="Road graph .npz (e.g. data/road_graph.npz)")
+    parser.add_argument("output", type=Path, help="Output index .npz (e.g. data/road_graph.ch.npz)")
+    args = parser.parse_args()
+
+    graph = RoadGraph.load(args.graph)
+    ch = ContractionHierarchy.build(graph)
+    ch.save(args.output)
+    print(f"✅ Contracted {graph.num_nodes:,} nodes; index is {ch.nbytes / 1e6:.1f} MB → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
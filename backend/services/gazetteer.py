@@ -0,0 +1,285 @@
+"""
+Gazetteer Service
+Offline index of Mumbai localities for instant geocoding and autocomplete
+
+Localities are loaded from data/gazetteer/mumbai_localities.csv (name,
+pipe-separated aliases, region, lat, lon). Exact names and aliases resolve
+with one dict lookup, prefixes with a binary search over the sorted names,
+and typos ("ghatkoper") through a character-trigram index. A typo match must
+be the whole query, with about as many words and characters as the name, so
+more specific places ("Andheri East", "Powai Lake") are left to Nominatim.
+"""
+import bisect
+import csv
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+from backend.config import config
+
+# Trailing address parts that carry no locality information ("Dadar, Mumbai")
+_GENERIC_PARTS = {"mumbai", "india", "maharashtra", "mumbai india", "mumbai maharashtra"}
+
+# Words common to many place names; a query made only of these is never typo-matched
+_STOP_WORDS = {
+    "station", "road", "rd", "east", "west", "north", "south", "nagar", "marg", "lake", "beach",
+    "bridge", "junction", "chowk", "naka", "market", "terminus", "stop"
+}
+
+
+def normalize_name(text: str) -> str:
+    """
+    Normalize a locality name or query for matching
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Lowercase words separated by single spaces, without generic
+        trailing parts such as ", Mumbai"
+    """
+    parts = [re.sub(r"[^a-z0-9]+", " ", part.lower()).strip() for part in text.split(",")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return ""
+    kept = [parts[0]] + [part for part in parts[1:] if part not in _GENERIC_PARTS]
+    return " ".join(kept)
+
+
+def _trigrams(key: str) -> List[str]:
+    """Character trigrams of a key, padded so word starts and ends count"""
+    padded = f"  {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class Gazetteer:
+    """
+    In-memory locality index
+
+    ``keys`` holds every normalized name and alias in sorted order; each key
+    maps to one locality entry.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self._exact: Dict[str, int] = {}
+
+        for idx, entry in enumerate(entries):
+            for name in [entry["name"], *entry["aliases"]]:
+                key = normalize_name(name)
+                if key:
+                    self._exact.setdefault(key, idx)
+
+        self.keys = sorted(self._exact)
+        self._trigram_index: Dict[str, List[int]] = {}
+        self._trigram_counts = []
+        for key_idx, key in enumerate(self.keys):
+            grams = set(_trigrams(key))
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(key_idx)
+
+    @classmethod
+    def load(cls, path: Path) -> "Gazetteer":
+        """
+        Load localities from a CSV file
+
+        Args:
+            path: CSV with name, aliases, region, lat and lon columns
+
+        Returns:
+            Gazetteer (empty if the file does not exist)
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls([])
+
+        entries = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = row["name"].strip()
+                region = (row.get("region") or "Mumbai").strip()
+                entries.append({
+                    "name": name,
+                    "aliases": [alias.strip() for alias in (row.get("aliases") or "").split("|") if alias.strip()],
+                    "lat": float(row["lat"]),
+                    "lon": float(row["lon"]),
+                    "display_name": f"{name}, {region}, Maharashtra, India"
+                })
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _result(self, idx: int) -> Dict:
+        """Geocoding-shaped result for an entry"""
+        entry = self.entries[idx]
+        return {"lat": entry["lat"], "lon": entry["lon"], "display_name": entry["display_name"]}
+
+    def lookup(self, query: str) -> Optional[Dict]:
+        """
+        Exact match on a locality name or alias
+
+        Args:
+            query: Location text (e.g. "Kanjur Marg, Mumbai")
+
+        Returns:
+            Dictionary with lat, lon and display_name, or None
+        """
+        idx = self._exact.get(normalize_name(query))
+        return None if idx is None else self._result(idx)
+
+    def _match(self, key: str, min_score: float, max_word_diff: int = 1) -> Optional[int]:
+        """
+        Entry index for a normalized key: exact, else best trigram (Dice) match
+
+        Typo candidates must differ from the key by at most ``max_word_diff``
+        words ("kanjur marg" / "kanjurmarg") and have a similar length, so a
+        name never matches a longer query that merely contains it.
+        """
+        exact = self._exact.get(key)
+        if exact is not None or key in _GENERIC_PARTS:
+            # "Mumbai" alone is the city, not a near-miss of "Navi Mumbai"
+            return exact
+
+        words = key.split()
+        if all(word in _STOP_WORDS for word in words):
+            return None
+
+        grams = set(_trigrams(key))
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigram_index.get(gram, ()))
+
+        min_ratio = config.GAZETTEER_FUZZY_MIN_LENGTH_RATIO
+        candidates = []
+        for key_idx in shared:
+            candidate = self.keys[key_idx]
+            if abs(len(candidate.split()) - len(words)) > max_word_diff:
+                continue
+            if min(len(candidate), len(key)) < min_ratio * max(len(candidate), len(key)):
+                continue
+            candidates.append(key_idx)
+        if not candidates:
+            return None
+
+        def dice(key_idx: int) -> float:
+            return 2 * shared[key_idx] / (len(grams) + self._trigram_counts[key_idx])
+
+        best = max(candidates, key=dice)
+        if dice(best) < min_score:
+            return None
+        return self._exact[self.keys[best]]
+
+    def fuzzy_lookup(self, query: str, min_score: Optional[float] = None) -> Optional[Dict]:
+        """
+        Exact match, else a name the whole query is a typo of
+
+        Args:
+            query: Location text
+            min_score: Minimum Dice similarity (defaults to config.GAZETTEER_FUZZY_MIN_SCORE)
+
+        Returns:
+            Dictionary with lat, lon and display_name, or None
+        """
+        key = normalize_name(query)
+        if not key:
+            return None
+
+        min_score = config.GAZETTEER_FUZZY_MIN_SCORE if min_score is None else min_score
+        idx = self._match(key, min_score)
+        return None if idx is None else self._result(idx)
+
+    def autocomplete(self, prefix: str, limit: int = 8) -> List[str]:
+        """
+        Locality names starting with a prefix (matching names or aliases)
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Canonical locality names, alphabetical by matched key
+        """
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        names = []
+        start = bisect.bisect_left(self.keys, prefix)
+        for key in self.keys[start:]:
+            if not key.startswith(prefix) or len(names) >= limit:
+                break
+            name = self.entries[self._exact[key]]["name"]
+            if name not in names:
+                names.append(name)
+        return names
+
+    def find_in_text(self, text: str, fuzzy: bool = True) -> Optional[str]:
+        """
+        Find a locality mentioned in free text, preferring the longest match
+
+        Args:
+            text: Message text
+            fuzzy: Also try trigram matching of single words against
+                one-word names (for typos)
+
+        Returns:
+            Canonical locality name, or None
+        """
+        words = re.findall(r"[a-z0-9]+", text.lower())
+
+        for size in range(min(5, len(words)), 0, -1):
+            for i in range(len(words) - size + 1):
+                idx = self._exact.get(" ".join(words[i:i + size]))
+                if idx is not None:
+                    return self.entries[idx]["name"]
+
+        if fuzzy:
+            for word in words:
+                # Short words ("to", "the") match too many names by accident
+                if len(word) >= 5:
+                    idx = self._match(word, config.GAZETTEER_FUZZY_MIN_SCORE, max_word_diff=0)
+                    if idx is not None:
+                        return self.entries[idx]["name"]
+        return None
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    Load the gazetteer from data/ once per process
+
+    Returns:
+        Gazetteer (empty if no file is configured or present)
+    """
+    global _gazetteer
+
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                path = config.GAZETTEER_PATH
+                _gazetteer = Gazetteer.load(path) if path else Gazetteer([])
+    return _gazetteer
+
+
+def lookup_locality(query: str) -> Optional[Dict]:
+    """
+    Resolve a location name from the gazetteer (exact, then whole-query typo)
+
+    Args:
+        query: Location text
+
+    Returns:
+        Dictionary with lat, lon and display_name, or None on a miss
+    """
+    return get_gazetteer().fuzzy_lookup(query)
+
+
+def autocomplete_locality(prefix: str, limit: int = 8) -> List[str]:
+    """Locality names starting with prefix (see Gazetteer.autocomplete)"""
+    return get_gazetteer().autocomplete(prefix, limit)
@@ -2,48 +2,178 @@
 Geocoding Service
 Converts location names to coordinates and vice versa
 """
+import re
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
 import requests
 import streamlit as st
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Sequence, Callable
 from backend.config import config
+from backend.utils.cache import LRUCache, MISSING, SQLiteCache, TieredCache
+from .gazetteer import lookup_locality
+from .http_client import http_get
+
+
+def _create_cache() -> TieredCache:
+    """Create the two-tier geocoding cache (memory LRU + SQLite)"""
+    disk = None
+    if config.GEOCODE_CACHE_PATH:
+        try:
+            disk = SQLiteCache(config.GEOCODE_CACHE_PATH, table="geocode")
+        except (OSError, sqlite3.Error):
+            # Fall back to memory-only caching if the file cannot be opened
+            disk = None
+    
+    memory = LRUCache(max_entries=config.GEOCODE_CACHE_MAX_ENTRIES, ttl=config.GEOCODE_CACHE_TTL)
+    return TieredCache(memory, disk)
+
+
+# Shared by all sessions in this process
+_cache = _create_cache()
+
+# Lookups currently being fetched, keyed like the cache, so concurrent
+# callers asking for the same thing share one request
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def normalize_query(location_name: str) -> str:
+    """
+    Normalize a location query for cache lookups
+    
+    Args:
+        location_name: Raw location text
+        
+    Returns:
+        Lowercase query with collapsed whitespace and no trailing punctuation
+    """
+    query = re.sub(r"\s+", " ", location_name.strip().lower())
+    return query.strip(" ,.;!?")
+
+
+def _search_key(location_name: str) -> str:
+    return f"search:{normalize_query(location_name)}"
+
+
+def _reverse_key(lat: float, lon: float) -> str:
+    precision = config.GEOCODE_COORD_PRECISION
+    return f"reverse:{round(lat, precision)},{round(lon, precision)}"
+
+
+def _store(key: str, result):
+    """Cache a result; 'not found' results use the shorter negative TTL"""
+    ttl = config.GEOCODE_CACHE_TTL if result is not None else config.GEOCODE_NEGATIVE_TTL
+    _cache.put(key, result, ttl=ttl)
+
+
+def get_geocode_cache_stats() -> Dict:
+    """Get hit/miss counters of the geocoding cache"""
+    return _cache.stats()
+
+
+def _coalesced(key: str, fetch: Callable):
+    """
+    Run fetch once per key at a time; concurrent callers wait for its result
+    
+    Args:
+        key: Cache key of the lookup
+        fetch: Function performing the request (may raise)
+        
+    Returns:
+        Result of fetch, from this call or from the request already in flight
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight[key] = future
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        result = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _fetch_search(location_name: str) -> Optional[Dict]:
+    """Query Nominatim search and cache the result (raises on request errors)"""
+    url = f"{config.NOMINATIM_API}/search"
+    params = {
+        "q": location_name,
+        "format": "json",
+        "limit": 1
+    }
+    response = http_get(url, "nominatim", params=params)
+    response.raise_for_status()
+    
+    data = response.json()
+    
+    result = None
+    if data:
+        result = {
+            "lat": float(data[0]["lat"]),
+            "lon": float(data[0]["lon"]),
+            "display_name": data[0]["display_name"]
+        }
+    
+    _store(_search_key(location_name), result)
+    return result
+
+
+def _fetch_reverse(lat: float, lon: float) -> Optional[str]:
+    """Query Nominatim reverse and cache the result (raises on request errors)"""
+    url = f"{config.NOMINATIM_API}/reverse"
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "format": "json"
+    }
+    response = http_get(url, "nominatim", params=params)
+    response.raise_for_status()
+    
+    data = response.json()
+    
+    result = data.get("display_name")
+    _store(_reverse_key(lat, lon), result)
+    return result
 
 
 def geocode_location(location_name: str) -> Optional[Dict]:
     """
     Convert location name to coordinates using OpenStreetMap Nominatim
     
+    Known Mumbai localities are answered from the offline gazetteer first;
+    Nominatim is only queried on a miss.
+    
     Args:
         location_name: Name of the location to geocode
         
     Returns:
         Dictionary with lat, lon, and display_name or None if not found
     """
+    local = lookup_locality(location_name)
+    if local is not None:
+        return local
+    
+    key = _search_key(location_name)
+    cached = _cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
     try:
-        url = f"{config.NOMINATIM_API}/search"
-        params = {
-            "q": location_name,
-            "format": "json",
-            "limit": 1
-        }
-        headers = {"User-Agent": f"{config.APP_NAME}/{config.APP_VERSION}"}
-        
-        response = requests.get(
-            url, 
-            params=params, 
-            headers=headers, 
-            timeout=config.API_TIMEOUT
-        )
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data:
-            return {
-                "lat": float(data[0]["lat"]),
-                "lon": float(data[0]["lon"]),
-                "display_name": data[0]["display_name"]
-            }
-        return None
+        return _coalesced(key, partial(_fetch_search, location_name))
         
     except requests.RequestException as e:
         st.error(f"Geocoding error: {e}")
@@ -53,6 +183,75 @@ def geocode_location(location_name: str) -> Optional[Dict]:
         return None
 
 
+def geocode_many(
+    queries: Sequence[str],
+    progress: Optional[Callable[[int, int, str, Optional[Dict]], None]] = None
+) -> List[Optional[Dict]]:
+    """
+    Geocode many location names at once
+    
+    Identical queries (after normalization) are looked up once; gazetteer
+    and cached results are returned immediately. The rest run on a small thread pool; every
+    request still waits for the shared Nominatim rate limiter, and queries
+    already in flight elsewhere are shared rather than repeated.
+    
+    Args:
+        queries: Location names
+        progress: Optional callback(done, total, query, result), called in the
+            caller's thread as each unique query resolves
+        
+    Returns:
+        Results in the same order as queries (None where not found or failed)
+    """
+    unique: Dict[str, str] = {}
+    for query in queries:
+        unique.setdefault(_search_key(query), query)
+    
+    results: Dict[str, Optional[Dict]] = {}
+    pending: Dict[str, str] = {}
+    total = len(unique)
+    done = 0
+    
+    for key, query in unique.items():
+        cached = None
+        if normalize_query(query):
+            cached = lookup_locality(query)
+            if cached is None:
+                cached = _cache.get(key, MISSING)
+        if cached is MISSING:
+            pending[key] = query
+            continue
+        results[key] = cached
+        done += 1
+        if progress:
+            progress(done, total, query, cached)
+    
+    errors = []
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(config.GEOCODE_BATCH_WORKERS, len(pending))) as pool:
+            futures = {
+                pool.submit(_coalesced, key, partial(_fetch_search, query)): key
+                for key, query in pending.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    result = future.result()
+                except (requests.RequestException, KeyError, IndexError, ValueError) as e:
+                    result = None
+                    errors.append(f"{pending[key]} ({e})")
+                
+                results[key] = result
+                done += 1
+                if progress:
+                    progress(done, total, pending[key], result)
+    
+    if errors:
+        st.error(f"Geocoding failed for {len(errors)} location(s): {'; '.join(errors[:3])}")
+    
+    return [results[_search_key(query)] for query in queries]
+
+
 def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     """
     Convert coordinates to location name
@@ -64,28 +263,13 @@ def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     Returns:
         Location name or None if not found
     """
+    key = _reverse_key(lat, lon)
+    cached = _cache.get(key, MISSING)
+    if cached is not MISSING:
+        return cached
+    
     try:
-        url = f"{config.NOMINATIM_API}/reverse"
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "format": "json"
-        }
-        headers = {"User-Agent": f"{config.APP_NAME}/{config.APP_VERSION}"}
-        
-        response = requests.get(
-            url, 
-            params=params, 
-            headers=headers, 
-            timeout=config.API_TIMEOUT
-        )
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if "display_name" in data:
-            return data["display_name"]
-        return None
+        return _coalesced(key, partial(_fetch_reverse, lat, lon))
         
     except requests.RequestException as e:
         st.error(f"Reverse geocoding error: {e}")
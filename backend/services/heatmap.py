@@ -0,0 +1,212 @@
+"""
+Heatmap Aggregation
+Traffic observations binned on a fixed grid around the map centre
+
+Each grid cell holds time-decayed sums of the observations inside it, so the
+result has grid_size x grid_size cells however many observations are stored.
+The sums are kept relative to a reference time: decaying the whole grid to
+"now" is one multiplication, and a new observation only adds to its own cell.
+"""
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from backend.config import config
+from backend.utils.cache import LRUCache
+from backend.utils.geo import METERS_PER_DEGREE
+from backend.utils.helpers import get_density_level
+from .observations import ObservationStore, observation_store
+
+
+class _GridState:
+    """Accumulated sums for one grid window"""
+
+    __slots__ = ("lat_edges", "lon_edges", "weight", "weighted_vehicles", "count", "t_ref", "seq", "built_at")
+
+    def __init__(self, lat_edges: np.ndarray, lon_edges: np.ndarray, t_ref: float):
+        self.lat_edges = lat_edges
+        self.lon_edges = lon_edges
+        self.t_ref = t_ref
+        self.built_at = t_ref
+        self.seq = 0
+
+
+class HeatmapAggregator:
+    """
+    Incrementally maintained heat map grids over an observation store
+
+    Grids are anchored to multiples of the cell size, so small moves of the
+    map centre reuse the same window. A window is re-aggregated from scratch
+    in one vectorized histogram pass every ``rebuild_interval`` seconds
+    (dropping expired observations); in between, only observations added
+    since the last call are binned into their cells.
+    """
+
+    def __init__(
+        self,
+        store: ObservationStore,
+        grid_size: int,
+        extent_m: float,
+        half_life: float,
+        rebuild_interval: float
+    ):
+        self.store = store
+        self.grid_size = grid_size
+        self.cell_m = extent_m / grid_size
+        self.tau = half_life / math.log(2)
+        self.rebuild_interval = rebuild_interval
+        self._states = LRUCache(max_entries=16)
+        self._lock = threading.Lock()
+
+    def _window(self, center_lat: float, center_lon: float) -> Tuple[Tuple, np.ndarray, np.ndarray]:
+        """Cache key and bin edges of the window around a centre"""
+        lat_step = self.cell_m / METERS_PER_DEGREE
+        row = round(center_lat / lat_step)
+        lon_step = self.cell_m / (METERS_PER_DEGREE * max(math.cos(math.radians(row * lat_step)), 1e-6))
+        col = round(center_lon / lon_step)
+
+        offsets = np.arange(self.grid_size + 1) - self.grid_size / 2
+        return (row, col), (row + offsets) * lat_step, (col + offsets) * lon_step
+
+    def _bin(self, state: _GridState, columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Mask of the rows inside the window and their flat cell indices"""
+        lat_edges, lon_edges = state.lat_edges, state.lon_edges
+        lat, lon = columns["lat"], columns["lon"]
+        inside = (
+            (lat >= lat_edges[0]) & (lat <= lat_edges[-1]) &
+            (lon >= lon_edges[0]) & (lon <= lon_edges[-1])
+        )
+
+        # The last bin includes its right edge, as in np.histogram2d
+        last = self.grid_size - 1
+        rows = np.minimum(((lat[inside] - lat_edges[0]) / (lat_edges[1] - lat_edges[0])).astype(np.intp), last)
+        cols = np.minimum(((lon[inside] - lon_edges[0]) / (lon_edges[1] - lon_edges[0])).astype(np.intp), last)
+        return inside, rows * self.grid_size + cols
+
+    def _build(self, lat_edges: np.ndarray, lon_edges: np.ndarray, now: float) -> _GridState:
+        """Aggregate every retained observation into a new window"""
+        state = _GridState(lat_edges, lon_edges, now)
+        columns = self.store.columns_since(0)
+        if len(columns["seq"]):
+            state.seq = int(columns["seq"][-1])
+
+        inside, cells = self._bin(state, columns)
+        decay = np.exp((columns["timestamp"][inside] - now) / self.tau)
+        shape = (self.grid_size, self.grid_size)
+        size = self.grid_size * self.grid_size
+
+        # One histogram per sum; bincount over flat indices is the 2-D histogram
+        state.weight = np.bincount(cells, weights=decay, minlength=size).reshape(shape)
+        state.weighted_vehicles = np.bincount(
+            cells, weights=decay * columns["vehicle_count"][inside], minlength=size
+        ).reshape(shape)
+        state.count = np.bincount(cells, minlength=size).astype(np.float64).reshape(shape)
+        return state
+
+    def _update(self, state: _GridState):
+        """Bin the observations added since the window was last updated"""
+        columns = self.store.columns_since(state.seq)
+        if not len(columns["seq"]):
+            return
+        state.seq = int(columns["seq"][-1])
+
+        inside, cells = self._bin(state, columns)
+        if not len(cells):
+            return
+        decay = np.exp((columns["timestamp"][inside] - state.t_ref) / self.tau)
+
+        # Only the cells that received observations are written
+        np.add.at(state.weight.ravel(), cells, decay)
+        np.add.at(state.weighted_vehicles.ravel(), cells, decay * columns["vehicle_count"][inside])
+        np.add.at(state.count.ravel(), cells, 1)
+
+    def grid(self, center_lat: float, center_lon: float, now: Optional[float] = None) -> Dict:
+        """
+        Heat map grid around a centre
+
+        Args:
+            center_lat: Centre latitude
+            center_lon: Centre longitude
+            now: Time the weights are decayed to (defaults to now)
+
+        Returns:
+            Dictionary with lat_edges and lon_edges (grid_size + 1 each) and
+            grid_size x grid_size arrays: count (observations per cell),
+            vehicles (decay-weighted mean vehicle count), weight (decayed
+            observation weight, 1.0 = one fresh observation) and intensity
+            (0-1, vehicles relative to the high-traffic threshold, faded by
+            weight once it drops below 1)
+        """
+        now = time.time() if now is None else now
+        key, lat_edges, lon_edges = self._window(center_lat, center_lon)
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or now - state.built_at >= self.rebuild_interval:
+                state = self._build(lat_edges, lon_edges, now)
+                self._states.put(key, state)
+            else:
+                self._update(state)
+
+            weight = state.weight * math.exp((state.t_ref - now) / self.tau)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                vehicles = np.where(state.weight > 0, state.weighted_vehicles / state.weight, 0.0)
+            count = state.count.copy()
+
+        intensity = np.clip(vehicles / config.MEDIUM_TRAFFIC_THRESHOLD, 0.0, 1.0) * np.minimum(weight, 1.0)
+        return {
+            "lat_edges": state.lat_edges,
+            "lon_edges": state.lon_edges,
+            "count": count,
+            "vehicles": vehicles,
+            "weight": weight,
+            "intensity": intensity
+        }
+
+
+def heatmap_cells(grid: Dict, min_weight: float = 0.05) -> List[Dict]:
+    """
+    Non-empty cells of a heat map grid as map points
+
+    Args:
+        grid: Result of HeatmapAggregator.grid
+        min_weight: Cells whose decayed weight is below this are left out
+            (0.05 is about four half-lives after the last observation)
+
+    Returns:
+        List of dicts with lat, lon (cell centre), intensity, vehicles,
+        count, color and label
+    """
+    lat_centers = (grid["lat_edges"][:-1] + grid["lat_edges"][1:]) / 2
+    lon_centers = (grid["lon_edges"][:-1] + grid["lon_edges"][1:]) / 2
+
+    cells = []
+    for row, col in zip(*np.nonzero(grid["weight"] >= min_weight)):
+        vehicles = float(grid["vehicles"][row, col])
+        level, color = get_density_level(vehicles)
+        cells.append({
+            "lat": float(lat_centers[row]),
+            "lon": float(lon_centers[col]),
+            "intensity": float(grid["intensity"][row, col]),
+            "vehicles": vehicles,
+            "count": int(grid["count"][row, col]),
+            "color": color,
+            "label": f"{level} Traffic"
+        })
+    return cells
+
+
+# Shared by all sessions in this process
+heatmap_aggregator = HeatmapAggregator(
+    observation_store,
+    grid_size=config.HEATMAP_GRID_SIZE,
+    extent_m=config.HEATMAP_EXTENT_M,
+    half_life=config.HEATMAP_HALF_LIFE,
+    rebuild_interval=config.HEATMAP_REBUILD_INTERVAL
+)
+
+
+def get_heatmap_grid(center_lat: float, center_lon: float) -> Dict:
+    """Heat map grid around a centre from the shared observation store"""
+    return heatmap_aggregator.grid(center_lat, center_lon)
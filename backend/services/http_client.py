@@ -0,0 +1,129 @@
+"""
+Shared HTTP Client
+Keep-alive session with pooled connections and retries for external APIs
+"""
+import threading
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.config import config
+from backend.utils.rate_limit import TokenBucket
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# One bucket per rate-limited service, shared by every thread and session
+_rate_limiters: Dict[str, TokenBucket] = {}
+
+
+def _service_urls() -> dict:
+    """Map each external service name to its base URL"""
+    return {
+        "nominatim": config.NOMINATIM_API,
+        "osrm": config.OSRM_API,
+        "ip": config.IPGEOLOCATION_API
+    }
+
+
+def _create_adapter(pool_size: int) -> HTTPAdapter:
+    """Create an adapter with a connection pool and retry policy"""
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        # Return the final response so callers still see raise_for_status() errors
+        raise_on_status=False
+    )
+    return HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session, creating it on first use
+
+    Each service host gets its own adapter so pool sizes can be tuned per
+    host; connections stay alive between calls and across sessions.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers["User-Agent"] = f"{config.APP_NAME}/{config.APP_VERSION}"
+
+                default_size = config.HTTP_POOL_SIZES.get("default", 10)
+                session.mount("https://", _create_adapter(default_size))
+                session.mount("http://", _create_adapter(default_size))
+
+                for service, base_url in _service_urls().items():
+                    pool_size = config.HTTP_POOL_SIZES.get(service, default_size)
+                    session.mount(base_url, _create_adapter(pool_size))
+
+                _session = session
+
+    return _session
+
+
+def get_timeout(service: str):
+    """
+    Get the request timeout for a service
+
+    Args:
+        service: Service name (nominatim, osrm, ip)
+
+    Returns:
+        Timeout in seconds, or a (connect, read) tuple
+    """
+    return config.SERVICE_TIMEOUTS.get(service, config.API_TIMEOUT)
+
+
+def get_rate_limiter(service: str) -> Optional[TokenBucket]:
+    """
+    Get the token bucket for a service listed in SERVICE_RATE_LIMITS
+
+    Args:
+        service: Service name (nominatim, osrm, ip)
+
+    Returns:
+        TokenBucket, or None if the service is not rate limited
+    """
+    limit = config.SERVICE_RATE_LIMITS.get(service)
+    if limit is None:
+        return None
+
+    if service not in _rate_limiters:
+        with _session_lock:
+            if service not in _rate_limiters:
+                rate, burst = limit
+                _rate_limiters[service] = TokenBucket(rate, burst)
+    return _rate_limiters[service]
+
+
+def http_get(url: str, service: str, **kwargs) -> requests.Response:
+    """
+    Send a GET request through the shared session
+
+    Waits for the service's rate limiter first, if it has one.
+
+    Args:
+        url: Request URL
+        service: Service name used to pick the timeout
+        **kwargs: Extra arguments passed to requests (params, headers, ...)
+
+    Returns:
+        requests.Response
+    """
+    kwargs.setdefault("timeout", get_timeout(service))
+
+    limiter = get_rate_limiter(service)
+    if limiter is not None:
+        limiter.acquire()
+
+    return get_session().get(url, **kwargs)
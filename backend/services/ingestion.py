@@ -0,0 +1,367 @@
+"""
+Ingestion Pipeline
+Headless, continuous analysis of many camera streams into the observation store
+
+Frames flow through four stages:
+    reader thread per camera -> per-camera buffer (oldest frame dropped when full)
+    dispatcher -> bounded decode pool -> decoded queue
+    inference thread -> micro-batches through predict_traffic_batch / count_vehicles_batch
+        (in-process, or spread over an InferencePool when INGEST_INFERENCE_WORKERS > 0);
+        frames nearly identical to their camera's last analysed frame reuse its result
+    -> record_observation (observation store + live traffic overlay)
+
+At most ``max_in_flight`` frames are being decoded or waiting for the model.
+When the model falls behind, the decoders stop taking frames and the camera
+buffers drop their oldest frames, so a slow model costs freshness, not memory.
+
+Run with:
+    python -m backend.services.ingestion data/cameras.json
+"""
+import argparse
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.config import config
+from backend.models import (
+    FrameGate, InferencePool, PreparedImage, count_vehicles_batch, frame_signature,
+    predict_traffic_batch, prepare_image
+)
+from backend.utils import is_peak_hour
+from .camera_sources import load_cameras, open_source
+from .traffic_analysis import estimate_clear_time
+from .traffic_overlay import record_observation
+
+
+class _Frame:
+    """An encoded frame on its way through the pipeline"""
+
+    __slots__ = ("camera_id", "captured", "content", "image", "signature")
+
+    def __init__(self, camera_id: str, captured: float, content: bytes):
+        self.camera_id = camera_id
+        self.captured = captured
+        self.content = content
+        self.image: Optional[PreparedImage] = None
+        self.signature: Optional[np.ndarray] = None
+
+
+class _CameraBuffers:
+    """
+    Per-camera drop-oldest frame buffers, served round-robin
+
+    Each camera keeps at most ``per_camera`` frames, so one fast camera can
+    neither exhaust memory nor starve the others.
+    """
+
+    def __init__(self, per_camera: int):
+        self.per_camera = per_camera
+        self._queues: Dict[str, deque] = {}
+        self._pending: deque = deque()
+        self._cond = threading.Condition()
+
+    def put(self, frame: _Frame) -> bool:
+        """Add a frame; returns True if an older frame was dropped for it"""
+        with self._cond:
+            frames = self._queues.setdefault(frame.camera_id, deque(maxlen=self.per_camera))
+            dropped = len(frames) == self.per_camera
+            if not frames:
+                self._pending.append(frame.camera_id)
+            frames.append(frame)
+            self._cond.notify()
+        return dropped
+
+    def get(self, timeout: float) -> Optional[_Frame]:
+        """Oldest frame of the next camera in turn, or None after timeout"""
+        with self._cond:
+            if not self._pending and not self._cond.wait_for(lambda: self._pending, timeout):
+                return None
+            camera_id = self._pending.popleft()
+            frames = self._queues[camera_id]
+            frame = frames.popleft()
+            if frames:
+                self._pending.append(camera_id)
+            return frame
+
+
+def _decode(content: bytes) -> PreparedImage:
+    """Decode and resize a frame for both models (runs on the decode pool)"""
+    image = prepare_image(content)
+    image.float32  # also computes .uint8
+    image.detector
+    image.content = None
+    return image
+
+
+class IngestionPipeline:
+    """
+    Continuous analysis of a set of cameras
+
+    Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        cameras: Sequence[Dict],
+        decode_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        inference_workers: Optional[int] = None,
+        frame_gate: Optional[bool] = None
+    ):
+        self.cameras = {camera["id"]: camera for camera in cameras}
+        self.decode_workers = decode_workers or config.INGEST_DECODE_WORKERS
+        self.batch_size = batch_size or config.INGEST_BATCH_SIZE
+        self.batch_wait = config.INGEST_BATCH_WAIT if batch_wait is None else batch_wait
+        self._buffers = _CameraBuffers(queue_size or config.INGEST_QUEUE_SIZE)
+        self._decoded: "queue.Queue[_Frame]" = queue.Queue()
+        self._slots = threading.Semaphore(max_in_flight or config.INGEST_MAX_IN_FLIGHT)
+        self.inference_workers = config.INGEST_INFERENCE_WORKERS if inference_workers is None else inference_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inference: Optional[InferencePool] = None
+        self._gate = FrameGate() if (config.INGEST_FRAME_GATE if frame_gate is None else frame_gate) else None
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            camera_id: {
+                "read": 0,
+                "dropped": 0,
+                "decode_errors": 0,
+                "analysed": 0,
+                "reused": 0,
+                "latency": None,
+                "traffic_type": None,
+                "vehicle_count": None,
+                "error": None
+            }
+            for camera_id in self.cameras
+        }
+        self.batches = 0
+
+    def __enter__(self) -> "IngestionPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, camera_id: str, counter: str):
+        """Increment one of a camera's frame counters"""
+        with self._stats_lock:
+            self._stats[camera_id][counter] += 1
+
+    def _note(self, camera_id: str, **values):
+        """Record a camera's latest result or error"""
+        with self._stats_lock:
+            self._stats[camera_id].update(values)
+
+    def start(self):
+        """Start the reader, dispatcher and inference threads"""
+        self._stop.clear()
+        if self.inference_workers > 0:
+            self._inference = InferencePool(workers=self.inference_workers)
+            try:
+                self._inference.warmup()
+            except Exception:
+                self._inference.shutdown()
+                self._inference = None
+                raise
+        self._pool = ThreadPoolExecutor(max_workers=self.decode_workers, thread_name_prefix="ingest-decode")
+
+        targets = [(self._read_camera, (camera,)) for camera in self.cameras.values()]
+        targets += [(self._dispatch, ()), (self._infer, ())]
+        for target, args in targets:
+            thread = threading.Thread(target=target, args=args, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all threads and discard frames still in flight"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._inference is not None:
+            self._inference.shutdown()
+            self._inference = None
+
+    def _read_camera(self, camera: Dict):
+        """Pull frames from one camera at its frame rate"""
+        camera_id = camera["id"]
+        try:
+            source = open_source(camera)
+        except ValueError as e:
+            self._note(camera_id, error=str(e))
+            return
+
+        interval = 1.0 / camera.get("fps", config.INGEST_DEFAULT_FPS)
+        next_tick = time.monotonic()
+        try:
+            for content in source:
+                wait = next_tick - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(wait)
+                if self._stop.is_set():
+                    return
+                next_tick = max(next_tick + interval, time.monotonic())
+
+                self._count(camera_id, "read")
+                if self._buffers.put(_Frame(camera_id, time.time(), content)):
+                    self._count(camera_id, "dropped")
+        except OSError as e:
+            self._note(camera_id, error=str(e))
+
+    def _dispatch(self):
+        """Hand buffered frames to the decode pool while in-flight slots are free"""
+        while not self._stop.is_set():
+            if not self._slots.acquire(timeout=0.1):
+                continue
+            frame = self._buffers.get(timeout=0.1)
+            if frame is None:
+                self._slots.release()
+                continue
+
+            future = self._pool.submit(_decode, frame.content)
+            frame.content = None
+            future.add_done_callback(partial(self._decoded_done, frame))
+
+    def _decoded_done(self, frame: _Frame, future: Future):
+        """Queue a decoded frame for inference (called on the decode thread)"""
+        try:
+            frame.image = future.result()
+            if self._gate is not None:
+                frame.signature = frame_signature(frame.image.uint8)
+        except CancelledError:
+            self._slots.release()
+            return
+        except Exception:
+            # Corrupt, truncated or oversized frame; a lost slot would stall the pipeline
+            self._slots.release()
+            self._count(frame.camera_id, "decode_errors")
+            return
+
+        self._decoded.put(frame)
+
+    def _next_batch(self) -> List[_Frame]:
+        """Wait for a decoded frame, then gather more for up to batch_wait seconds"""
+        try:
+            batch = [self._decoded.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._decoded.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _infer(self):
+        """Run micro-batches through the models until stopped"""
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._analyse(batch)
+            except Exception as e:
+                # Keep ingesting: a failing batch must not stop the service
+                for frame in batch:
+                    self._note(frame.camera_id, error=f"inference failed: {e}")
+            finally:
+                for _ in batch:
+                    self._slots.release()
+
+    def _run_models(self, images: List[PreparedImage]) -> List[Tuple[str, int]]:
+        """(traffic_type, vehicle_count) for each image"""
+        if self._inference is not None:
+            return [(r["traffic_type"], r["vehicle_count"]) for r in self._inference.analyse_batch(images)]
+
+        predictions = predict_traffic_batch(images, max_batch_size=self.batch_size)
+        counts = count_vehicles_batch(images, max_batch_size=self.batch_size)
+        return [(traffic_type, count) for (traffic_type, _), count in zip(predictions, counts)]
+
+    def _analyse(self, batch: List[_Frame]):
+        """Classify and count one micro-batch and record the results"""
+        results: List[Optional[Tuple[str, int]]] = [None] * len(batch)
+        if self._gate is not None:
+            results = [self._gate.lookup(frame.camera_id, frame.signature) for frame in batch]
+
+        changed = [i for i, result in enumerate(results) if result is None]
+        if changed:
+            for i, result in zip(changed, self._run_models([batch[i].image for i in changed])):
+                results[i] = result
+                if self._gate is not None:
+                    self._gate.store(batch[i].camera_id, batch[i].signature, result)
+            self.batches += 1
+
+        peak, _ = is_peak_hour()
+        changed = set(changed)
+        for i, (frame, (traffic_type, vehicle_count)) in enumerate(zip(batch, results)):
+            camera = self.cameras[frame.camera_id]
+            clear_time = estimate_clear_time(vehicle_count, traffic_type, peak, camera.get("weather", "Clear"))
+            record_observation(camera, traffic_type, vehicle_count, clear_time)
+            self._count(frame.camera_id, "analysed" if i in changed else "reused")
+            self._note(
+                frame.camera_id,
+                latency=time.time() - frame.captured,
+                traffic_type=traffic_type,
+                vehicle_count=vehicle_count
+            )
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Get per-camera counters
+
+        Returns:
+            Dictionary of camera id -> frames read, dropped, decode_errors,
+            analysed and reused (unchanged frames that skipped the models),
+            latest capture-to-observation latency (seconds), latest result
+            and last error
+        """
+        with self._stats_lock:
+            return {camera_id: dict(stats) for camera_id, stats in self._stats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Continuously analyse camera streams into the observation store")
+    parser.add_argument("cameras", type=Path, nargs="?", default=config.CAMERA_CONFIG_PATH,
+                        help="Camera list JSON (default: data/cameras.json)")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--report", type=float, default=10.0, help="Seconds between status lines")
+    args = parser.parse_args()
+
+    cameras = load_cameras(args.cameras)
+    started = time.monotonic()
+    with IngestionPipeline(cameras) as pipeline:
+        try:
+            while args.duration is None or time.monotonic() - started < args.duration:
+                time.sleep(args.report)
+                for camera_id, stats in pipeline.stats().items():
+                    latency = "-" if stats["latency"] is None else f"{stats['latency']:.2f}s"
+                    print(
+                        f"{camera_id:20s} read {stats['read']:6d}  dropped {stats['dropped']:6d}  "
+                        f"analysed {stats['analysed']:6d}  reused {stats['reused']:6d}  latency {latency:>7s}  "
+                        f"{stats['traffic_type'] or ''} {stats['error'] or ''}"
+                    )
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
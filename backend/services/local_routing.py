@@ -0,0 +1,263 @@
+"""
+Local Routing Engine
+In-process shortest paths over a preprocessed road graph (OSRM alternative)
+"""
+import heapq
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.config import config
+from backend.utils.geometry import RouteGeometry
+from .contraction import ContractionHierarchy
+from .road_graph import RoadGraph
+
+_graph: Optional[RoadGraph] = None
+_hierarchy: Optional[ContractionHierarchy] = None
+_graph_lock = threading.Lock()
+
+
+def get_road_graph() -> Optional[RoadGraph]:
+    """
+    Load the road graph from data/ once per process
+
+    Returns:
+        RoadGraph, or None if no graph file exists
+    """
+    global _graph
+
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None and config.ROAD_GRAPH_PATH.exists():
+                _graph = RoadGraph.load(config.ROAD_GRAPH_PATH)
+    return _graph
+
+
+def get_contraction_hierarchy() -> Optional[ContractionHierarchy]:
+    """
+    Load the contraction-hierarchy index from data/ once per process
+
+    Returns:
+        ContractionHierarchy, or None if no index has been built
+    """
+    global _hierarchy
+
+    if _hierarchy is None:
+        with _graph_lock:
+            if _hierarchy is None and config.CH_INDEX_PATH.exists():
+                _hierarchy = ContractionHierarchy.load(config.CH_INDEX_PATH)
+    return _hierarchy
+
+
+def shortest_path(graph: RoadGraph, source: int, target: int) -> Optional[List[int]]:
+    """
+    Fastest node path, using the contraction hierarchy when one is built
+
+    Args:
+        graph: Road graph
+        source: Start node
+        target: End node
+
+    Returns:
+        Node path or None if unreachable
+    """
+    hierarchy = get_contraction_hierarchy()
+    if hierarchy is not None:
+        return hierarchy.query(source, target)[1]
+    return astar(graph, source, target)[0]
+
+
+def astar(
+    graph: RoadGraph,
+    source: int,
+    target: int,
+    weights: Optional[Sequence[float]] = None
+) -> Tuple[Optional[List[int]], float]:
+    """
+    A* search minimizing travel time
+
+    The heuristic is straight-line distance at the graph's top speed, which
+    never overestimates, so the result is optimal.
+
+    Args:
+        graph: Road graph
+        source: Start node
+        target: End node
+        weights: Per-edge costs in seconds (defaults to graph durations)
+
+    Returns:
+        Tuple of (node path or None if unreachable, total cost in seconds)
+    """
+    indptr, indices, _, durations = graph.adjacency_lists()
+    weights = durations if weights is None else weights
+
+    # Equirectangular distance in metres is cheap and close enough for a heuristic;
+    # scaled down slightly so it stays admissible
+    lat, lon = graph.coordinate_lists()
+    cos_lat = math.cos(math.radians(lat[target]))
+    scale = 111_320.0 * 0.99 / graph.max_speed_mps()
+    t_lat, t_lon = lat[target], lon[target]
+
+    def heuristic(node: int) -> float:
+        return scale * math.hypot(lat[node] - t_lat, (lon[node] - t_lon) * cos_lat)
+
+    best = {source: 0.0}
+    parent = {source: -1}
+    heap = [(heuristic(source), 0.0, source)]
+    closed = set()
+
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node == target:
+            path = [node]
+            while parent[path[-1]] != -1:
+                path.append(parent[path[-1]])
+            return path[::-1], cost
+        if node in closed:
+            continue
+        closed.add(node)
+
+        for edge in range(indptr[node], indptr[node + 1]):
+            neighbour = indices[edge]
+            new_cost = cost + weights[edge]
+            if new_cost < best.get(neighbour, math.inf):
+                best[neighbour] = new_cost
+                parent[neighbour] = node
+                heapq.heappush(heap, (new_cost + heuristic(neighbour), new_cost, neighbour))
+
+    return None, math.inf
+
+
+def dijkstra_many(graph: RoadGraph, source: int, targets: Sequence[int]) -> List[float]:
+    """
+    One-to-many Dijkstra that stops once every target is settled
+
+    Args:
+        graph: Road graph
+        source: Start node
+        targets: End nodes
+
+    Returns:
+        Travel time in seconds to each target (inf if unreachable)
+    """
+    indptr, indices, _, durations = graph.adjacency_lists()
+    remaining = set(targets)
+    best = {source: 0.0}
+    settled = {}
+    heap = [(0.0, source)]
+
+    while heap and remaining:
+        cost, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled[node] = cost
+        remaining.discard(node)
+
+        for edge in range(indptr[node], indptr[node + 1]):
+            neighbour = indices[edge]
+            new_cost = cost + durations[edge]
+            if new_cost < best.get(neighbour, math.inf):
+                best[neighbour] = new_cost
+                heapq.heappush(heap, (new_cost, neighbour))
+
+    return [settled.get(target, math.inf) for target in targets]
+
+
+def get_local_travel_times(origins: Sequence[Dict], destinations: Sequence[Dict]) -> Optional[np.ndarray]:
+    """
+    Travel-time matrix over the local road graph
+
+    Uses bucket-based many-to-many over the contraction hierarchy when one
+    is built, otherwise one Dijkstra per origin.
+
+    Args:
+        origins: Dictionaries with 'lat' and 'lon' keys
+        destinations: Dictionaries with 'lat' and 'lon' keys
+
+    Returns:
+        (len(origins), len(destinations)) array of seconds, or None without a graph
+    """
+    graph = get_road_graph()
+    if graph is None:
+        return None
+
+    sources = [graph.nearest_node(point["lat"], point["lon"]) for point in origins]
+    targets = [graph.nearest_node(point["lat"], point["lon"]) for point in destinations]
+
+    hierarchy = get_contraction_hierarchy()
+    if hierarchy is not None:
+        return hierarchy.many_to_many(sources, targets)
+    return np.array([dijkstra_many(graph, source, targets) for source in sources], dtype=np.float64).reshape(
+        len(sources), len(targets)
+    )
+
+
+def _path_edges(graph: RoadGraph, path: List[int]) -> List[int]:
+    """Edge indices along a node path (cheapest edge when there are parallels)"""
+    indptr, indices, _, durations = graph.adjacency_lists()
+    edges = []
+    for u, v in zip(path, path[1:]):
+        candidates = [e for e in range(indptr[u], indptr[u + 1]) if indices[e] == v]
+        edges.append(min(candidates, key=lambda e: durations[e]))
+    return edges
+
+
+def _to_route(graph: RoadGraph, path: List[int], edges: List[int], index: int) -> Dict:
+    """Convert a node path into the route dict returned by get_route"""
+    edge_idx = np.asarray(edges, dtype=np.int64)
+    nodes = np.asarray(path, dtype=np.int64)
+    return {
+        "path": RouteGeometry(np.column_stack((graph.lat[nodes], graph.lon[nodes]))),
+        "distance": float(graph.length_m[edge_idx].sum()) / 1000,   # km
+        "duration": float(graph.duration_s[edge_idx].sum()) / 60,   # minutes
+        "is_primary": index == 0
+    }
+
+
+def get_local_route(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -> Optional[List[Dict]]:
+    """
+    Compute routes in-process over the local road graph
+
+    The primary route uses the contraction hierarchy when one is built. An
+    alternative is found with the penalty method: edges on the best path are
+    made more expensive and A* is repeated; the result is kept if it differs
+    enough from the primary route.
+
+    Args:
+        start_coords: Dictionary with 'lat' and 'lon' keys
+        end_coords: Dictionary with 'lat' and 'lon' keys
+        alternatives: Whether to include an alternative route
+
+    Returns:
+        List of route dictionaries (same shape as get_route; a single
+        zero-length route when both ends snap to the same node), or None
+        when there is no graph or no path
+    """
+    graph = get_road_graph()
+    if graph is None:
+        return None
+
+    source = graph.nearest_node(start_coords["lat"], start_coords["lon"])
+    target = graph.nearest_node(end_coords["lat"], end_coords["lon"])
+
+    path = shortest_path(graph, source, target)
+    if path is None:
+        return None
+    if len(path) < 2:
+        # Both ends snap to the same node: a zero-length route, nothing to ask OSRM
+        return [_to_route(graph, path, [], 0)]
+
+    edges = _path_edges(graph, path)
+    routes = [_to_route(graph, path, edges, 0)]
+
+    if alternatives:
+        weights = graph.duration_s.copy()
+        weights[edges] *= config.LOCAL_ROUTING_ALT_PENALTY
+        alt_path, _ = astar(graph, source, target, weights.tolist())
+
+        if alt_path is not None:
+            shared = len(set(alt_path) & set(path)) / len(path)
+            if shared < config.LOCAL_ROUTING_ALT_MAX_OVERLAP:
+                routes.append(_to_route(graph, alt_path, _path_edges(graph, alt_path), 1))
+
+    return routes
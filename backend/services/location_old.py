@@ -6,6 +6,7 @@ import requests
 import streamlit as st
 from typing import Optional, Dict
 from backend.config import config
+from .http_client import http_get
 
 
 def get_location_from_ip() -> Optional[Dict]:
@@ -17,7 +18,7 @@ def get_location_from_ip() -> Optional[Dict]:
         Dictionary with location data or None if failed
     """
     try:
-        response = requests.get(config.IPGEOLOCATION_API, timeout=config.API_TIMEOUT)
+        response = http_get(config.IPGEOLOCATION_API, "ip")
         response.raise_for_status()
         
         data = response.json()
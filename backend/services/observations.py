@@ -0,0 +1,213 @@
+"""
+Observation Store
+Geo-indexed history of traffic analysis results shared by all sessions
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from backend.config import config
+from backend.utils.spatial_index import GeohashIndex
+
+
+class _ObservationLog:
+    """
+    Append-only columnar copy of the observations for vectorized aggregation
+
+    Every row carries an increasing sequence number, so readers can ask for
+    just the rows added since they last looked.
+    """
+
+    FIELDS = {
+        "seq": np.int64,
+        "lat": np.float64,
+        "lon": np.float64,
+        "vehicle_count": np.float32,
+        "timestamp": np.float64
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in self.FIELDS.items()}
+        self._size = 0
+
+    def append(self, **values):
+        if self._size == len(self._columns["seq"]):
+            # Double the capacity so appends stay amortized O(1)
+            for name, column in self._columns.items():
+                grown = np.empty(2 * len(column), dtype=column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._columns[name] = grown
+        for name, value in values.items():
+            self._columns[name][self._size] = value
+        self._size += 1
+
+    def since(self, seq: int) -> Dict[str, np.ndarray]:
+        """Copies of the rows with a sequence number greater than seq"""
+        start = int(np.searchsorted(self._columns["seq"][:self._size], seq, side="right"))
+        return {name: column[start:self._size].copy() for name, column in self._columns.items()}
+
+    def drop_before(self, timestamp: float):
+        """Compact away rows older than timestamp"""
+        keep = np.flatnonzero(self._columns["timestamp"][:self._size] >= timestamp)
+        for column in self._columns.values():
+            column[:len(keep)] = column[keep]
+        self._size = len(keep)
+
+
+class ObservationStore:
+    """
+    Timestamped traffic observations in a geohash spatial index
+
+    Each observation is a dict with lat, lon, timestamp, vehicle_count and
+    traffic_type. Observations older than ``retention`` seconds are dropped
+    as new ones arrive.
+    """
+
+    def __init__(self, precision: int, retention: float):
+        self.retention = retention
+        self._index = GeohashIndex(precision)
+        self._log = _ObservationLog()
+        self._log_lock = threading.Lock()
+        self._next_prune = 0.0
+        self.seq = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(
+        self,
+        lat: float,
+        lon: float,
+        vehicle_count: int,
+        traffic_type: str,
+        timestamp: Optional[float] = None
+    ) -> Dict:
+        """
+        Record an observation
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            vehicle_count: Number of vehicles
+            traffic_type: Traffic type
+            timestamp: Observation time (epoch seconds, defaults to now)
+
+        Returns:
+            The stored observation
+        """
+        now = time.time()
+        observation = {
+            "lat": lat,
+            "lon": lon,
+            "timestamp": now if timestamp is None else timestamp,
+            "vehicle_count": vehicle_count,
+            "traffic_type": traffic_type
+        }
+        self._index.insert(lat, lon, observation, observation["timestamp"])
+
+        with self._log_lock:
+            self.seq += 1
+            self._log.append(
+                seq=self.seq, lat=lat, lon=lon,
+                vehicle_count=vehicle_count, timestamp=observation["timestamp"]
+            )
+
+            # Prune at most once a minute; buckets are time-sorted so this is cheap
+            if now >= self._next_prune:
+                self._next_prune = now + 60
+                self._index.drop_before(now - self.retention)
+                self._log.drop_before(now - self.retention)
+
+        return observation
+
+    def columns_since(self, seq: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Observations added after a sequence number, as NumPy columns
+
+        Args:
+            seq: Last sequence number already seen (0 for everything retained)
+
+        Returns:
+            Dictionary of seq, lat, lon, vehicle_count and timestamp arrays
+        """
+        with self._log_lock:
+            return self._log.since(seq)
+
+    def nearby(self, lat: float, lon: float, radius_m: float, max_age: Optional[float] = None) -> List[Dict]:
+        """
+        Observations within a radius, nearest first
+
+        Args:
+            lat: Centre latitude
+            lon: Centre longitude
+            radius_m: Search radius in metres
+            max_age: Only observations from the last max_age seconds
+
+        Returns:
+            List of observation dicts with an added 'distance_m'
+        """
+        since = None if max_age is None else time.time() - max_age
+        return [
+            {**observation, "distance_m": distance}
+            for observation, distance in self._index.query_radius(lat, lon, radius_m, since)
+        ]
+
+    def in_bounds(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        max_age: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Observations inside a bounding box
+
+        Args:
+            min_lat, min_lon, max_lat, max_lon: Box corners
+            max_age: Only observations from the last max_age seconds
+
+        Returns:
+            List of observation dicts
+        """
+        since = None if max_age is None else time.time() - max_age
+        return self._index.query_bbox(min_lat, min_lon, max_lat, max_lon, since)
+
+    def summarize(self, lat: float, lon: float, radius_m: float, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        Aggregate recent observations around a point
+
+        Args:
+            lat: Centre latitude
+            lon: Centre longitude
+            radius_m: Search radius in metres
+            max_age: Only observations from the last max_age seconds
+
+        Returns:
+            Dictionary with count, avg_vehicles, max_vehicles, latest traffic
+            type and timestamp, or None if nothing was observed
+        """
+        observations = self.nearby(lat, lon, radius_m, max_age)
+        if not observations:
+            return None
+
+        latest = max(observations, key=lambda obs: obs["timestamp"])
+        counts = [obs["vehicle_count"] for obs in observations]
+        return {
+            "count": len(observations),
+            "avg_vehicles": sum(counts) / len(counts),
+            "max_vehicles": max(counts),
+            "traffic_type": latest["traffic_type"],
+            "timestamp": latest["timestamp"]
+        }
+
+    def stats(self) -> Dict:
+        """Get the number of stored observations and occupied cells"""
+        return {"observations": len(self._index), "cells": len(self._index.cells())}
+
+
+# Shared by all sessions in this process
+observation_store = ObservationStore(
+    precision=config.OBSERVATION_GEOHASH_PRECISION,
+    retention=config.OBSERVATION_RETENTION
+)
@@ -0,0 +1,312 @@
+"""
+Road Graph
+Compact CSR road network used by the local routing engine
+
+Build a graph from an OpenStreetMap extract with:
+    python -m backend.services.road_graph mumbai.osm data/road_graph.npz
+"""
+import argparse
+import math
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from backend.utils.geo import METERS_PER_DEGREE
+
+# Default speeds (km/h) for drivable OSM highway types
+HIGHWAY_SPEEDS = {
+    "motorway": 80, "motorway_link": 50,
+    "trunk": 60, "trunk_link": 40,
+    "primary": 45, "primary_link": 35,
+    "secondary": 35, "secondary_link": 30,
+    "tertiary": 30, "tertiary_link": 25,
+    "unclassified": 25, "residential": 20,
+    "living_street": 10, "service": 15, "road": 20
+}
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance, vectorized over NumPy arrays
+
+    Returns:
+        Distance in metres
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6_371_008.8 * np.arcsin(np.sqrt(a))
+
+
+class RoadGraph:
+    """
+    Directed road graph in CSR (compressed sparse row) form
+
+    Outgoing edges of node ``u`` are ``indices[indptr[u]:indptr[u + 1]]`` with
+    matching ``length_m`` and ``duration_s`` entries. Node coordinates are
+    stored in ``lat``/``lon`` arrays.
+    """
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        length_m: np.ndarray,
+        duration_s: np.ndarray
+    ):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.length_m = np.asarray(length_m, dtype=np.float32)
+        self.duration_s = np.asarray(duration_s, dtype=np.float32)
+        self._lists = None
+        self._coord_lists = None
+        self._max_speed = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.lat)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    @classmethod
+    def from_edges(
+        cls,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        src: np.ndarray,
+        dst: np.ndarray,
+        length_m: np.ndarray,
+        duration_s: np.ndarray
+    ) -> "RoadGraph":
+        """
+        Build a CSR graph from an edge list
+
+        Args:
+            lat, lon: Node coordinates
+            src, dst: Edge endpoints (node indices)
+            length_m: Edge lengths in metres
+            duration_s: Edge travel times in seconds
+
+        Returns:
+            RoadGraph
+        """
+        src = np.asarray(src, dtype=np.int64)
+        order = np.argsort(src, kind="stable")
+        counts = np.bincount(src, minlength=len(lat))
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+
+        return cls(
+            lat, lon, indptr,
+            np.asarray(dst)[order],
+            np.asarray(length_m)[order],
+            np.asarray(duration_s)[order]
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "RoadGraph":
+        """Load a graph saved with save()"""
+        with np.load(path) as data:
+            return cls(
+                data["lat"], data["lon"], data["indptr"],
+                data["indices"], data["length_m"], data["duration_s"]
+            )
+
+    def save(self, path: Path):
+        """Save the graph as a compressed .npz file"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            lat=self.lat, lon=self.lon, indptr=self.indptr,
+            indices=self.indices, length_m=self.length_m, duration_s=self.duration_s
+        )
+
+    def edge_sources(self) -> np.ndarray:
+        """Source node of every edge, in CSR order"""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+
+    def reverse(self) -> "RoadGraph":
+        """Graph with every edge reversed (incoming edges become outgoing)"""
+        return RoadGraph.from_edges(
+            self.lat, self.lon, self.indices, self.edge_sources(),
+            self.length_m, self.duration_s
+        )
+
+    def adjacency_lists(self) -> Tuple[List[int], List[int], List[float], List[float]]:
+        """
+        Plain-Python views of the CSR arrays for tight search loops
+
+        Indexing Python lists is much faster than indexing NumPy scalars one
+        at a time, so searches use these (built once and kept).
+
+        Returns:
+            Tuple of (indptr, indices, length_m, duration_s) lists
+        """
+        if self._lists is None:
+            self._lists = (
+                self.indptr.tolist(),
+                self.indices.tolist(),
+                self.length_m.tolist(),
+                self.duration_s.tolist()
+            )
+        return self._lists
+
+    def coordinate_lists(self) -> Tuple[List[float], List[float]]:
+        """Plain-Python (lat, lon) lists, built once, for search heuristics"""
+        if self._coord_lists is None:
+            self._coord_lists = (self.lat.tolist(), self.lon.tolist())
+        return self._coord_lists
+
+    def nearest_node(self, lat: float, lon: float) -> int:
+        """
+        Find the graph node closest to a coordinate
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+
+        Returns:
+            Node index
+        """
+        dx = (self.lon - lon) * math.cos(math.radians(lat))
+        dy = self.lat - lat
+        return int(np.argmin(dx * dx + dy * dy))
+
+    def max_speed_mps(self) -> float:
+        """Fastest edge speed, used for an admissible A* time heuristic"""
+        if self._max_speed is None:
+            valid = self.duration_s > 0
+            self._max_speed = float((self.length_m[valid] / self.duration_s[valid]).max()) if valid.any() else 1.0
+        return self._max_speed
+
+
+def _parse_maxspeed(value: Optional[str]) -> Optional[float]:
+    """Parse an OSM maxspeed tag into km/h"""
+    if not value:
+        return None
+    try:
+        number = float(value.split()[0])
+    except (ValueError, IndexError):
+        return None
+    return number * 1.609 if "mph" in value else number
+
+
+def build_from_osm(osm_path: Path) -> RoadGraph:
+    """
+    Build a drivable road graph from an OpenStreetMap XML extract
+
+    Args:
+        osm_path: Path to a .osm file
+
+    Returns:
+        RoadGraph
+    """
+    node_coords: Dict[int, Tuple[float, float]] = {}
+    ways = []
+
+    for _, elem in ET.iterparse(str(osm_path), events=("end",)):
+        if elem.tag == "node":
+            node_coords[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+            elem.clear()
+        elif elem.tag == "way":
+            tags = {tag.get("k"): tag.get("v") for tag in elem.iter("tag")}
+            highway = tags.get("highway")
+            if highway in HIGHWAY_SPEEDS:
+                refs = [int(nd.get("ref")) for nd in elem.iter("nd")]
+                speed = _parse_maxspeed(tags.get("maxspeed")) or HIGHWAY_SPEEDS[highway]
+                oneway = tags.get("oneway") in ("yes", "1", "true") or highway.startswith("motorway")
+                ways.append((refs, speed, oneway, tags.get("oneway") == "-1"))
+            elem.clear()
+
+    index: Dict[int, int] = {}
+    src, dst, speeds = [], [], []
+
+    for refs, speed, oneway, reverse_only in ways:
+        refs = [ref for ref in refs if ref in node_coords]
+        for a, b in zip(refs, refs[1:]):
+            ia = index.setdefault(a, len(index))
+            ib = index.setdefault(b, len(index))
+            if not reverse_only:
+                src.append(ia)
+                dst.append(ib)
+                speeds.append(speed)
+            if not oneway or reverse_only:
+                src.append(ib)
+                dst.append(ia)
+                speeds.append(speed)
+
+    coords = np.empty((len(index), 2))
+    for osm_id, i in index.items():
+        coords[i] = node_coords[osm_id]
+
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    length = haversine_m(coords[src, 0], coords[src, 1], coords[dst, 0], coords[dst, 1])
+    duration = length / (np.asarray(speeds) / 3.6)
+
+    return RoadGraph.from_edges(coords[:, 0], coords[:, 1], src, dst, length, duration)
+
+
+def make_sample_graph(rows: int = 60, cols: int = 60, seed: int = 7) -> RoadGraph:
+    """
+    Generate a deterministic grid-like sample city for benchmarks
+
+    Nodes sit on a jittered ~200 m grid around central Mumbai with a few
+    faster arterial rows/columns and some one-way streets.
+
+    Args:
+        rows: Grid rows
+        cols: Grid columns
+        seed: Random seed
+
+    Returns:
+        RoadGraph
+    """
+    rng = np.random.default_rng(seed)
+    step = 200 / METERS_PER_DEGREE
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    lat = 19.0 + r * step + rng.normal(0, step * 0.1, rows * cols)
+    lon = 72.82 + c * step / math.cos(math.radians(19.0)) + rng.normal(0, step * 0.1, rows * cols)
+
+    src, dst, speed = [], [], []
+    for i in range(rows * cols):
+        ri, ci = divmod(i, cols)
+        neighbours = []
+        if ci + 1 < cols:
+            neighbours.append((i + 1, ri % 10 == 0))
+        if ri + 1 < rows:
+            neighbours.append((i + cols, ci % 10 == 0))
+
+        for j, arterial in neighbours:
+            kmh = 50.0 if arterial else float(rng.choice([20.0, 25.0, 30.0]))
+            src.append(i)
+            dst.append(j)
+            speed.append(kmh)
+            if arterial or rng.random() > 0.1:
+                src.append(j)
+                dst.append(i)
+                speed.append(kmh)
+
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    length = haversine_m(lat[src], lon[src], lat[dst], lon[dst])
+    return RoadGraph.from_edges(lat, lon, src, dst, length, length / (np.asarray(speed) / 3.6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a CSR road graph from an OpenStreetMap extract")
+    parser.add_argument("osm_file", type=Path, help="Input .osm XML file")
+    parser.add_argument("output", type=Path, help="Output .npz path (e.g. data/road_graph.npz)")
+    args = parser.parse_args()
+
+    graph = build_from_osm(args.osm_file)
+    graph.save(args.output)
+    print(f"✅ Saved {graph.num_nodes:,} nodes and {graph.num_edges:,} edges to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,65 @@ Routing Service
 Calculates routes between locations using OSRM
 """
 import requests
+import numpy as np
 import streamlit as st
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Sequence
 from backend.config import config
+from backend.utils.cache import LRUCache
+from backend.utils.geo import snap_to_grid
+from backend.utils.geometry import RouteGeometry
+from .http_client import http_get
+from .local_routing import get_local_route, get_local_travel_times
 
+# Routes shared by all sessions, bounded by total polyline points
+_route_cache = LRUCache(
+    max_entries=config.ROUTE_CACHE_MAX_ENTRIES,
+    max_size=config.ROUTE_CACHE_MAX_POINTS,
+    sizeof=lambda routes: sum(len(route["path"]) for route in routes),
+    ttl=config.ROUTE_CACHE_TTL
+)
 
-def get_route(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -> Optional[List[Dict]]:
-    """
-    Get actual road route using OSRM (Open Source Routing Machine)
+# Travel times (minutes) between grid cells, filled by get_travel_time_matrix
+_travel_time_cache = LRUCache(
+    max_entries=config.TRAVEL_TIME_CACHE_MAX_ENTRIES,
+    ttl=config.ROUTE_CACHE_TTL
+)
+
+
+def _route_key(start_coords: Dict, end_coords: Dict, alternatives: bool) -> tuple:
+    """Build a cache key from grid-snapped endpoints"""
+    grid = config.ROUTE_CACHE_GRID_M
+    return (
+        snap_to_grid(start_coords["lat"], start_coords["lon"], grid),
+        snap_to_grid(end_coords["lat"], end_coords["lon"], grid),
+        alternatives
+    )
+
+
+def _parse_geometry(geometry) -> RouteGeometry:
+    """Convert an OSRM geometry in the configured format to a RouteGeometry"""
+    geometry_format = config.OSRM_GEOMETRY_FORMAT
     
-    Args:
-        start_coords: Dictionary with 'lat' and 'lon' keys
-        end_coords: Dictionary with 'lat' and 'lon' keys
-        alternatives: Whether to include alternative routes
-        
-    Returns:
-        List of route dictionaries or None if routing fails
-    """
+    if geometry_format == "geojson":
+        # Convert from [lon, lat] to a compact (N, 2) [lat, lon] array
+        return RouteGeometry.from_lonlat(geometry["coordinates"])
+    
+    precision = 6 if geometry_format == "polyline6" else 5
+    return RouteGeometry.from_polyline(geometry, precision)
+
+
+def get_route_cache_stats() -> Dict:
+    """Get hit/miss counters of the route cache"""
+    return _route_cache.stats()
+
+
+def get_travel_time_cache_stats() -> Dict:
+    """Get hit/miss counters of the travel-time matrix cache"""
+    return _travel_time_cache.stats()
+
+
+def _get_osrm_route(start_coords: Dict, end_coords: Dict, alternatives: bool) -> Optional[List[Dict]]:
+    """Request routes from the OSRM HTTP API"""
     try:
         url = (f"{config.OSRM_API}/route/v1/driving/"
                f"{start_coords['lon']},{start_coords['lat']};"
@@ -27,11 +69,11 @@ def get_route(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -
         
         params = {
             "overview": "full",
-            "geometries": "geojson",
+            "geometries": config.OSRM_GEOMETRY_FORMAT,
             "alternatives": "true" if alternatives else "false"
         }
         
-        response = requests.get(url, params=params, timeout=config.API_TIMEOUT)
+        response = http_get(url, "osrm", params=params)
         response.raise_for_status()
         
         data = response.json()
@@ -39,9 +81,7 @@ def get_route(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -
         if data.get("code") == "Ok":
             routes = []
             for i, route in enumerate(data["routes"]):
-                coords = route["geometry"]["coordinates"]
-                # Convert from [lon, lat] to [lat, lon] for Folium
-                path = [[coord[1], coord[0]] for coord in coords]
+                path = _parse_geometry(route["geometry"])
                 
                 routes.append({
                     "path": path,
@@ -60,10 +100,152 @@ def get_route(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -
         return None
 
 
+def get_route(start_coords: Dict, end_coords: Dict, alternatives: bool = True) -> Optional[List[Dict]]:
+    """
+    Get actual road route using OSRM (Open Source Routing Machine)
+    
+    With ROUTING_BACKEND = "local" routes come from the in-process engine over
+    the road graph in data/, falling back to OSRM if it cannot answer.
+    
+    Args:
+        start_coords: Dictionary with 'lat' and 'lon' keys
+        end_coords: Dictionary with 'lat' and 'lon' keys
+        alternatives: Whether to include alternative routes
+        
+    Returns:
+        List of route dictionaries or None if routing fails
+    """
+    key = _route_key(start_coords, end_coords, alternatives)
+    cached = _route_cache.get(key)
+    if cached is not None:
+        # Copy the dicts so callers can add metrics without touching the cache
+        return [dict(route) for route in cached]
+    
+    routes = None
+    if config.ROUTING_BACKEND == "local":
+        routes = get_local_route(start_coords, end_coords, alternatives)
+    if routes is None:
+        routes = _get_osrm_route(start_coords, end_coords, alternatives)
+    
+    if routes is None:
+        return None
+    
+    _route_cache.put(key, routes)
+    return [dict(route) for route in routes]
+
+
+def _get_osrm_table(origins: Sequence[Dict], destinations: Sequence[Dict]) -> Optional[np.ndarray]:
+    """Request a duration matrix (seconds) from the OSRM table API"""
+    max_coords = config.OSRM_TABLE_MAX_COORDS
+    # Split into blocks that fit the server's coordinate limit, favouring the longer side
+    o_chunk = min(len(origins), max(1, max_coords - min(len(destinations), max_coords // 2)))
+    d_chunk = max(1, max_coords - o_chunk)
+    result = np.full((len(origins), len(destinations)), np.inf)
+    
+    try:
+        for i in range(0, len(origins), o_chunk):
+            for j in range(0, len(destinations), d_chunk):
+                sources = origins[i:i + o_chunk]
+                targets = destinations[j:j + d_chunk]
+                coords = ";".join(f"{p['lon']},{p['lat']}" for p in [*sources, *targets])
+                
+                params = {
+                    "sources": ";".join(str(k) for k in range(len(sources))),
+                    "destinations": ";".join(str(k) for k in range(len(sources), len(sources) + len(targets))),
+                    "annotations": "duration"
+                }
+                
+                response = http_get(f"{config.OSRM_API}/table/v1/driving/{coords}", "osrm", params=params)
+                response.raise_for_status()
+                
+                data = response.json()
+                if data.get("code") != "Ok":
+                    return None
+                
+                # Unreachable pairs come back as null -> NaN -> inf
+                block = np.array(data["durations"], dtype=np.float64)
+                result[i:i + len(sources), j:j + len(targets)] = np.where(np.isnan(block), np.inf, block)
+        
+        return result
+        
+    except requests.RequestException as e:
+        st.error(f"Travel time matrix error: {e}")
+        return None
+    except (KeyError, ValueError, TypeError) as e:
+        st.error(f"Error parsing travel time matrix: {e}")
+        return None
+
+
+def get_travel_time_matrix(origins: Sequence[Dict], destinations: Sequence[Dict]) -> Optional[np.ndarray]:
+    """
+    Travel times between many origins and destinations in one batched call
+    
+    Points are snapped to the route cache grid; cell pairs already cached
+    are reused and the rest are computed together (OSRM /table, or the local
+    engine with ROUTING_BACKEND = "local"), one row/column per unique cell.
+    
+    Args:
+        origins: Dictionaries with 'lat' and 'lon' keys
+        destinations: Dictionaries with 'lat' and 'lon' keys
+        
+    Returns:
+        (len(origins), len(destinations)) array of minutes (inf if unreachable),
+        or None if the matrix could not be computed
+    """
+    grid = config.ROUTE_CACHE_GRID_M
+    o_cells = [snap_to_grid(p["lat"], p["lon"], grid) for p in origins]
+    d_cells = [snap_to_grid(p["lat"], p["lon"], grid) for p in destinations]
+    
+    matrix = np.full((len(origins), len(destinations)), np.nan)
+    missing_o: Dict[tuple, Dict] = {}
+    missing_d: Dict[tuple, Dict] = {}
+    
+    for i, o_cell in enumerate(o_cells):
+        for j, d_cell in enumerate(d_cells):
+            minutes = _travel_time_cache.get((o_cell, d_cell))
+            if minutes is None:
+                # First point seen in a cell stands in for the whole cell
+                missing_o.setdefault(o_cell, origins[i])
+                missing_d.setdefault(d_cell, destinations[j])
+            else:
+                matrix[i, j] = minutes
+    
+    if not missing_o:
+        return matrix
+    
+    o_keys, d_keys = list(missing_o), list(missing_d)
+    o_points = [missing_o[cell] for cell in o_keys]
+    d_points = [missing_d[cell] for cell in d_keys]
+    
+    seconds = None
+    if config.ROUTING_BACKEND == "local":
+        seconds = get_local_travel_times(o_points, d_points)
+    if seconds is None:
+        seconds = _get_osrm_table(o_points, d_points)
+    if seconds is None:
+        return None
+    
+    computed = seconds / 60
+    for a, o_cell in enumerate(o_keys):
+        for b, d_cell in enumerate(d_keys):
+            _travel_time_cache.put((o_cell, d_cell), float(computed[a, b]))
+    
+    o_index = {cell: a for a, cell in enumerate(o_keys)}
+    d_index = {cell: b for b, cell in enumerate(d_keys)}
+    rows = np.array([o_index.get(cell, 0) for cell in o_cells], dtype=np.int64)
+    cols = np.array([d_index.get(cell, 0) for cell in d_cells], dtype=np.int64)
+    
+    # Every still-missing entry has both cells in the computed block
+    return np.where(np.isnan(matrix), computed[np.ix_(rows, cols)], matrix)
+
+
 def calculate_route_metrics(routes: List[Dict], traffic_factor: float = 1.0) -> List[Dict]:
     """
     Calculate enhanced metrics for routes considering traffic
     
+    Per-segment delays added by rank_routes ('traffic_delay') are included
+    on top of the global traffic factor.
+    
     Args:
         routes: List of route dictionaries
         traffic_factor: Multiplier for duration based on traffic (1.0 = normal, >1.0 = congested)
@@ -72,8 +254,8 @@ def calculate_route_metrics(routes: List[Dict], traffic_factor: float = 1.0) ->
         Routes with updated metrics
     """
     for route in routes:
-        # Apply traffic factor to duration
-        route["actual_duration"] = route["duration"] * traffic_factor
+        # Apply traffic factor to duration, plus any live congestion on the route
+        route["actual_duration"] = route["duration"] * traffic_factor + route.get("traffic_delay", 0.0)
         
         # Calculate estimated fuel consumption (rough estimate)
         route["estimated_fuel"] = route["distance"] * 0.08  # 8 liters per 100km
@@ -0,0 +1,221 @@
+"""
+Traffic Overlay
+Live per-segment congestion from image analysis, used to re-rank routes
+"""
+import hashlib
+import itertools
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from backend.config import config
+from backend.utils.cache import LRUCache
+from backend.utils.geo import snap_coords_to_grid, snap_to_grid
+from .observations import observation_store
+
+Cell = Tuple[int, int]
+
+
+class TrafficOverlay:
+    """
+    Congestion observations attached to road segments on a metric grid
+
+    Each analysis result becomes an observation covering every grid cell
+    within ``radius_m`` of the camera. Cells map to the newest observation
+    that covers them, so looking up a route segment is a single dict access
+    and recording an observation never touches the routes already computed.
+    The cells of recently ranked routes are cached here, keyed by a digest of
+    the route geometry, so route dicts kept in session state stay compact.
+    """
+
+    def __init__(self, grid_m: float, radius_m: float, ttl: float, route_cache_entries: int = 64):
+        self.grid_m = grid_m
+        self.radius_m = radius_m
+        self.ttl = ttl
+        self._route_cells = LRUCache(max_entries=route_cache_entries)
+        self._cells: Dict[Cell, int] = {}
+        self._observations: Dict[int, Dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def _neighbourhood(self, lat: float, lon: float) -> List[Cell]:
+        """Grid cells within radius_m of a point"""
+        row, col = snap_to_grid(lat, lon, self.grid_m)
+        reach = int(math.ceil(self.radius_m / self.grid_m))
+        return [
+            (row + dr, col + dc)
+            for dr in range(-reach, reach + 1)
+            for dc in range(-reach, reach + 1)
+            if math.hypot(dr, dc) * self.grid_m <= self.radius_m
+        ]
+
+    def record(
+        self,
+        lat: float,
+        lon: float,
+        traffic_type: str,
+        vehicle_count: int,
+        clear_time: int
+    ) -> int:
+        """
+        Attach an analysis result to the road segments around a location
+
+        Args:
+            lat: Camera latitude
+            lon: Camera longitude
+            traffic_type: Predicted traffic type
+            vehicle_count: Number of detected vehicles
+            clear_time: Estimated clear time in minutes (see estimate_clear_time)
+
+        Returns:
+            Observation id
+        """
+        cells = self._neighbourhood(lat, lon)
+
+        with self._lock:
+            obs_id = next(self._ids)
+            self._observations[obs_id] = {
+                "lat": lat,
+                "lon": lon,
+                "traffic_type": traffic_type,
+                "vehicle_count": vehicle_count,
+                "delay": float(clear_time),
+                "expires": time.monotonic() + self.ttl,
+                "cells": len(cells)
+            }
+            for cell in cells:
+                self._cells[cell] = obs_id
+
+            self._purge_expired()
+            self.version += 1
+
+        return obs_id
+
+    def _purge_expired(self):
+        """Drop expired observations and the cells still pointing at them (lock held)"""
+        now = time.monotonic()
+        expired = {obs_id for obs_id, obs in self._observations.items() if obs["expires"] <= now}
+        if not expired:
+            return
+
+        for obs_id in expired:
+            del self._observations[obs_id]
+        self._cells = {cell: obs_id for cell, obs_id in self._cells.items() if obs_id not in expired}
+
+    def route_cells(self, route: Dict) -> frozenset:
+        """
+        Grid cells a route passes through, computed once per route geometry
+
+        Args:
+            route: Route dictionary with a RouteGeometry 'path' (not modified)
+
+        Returns:
+            frozenset of (row, col) cells
+        """
+        coords = route["path"].coords
+        key = hashlib.blake2b(coords.tobytes(), digest_size=16).digest()
+        cells = self._route_cells.get(key)
+        if cells is None:
+            snapped = snap_coords_to_grid(coords, self.grid_m)
+            cells = frozenset(map(tuple, snapped.tolist()))
+            self._route_cells.put(key, cells)
+        return cells
+
+    def observations_on(self, cells: frozenset) -> List[Dict]:
+        """
+        Live observations touching a set of route cells
+
+        Args:
+            cells: Cells from route_cells()
+
+        Returns:
+            List of observation dictionaries (each observation once)
+        """
+        now = time.monotonic()
+        with self._lock:
+            lookup = self._cells
+            if not lookup:
+                return []
+            ids = {lookup[cell] for cell in cells if cell in lookup}
+            return [
+                dict(self._observations[obs_id])
+                for obs_id in ids
+                if self._observations[obs_id]["expires"] > now
+            ]
+
+    def rank_routes(self, routes: List[Dict]) -> List[Dict]:
+        """
+        Re-rank routes by travel time including live congestion
+
+        Adds 'traffic_delay' (minutes), 'actual_duration' and 'hotspots' to
+        every route. Each observation on a route adds its clear time once.
+
+        Args:
+            routes: Route dictionaries from get_route
+
+        Returns:
+            The same route dicts, fastest first (stable for ties)
+        """
+        for route in routes:
+            hotspots = self.observations_on(self.route_cells(route))
+            route["hotspots"] = hotspots
+            route["traffic_delay"] = sum((obs["delay"] for obs in hotspots), 0.0)
+            route["actual_duration"] = route["duration"] + route["traffic_delay"]
+
+        return sorted(routes, key=lambda route: route["actual_duration"])
+
+    def clear(self):
+        """Remove every observation"""
+        with self._lock:
+            self._cells.clear()
+            self._observations.clear()
+            self.version += 1
+
+    def stats(self) -> Dict:
+        """Get the number of live observations and covered cells"""
+        with self._lock:
+            self._purge_expired()
+            return {
+                "observations": len(self._observations),
+                "cells": len(self._cells),
+                "version": self.version
+            }
+
+
+# Shared by all sessions so every analysis updates everyone's routes
+traffic_overlay = TrafficOverlay(
+    grid_m=config.TRAFFIC_OVERLAY_GRID_M,
+    radius_m=config.TRAFFIC_OVERLAY_RADIUS_M,
+    ttl=config.TRAFFIC_OVERLAY_TTL,
+    route_cache_entries=config.TRAFFIC_OVERLAY_ROUTE_CACHE_ENTRIES
+)
+
+
+def record_observation(
+    location: Optional[Dict],
+    traffic_type: str,
+    vehicle_count: int,
+    clear_time: int
+) -> Optional[int]:
+    """
+    Record an analysis result on the live overlay and in the observation store
+
+    Args:
+        location: Dictionary with 'lat' and 'lon' keys (skipped when None)
+        traffic_type: Predicted traffic type
+        vehicle_count: Number of detected vehicles
+        clear_time: Estimated clear time in minutes
+
+    Returns:
+        Observation id, or None if there is no location to attach it to
+    """
+    if not location:
+        return None
+    observation_store.add(location["lat"], location["lon"], vehicle_count, traffic_type)
+    return traffic_overlay.record(location["lat"], location["lon"], traffic_type, vehicle_count, clear_time)
+
+
+def rank_routes(routes: List[Dict]) -> List[Dict]:
+    """Re-rank routes against the shared overlay (see TrafficOverlay.rank_routes)"""
+    return traffic_overlay.rank_routes(routes)
@@ -0,0 +1,276 @@
+"""
+Caching Utilities
+Thread-safe in-memory LRU cache and SQLite store shared by the backend services
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Sentinel distinguishing a miss from a cached None (negative caching)
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by entry count and total size
+
+    The size of each value is measured with ``sizeof`` (1 per entry when not
+    given), so the same class can bound memory by bytes, polyline points, etc.
+    Entries optionally expire ``ttl`` seconds after being stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_size: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        ttl: Optional[float] = None
+    ):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self._sizeof = sizeof or (lambda value: 1)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._expires: Dict[Hashable, float] = {}
+        self._total_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            if key in self._data:
+                expires = self._expires.get(key)
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return self._data[key]
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value, evicting least recently used entries to stay in bounds
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires (defaults to the cache ttl)
+        """
+        size = self._sizeof(value)
+        ttl = self.ttl if ttl is None else ttl
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            # Values larger than the whole budget are never cached
+            if self.max_size is not None and size > self.max_size:
+                return
+
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total_size += size
+            if ttl is not None:
+                self._expires[key] = time.monotonic() + ttl
+
+            while len(self._data) > self.max_entries or (
+                self.max_size is not None and self._total_size > self.max_size
+            ):
+                self._remove(next(iter(self._data)))
+
+    def _remove(self, key: Hashable):
+        """Remove an entry (caller holds the lock)"""
+        del self._data[key]
+        self._expires.pop(key, None)
+        self._total_size -= self._sizes.pop(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._total_size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entries, size, hits and misses
+        """
+        return {
+            "entries": len(self._data),
+            "size": self._total_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache backed by a SQLite file
+
+    Values are stored as JSON with an absolute expiry time, so they survive
+    restarts and are shared by every process using the same file.
+    """
+
+    def __init__(self, path: Path, table: str = "cache"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Get a stored value together with its remaining time-to-live
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, seconds left or None) or None if missing/expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        remaining = None
+        if row[1] is not None:
+            remaining = row[1] - time.time()
+            if remaining <= 0:
+                return None
+        return json.loads(row[0]), remaining
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a stored value if it has not expired
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Stored value or default
+        """
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a JSON-serializable value
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires (None = never)
+        """
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self._table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+class TieredCache:
+    """
+    In-memory LRU in front of an optional SQLite store
+
+    Lookups hit memory first; disk hits are promoted into memory with the
+    remaining time-to-live so both tiers expire together.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.disk_hits = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value from memory, then disk"""
+        value = self.memory.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        if self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                value, remaining = entry
+                self.disk_hits += 1
+                self.memory.put(key, value, ttl=remaining)
+                return value
+
+        return default
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value in both tiers"""
+        self.memory.put(key, value, ttl=ttl)
+        if self.disk is not None:
+            self.disk.put(key, value, ttl=ttl)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with memory entries, memory hits, disk hits and misses
+        """
+        memory = self.memory.stats()
+        return {
+            "entries": memory["entries"],
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits
+        }
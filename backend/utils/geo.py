@@ -0,0 +1,52 @@
+"""
+Geographic Utility Functions
+"""
+import math
+from typing import Tuple
+import numpy as np
+
+# Metres per degree of latitude (mean)
+METERS_PER_DEGREE = 111_320.0
+
+
+def snap_to_grid(lat: float, lon: float, grid_m: float) -> Tuple[int, int]:
+    """
+    Snap a coordinate to a roughly square metric grid cell
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        grid_m: Cell size in metres
+
+    Returns:
+        Tuple of (row, col) integer cell indices
+    """
+    lat_step = grid_m / METERS_PER_DEGREE
+    row = int(round(lat / lat_step))
+
+    # Use the cell's own latitude so every point in a row shares one lon step
+    lon_step = grid_m / (METERS_PER_DEGREE * max(math.cos(math.radians(row * lat_step)), 1e-6))
+    col = int(round(lon / lon_step))
+
+    return row, col
+
+
+def snap_coords_to_grid(coords: np.ndarray, grid_m: float) -> np.ndarray:
+    """
+    Vectorized snap_to_grid for a whole polyline
+
+    Args:
+        coords: (N, 2) array of latitude/longitude pairs
+        grid_m: Cell size in metres
+
+    Returns:
+        (N, 2) int64 array of (row, col) cell indices
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    lat_step = grid_m / METERS_PER_DEGREE
+    rows = np.round(coords[:, 0] / lat_step)
+
+    lon_step = grid_m / (METERS_PER_DEGREE * np.maximum(np.cos(np.radians(rows * lat_step)), 1e-6))
+    cols = np.round(coords[:, 1] / lon_step)
+
+    return np.column_stack((rows, cols)).astype(np.int64)
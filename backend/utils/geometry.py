@@ -0,0 +1,264 @@
+"""
+Route Geometry
+Compact NumPy-backed polyline storage with vectorized helpers
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.config import config
+from .geo import METERS_PER_DEGREE
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Web Mercator ground resolution at zoom 0 on the equator (metres per pixel)
+METERS_PER_PIXEL_Z0 = 156543.03392
+
+
+def tolerance_for_zoom(zoom: float, lat: float, pixels: Optional[float] = None) -> float:
+    """
+    Simplification tolerance that stays below the visible pixel size
+
+    Args:
+        zoom: Leaflet zoom level
+        lat: Latitude the map is centred on
+        pixels: Allowed deviation in screen pixels (defaults to config.ROUTE_SIMPLIFY_PIXELS)
+
+    Returns:
+        Tolerance in metres
+    """
+    pixels = config.ROUTE_SIMPLIFY_PIXELS if pixels is None else pixels
+    return pixels * METERS_PER_PIXEL_Z0 * np.cos(np.radians(lat)) / (2 ** zoom)
+
+
+def _project(coords: np.ndarray) -> np.ndarray:
+    """Project (lat, lon) degrees to local equirectangular metres"""
+    lat0 = np.radians(coords[:, 0].mean())
+    return np.column_stack((
+        coords[:, 1] * np.cos(lat0) * METERS_PER_DEGREE,
+        coords[:, 0] * METERS_PER_DEGREE
+    ))
+
+
+def douglas_peucker(coords: np.ndarray, tolerance_m: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification of a (lat, lon) polyline
+
+    Args:
+        coords: (N, 2) array of latitude/longitude pairs
+        tolerance_m: Maximum allowed deviation in metres
+
+    Returns:
+        Boolean mask of the points to keep (endpoints always kept)
+    """
+    n = len(coords)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    if n < 3 or tolerance_m <= 0:
+        keep[:] = True
+        return keep
+
+    xy = _project(np.asarray(coords, dtype=np.float64))
+    stack = [(0, n - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        # Perpendicular distance of every interior point to the chord, in one pass
+        seg = xy[end] - xy[start]
+        rel = xy[start + 1:end] - xy[start]
+        seg_len = np.hypot(seg[0], seg[1])
+        if seg_len == 0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / seg_len
+
+        idx = int(dist.argmax())
+        if dist[idx] > tolerance_m:
+            split = start + 1 + idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return keep
+
+
+def decode_polyline(encoded: str, precision: int = 6) -> np.ndarray:
+    """
+    Decode a Google encoded polyline straight into a NumPy array
+
+    All characters are decoded at once: chunk boundaries come from the
+    continuation bit, np.add.reduceat reassembles each varint and a cumulative
+    sum undoes the delta encoding.
+
+    Args:
+        encoded: Encoded polyline string (OSRM "polyline" or "polyline6")
+        precision: Number of decimal places (5 for polyline, 6 for polyline6)
+
+    Returns:
+        (N, 2) float64 array of (lat, lon)
+    """
+    data = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    if data.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    if data.min() < 0 or data[-1] & 0x20:
+        raise ValueError("Malformed encoded polyline")
+
+    ends = np.flatnonzero((data & 0x20) == 0)
+    if len(ends) % 2:
+        raise ValueError("Encoded polyline has an odd number of values")
+
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Position of each character inside its varint -> bit shift of its 5-bit chunk
+    position = np.arange(data.size) - np.repeat(starts, ends - starts + 1)
+    values = np.add.reduceat((data & 0x1F) << (5 * position), starts)
+
+    # Zig-zag decode, then undo the delta encoding
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / float(10 ** precision)
+
+
+class RouteGeometry:
+    """
+    Route polyline stored as a contiguous (N, 2) array of (lat, lon)
+
+    Replaces the nested ``[[lat, lon], ...]`` lists kept in session state;
+    the list form Folium needs is produced only at render time via to_list().
+    """
+
+    __slots__ = ("coords",)
+
+    def __init__(self, coords, dtype=np.float64):
+        self.coords = np.ascontiguousarray(coords, dtype=dtype).reshape(-1, 2)
+
+    @classmethod
+    def from_lonlat(cls, coords: Iterable, dtype=np.float64) -> "RouteGeometry":
+        """
+        Build from GeoJSON-ordered [lon, lat] pairs
+
+        Args:
+            coords: Sequence or array of [lon, lat] pairs
+            dtype: Storage dtype (float64 or float32)
+
+        Returns:
+            RouteGeometry in (lat, lon) order
+        """
+        return cls(np.asarray(coords, dtype=dtype).reshape(-1, 2)[:, ::-1], dtype=dtype)
+
+    @classmethod
+    def from_polyline(cls, encoded: str, precision: int = 6, dtype=np.float64) -> "RouteGeometry":
+        """
+        Build from an encoded polyline
+
+        Args:
+            encoded: Encoded polyline string
+            precision: 5 for OSRM "polyline", 6 for "polyline6"
+            dtype: Storage dtype (float64 or float32)
+
+        Returns:
+            RouteGeometry in (lat, lon) order
+        """
+        return cls(decode_polyline(encoded, precision), dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __getitem__(self, index: int) -> List[float]:
+        return self.coords[index].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the coordinate array"""
+        return self.coords.nbytes
+
+    def to_list(self) -> List[List[float]]:
+        """
+        Convert to the nested list form used by folium.PolyLine
+
+        Returns:
+            List of [lat, lon] pairs
+        """
+        return self.coords.tolist()
+
+    def length_km(self) -> float:
+        """
+        Total great-circle length of the polyline
+
+        Returns:
+            Length in kilometres
+        """
+        if len(self.coords) < 2:
+            return 0.0
+
+        rad = np.radians(self.coords.astype(np.float64))
+        dlat = np.diff(rad[:, 0])
+        dlon = np.diff(rad[:, 1])
+        a = np.sin(dlat / 2) ** 2 + np.cos(rad[:-1, 0]) * np.cos(rad[1:, 0]) * np.sin(dlon / 2) ** 2
+        return float(2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)).sum())
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Bounding box of the polyline
+
+        Returns:
+            Tuple of (min_lat, min_lon, max_lat, max_lon)
+        """
+        lo = self.coords.min(axis=0)
+        hi = self.coords.max(axis=0)
+        return float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])
+
+    def simplify(self, tolerance_m: float) -> "RouteGeometry":
+        """
+        Simplify the polyline with Douglas-Peucker
+
+        Args:
+            tolerance_m: Maximum allowed deviation in metres
+
+        Returns:
+            New RouteGeometry with fewer points
+        """
+        return RouteGeometry(self.coords[douglas_peucker(self.coords, tolerance_m)], dtype=self.coords.dtype)
+
+    def simplify_for_zoom(self, zoom: float) -> "RouteGeometry":
+        """
+        Simplify for display at a map zoom level
+
+        Args:
+            zoom: Leaflet zoom level
+
+        Returns:
+            New RouteGeometry with sub-pixel detail removed
+        """
+        if len(self.coords) < 3:
+            return self
+        return self.simplify(tolerance_for_zoom(zoom, float(self.coords[:, 0].mean())))
+
+
+def prepare_polylines(paths: Sequence[RouteGeometry], zoom: float) -> Tuple[List[List[List[float]]], Dict[str, int]]:
+    """
+    Simplify route geometries for folium.PolyLine and measure the savings
+
+    Args:
+        paths: Full-resolution route geometries
+        zoom: Leaflet zoom level of the map
+
+    Returns:
+        Tuple of (list-form polylines, stats with point counts and payload bytes)
+    """
+    polylines = [path.simplify_for_zoom(zoom).to_list() for path in paths]
+
+    points_before = sum(len(path) for path in paths)
+    points_after = sum(len(line) for line in polylines)
+    bytes_after = sum(len(json.dumps(line)) for line in polylines)
+
+    return polylines, {
+        "points_before": points_before,
+        "points_after": points_after,
+        # Estimated from the bytes per point of the simplified payload, so the
+        # full-resolution lists never need to be built
+        "bytes_before": int(bytes_after / max(points_after, 1) * points_before),
+        "bytes_after": bytes_after
+    }
@@ -0,0 +1,50 @@
+"""
+Rate Limiting Utilities
+Thread-safe token bucket shared by callers of a rate-limited API
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of ``capacity``
+
+    Callers reserve a token up front and sleep until their slot, so waiting
+    threads are served in arrival order instead of racing each other.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed since the last update (lock held)"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, blocking until it is available
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait as long as needed)
+
+        Returns:
+            True if a token was taken, False if it would take longer than timeout
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if timeout is not None and wait > timeout:
+                return False
+            # Tokens may go negative: each reservation pushes the next caller back
+            self._tokens -= 1
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
@@ -0,0 +1,236 @@
+"""
+Spatial Index
+Geohash-bucketed point index with radius, bounding-box and time-window queries
+"""
+import bisect
+import math
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .geo import METERS_PER_DEGREE
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def _cell_steps(precision: int) -> Tuple[float, float]:
+    """Latitude and longitude size in degrees of a geohash cell"""
+    bits = 5 * precision
+    lat_bits = bits // 2
+    lon_bits = bits - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def _encode_index(lat_idx: int, lon_idx: int, precision: int) -> str:
+    """Geohash string for integer cell indices (longitude bit first, interleaved)"""
+    bits = 5 * precision
+    lat_bits = bits // 2
+    lon_bits = bits - lat_bits
+
+    code = 0
+    lat_pos, lon_pos = lat_bits - 1, lon_bits - 1
+    for i in range(bits):
+        if i % 2 == 0:
+            code = (code << 1) | ((lon_idx >> lon_pos) & 1)
+            lon_pos -= 1
+        else:
+            code = (code << 1) | ((lat_idx >> lat_pos) & 1)
+            lat_pos -= 1
+
+    return "".join(_BASE32[(code >> (5 * (precision - 1 - k))) & 0x1F] for k in range(precision))
+
+
+def _cell_index(lat: float, lon: float, lat_step: float, lon_step: float, precision: int) -> Tuple[int, int]:
+    """Integer (lat, lon) cell indices of a coordinate, clamped to the world"""
+    bits = 5 * precision
+    lat_max = (1 << (bits // 2)) - 1
+    lon_max = (1 << (bits - bits // 2)) - 1
+    lat_idx = min(max(int((lat + 90.0) / lat_step), 0), lat_max)
+    lon_idx = min(max(int((lon + 180.0) / lon_step), 0), lon_max)
+    return lat_idx, lon_idx
+
+
+def geohash_encode(lat: float, lon: float, precision: int = 6) -> str:
+    """
+    Encode a coordinate as a geohash
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        precision: Number of characters (6 = ~1.2 km x 0.6 km cells)
+
+    Returns:
+        Geohash string
+    """
+    lat_step, lon_step = _cell_steps(precision)
+    lat_idx, lon_idx = _cell_index(lat, lon, lat_step, lon_step, precision)
+    return _encode_index(lat_idx, lon_idx, precision)
+
+
+class _Bucket:
+    """Points of one cell, kept sorted by timestamp"""
+
+    __slots__ = ("timestamps", "items")
+
+    def __init__(self):
+        self.timestamps: List[float] = []
+        self.items: List[Tuple[float, float, Any]] = []
+
+    def add(self, timestamp: float, lat: float, lon: float, item: Any):
+        # Observations usually arrive in time order, so this is an append
+        pos = bisect.bisect_right(self.timestamps, timestamp)
+        self.timestamps.insert(pos, timestamp)
+        self.items.insert(pos, (lat, lon, item))
+
+    def since(self, timestamp: Optional[float]) -> List[Tuple[float, float, Any]]:
+        if timestamp is None:
+            return self.items
+        return self.items[bisect.bisect_left(self.timestamps, timestamp):]
+
+    def drop_before(self, timestamp: float) -> int:
+        cut = bisect.bisect_left(self.timestamps, timestamp)
+        del self.timestamps[:cut]
+        del self.items[:cut]
+        return cut
+
+
+class GeohashIndex:
+    """
+    Thread-safe spatial index of timestamped points
+
+    Points are bucketed by geohash cell. A query visits only the cells that
+    overlap the search area and binary-searches each bucket for the time
+    window, so its cost depends on the area searched, not the total number
+    of points stored.
+    """
+
+    def __init__(self, precision: int = 6):
+        self.precision = precision
+        self._lat_step, self._lon_step = _cell_steps(precision)
+        self._cells: Dict[Tuple[int, int], _Bucket] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def insert(self, lat: float, lon: float, item: Any, timestamp: float):
+        """
+        Add a point
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            item: Payload returned by queries
+            timestamp: Observation time (epoch seconds)
+        """
+        key = _cell_index(lat, lon, self._lat_step, self._lon_step, self.precision)
+        with self._lock:
+            self._cells.setdefault(key, _Bucket()).add(timestamp, lat, lon, item)
+            self._count += 1
+
+    def _scan(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+              since: Optional[float]) -> Iterator[Tuple[float, float, Any]]:
+        """Points in the cells overlapping a box (lock held by caller)"""
+        lat0, lon0 = _cell_index(min_lat, min_lon, self._lat_step, self._lon_step, self.precision)
+        lat1, lon1 = _cell_index(max_lat, max_lon, self._lat_step, self._lon_step, self.precision)
+
+        # Few occupied cells: walking them is cheaper than enumerating the box
+        if len(self._cells) < (lat1 - lat0 + 1) * (lon1 - lon0 + 1):
+            keys = [key for key in self._cells if lat0 <= key[0] <= lat1 and lon0 <= key[1] <= lon1]
+        else:
+            keys = [(i, j) for i in range(lat0, lat1 + 1) for j in range(lon0, lon1 + 1)]
+
+        for key in keys:
+            bucket = self._cells.get(key)
+            if bucket is not None:
+                yield from bucket.since(since)
+
+    def query_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        since: Optional[float] = None
+    ) -> List[Any]:
+        """
+        Points inside a bounding box
+
+        Args:
+            min_lat, min_lon, max_lat, max_lon: Box corners
+            since: Only points with timestamp >= since
+
+        Returns:
+            List of payloads
+        """
+        with self._lock:
+            return [
+                item for lat, lon, item in self._scan(min_lat, min_lon, max_lat, max_lon, since)
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+            ]
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        since: Optional[float] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Points within a distance of a coordinate
+
+        Args:
+            lat: Centre latitude
+            lon: Centre longitude
+            radius_m: Search radius in metres
+            since: Only points with timestamp >= since
+
+        Returns:
+            List of (payload, distance in metres), nearest first
+        """
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlat = radius_m / METERS_PER_DEGREE
+        dlon = dlat / cos_lat
+
+        results = []
+        with self._lock:
+            for p_lat, p_lon, item in self._scan(lat - dlat, lon - dlon, lat + dlat, lon + dlon, since):
+                # Equirectangular distance is accurate to well under 1% at city scale
+                dist = METERS_PER_DEGREE * math.hypot(p_lat - lat, (p_lon - lon) * cos_lat)
+                if dist <= radius_m:
+                    results.append((item, dist))
+
+        results.sort(key=lambda pair: pair[1])
+        return results
+
+    def cells(self) -> Dict[str, int]:
+        """
+        Point counts per occupied cell
+
+        Returns:
+            Dictionary of geohash -> number of points
+        """
+        with self._lock:
+            return {
+                _encode_index(i, j, self.precision): len(bucket.items)
+                for (i, j), bucket in self._cells.items()
+            }
+
+    def drop_before(self, timestamp: float) -> int:
+        """
+        Remove points older than a timestamp
+
+        Args:
+            timestamp: Cut-off (epoch seconds)
+
+        Returns:
+            Number of points removed
+        """
+        removed = 0
+        with self._lock:
+            for key in list(self._cells):
+                bucket = self._cells[key]
+                removed += bucket.drop_before(timestamp)
+                if not bucket.items:
+                    del self._cells[key]
+            self._count -= removed
+        return removed
@@ -0,0 +1,56 @@
+"""
+Batched Inference Benchmark
+Measures predict_traffic_batch / count_vehicles_batch throughput at several batch sizes
+
+Usage:
+    python benchmarks/bench_inference.py [--frames 64] [--sizes 1 8 32]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.models import predict_traffic_batch, count_vehicles_batch, warmup_models  # noqa: E402
+
+
+def make_frames(count: int, width: int = 1280, height: int = 720):
+    """Create synthetic camera frames"""
+    rng = np.random.default_rng(0)
+    return [
+        Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+        for _ in range(count)
+    ]
+
+
+def measure(fn, frames, batch_size: int) -> float:
+    """Return frames per second for fn at the given batch size"""
+    start = time.perf_counter()
+    fn(frames, max_batch_size=batch_size)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=64, help="Frames per measurement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32], help="Batch sizes to test")
+    args = parser.parse_args()
+
+    for name, stats in warmup_models().items():
+        print(f"{name:12s} {stats['status']}")
+
+    frames = make_frames(args.frames)
+
+    print(f"\n{'batch':>6} {'predict fps':>12} {'count fps':>12}")
+    for size in args.sizes:
+        predict_fps = measure(predict_traffic_batch, frames, size)
+        count_fps = measure(count_vehicles_batch, frames, size)
+        print(f"{size:>6} {predict_fps:>12.1f} {count_fps:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Routing Benchmark
+Compares A* with contraction-hierarchy queries on the bundled sample graph
+
+Reports CH preprocessing time, index size and p50/p99 query latency.
+
+Usage:
+    python benchmarks/bench_routing.py [--size 80] [--queries 1000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.contraction import ContractionHierarchy  # noqa: E402
+from backend.services.local_routing import astar  # noqa: E402
+from backend.services.road_graph import make_sample_graph  # noqa: E402
+
+
+def percentiles(samples):
+    """Return (p50, p99) in milliseconds"""
+    ms = np.asarray(samples) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=80, help="Sample graph is size x size intersections")
+    parser.add_argument("--queries", type=int, default=1000, help="Random point-to-point queries")
+    args = parser.parse_args()
+
+    graph = make_sample_graph(args.size, args.size)
+    print(f"Sample graph: {graph.num_nodes:,} nodes, {graph.num_edges:,} edges")
+
+    start = time.perf_counter()
+    ch = ContractionHierarchy.build(graph)
+    build_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sample.ch.npz"
+        ch.save(path)
+        index_size = path.stat().st_size
+        ch = ContractionHierarchy.load(path)
+
+    print(f"CH preprocessing: {build_time:.2f} s, index {index_size / 1024:.0f} KB")
+
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, graph.num_nodes, size=(args.queries, 2)).tolist()
+
+    # Build cached adjacency lists before timing
+    astar(graph, 0, 1)
+    ch.query(0, 1)
+
+    results = {}
+    for name, run in (("A*", lambda s, t: astar(graph, s, t)[1]), ("CH", lambda s, t: ch.query(s, t)[0])):
+        timings, costs = [], []
+        for s, t in pairs:
+            t0 = time.perf_counter()
+            costs.append(run(s, t))
+            timings.append(time.perf_counter() - t0)
+        results[name] = costs
+        p50, p99 = percentiles(timings)
+        print(f"{name:>3} query latency: p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+    mismatches = sum(
+        1 for a, c in zip(results["A*"], results["CH"])
+        if not np.isclose(a, c, rtol=1e-4) and not (np.isinf(a) and np.isinf(c))
+    )
+    print(f"Cost mismatches between A* and CH: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
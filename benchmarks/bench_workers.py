@@ -0,0 +1,74 @@
+"""
+Inference Worker Pool Benchmark
+Measures InferencePool throughput against in-process inference for several worker counts
+
+Usage:
+    python benchmarks/bench_workers.py [--frames 256] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.config import config  # noqa: E402
+from backend.models import (  # noqa: E402
+    InferencePool, PreparedImage, count_vehicles_batch, predict_traffic_batch, warmup_models
+)
+
+
+def make_frames(count: int):
+    """Create synthetic frames already at the model input size"""
+    rng = np.random.default_rng(0)
+    size = config.MODEL_IMG_SIZE
+    return [
+        PreparedImage.from_array(rng.integers(0, 256, (size, size, 3), dtype=np.uint8))
+        for _ in range(count)
+    ]
+
+
+def in_process_fps(frames) -> float:
+    """Frames per second running both models in this process"""
+    start = time.perf_counter()
+    predict_traffic_batch(frames)
+    count_vehicles_batch(frames)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def pool_fps(frames, workers: int) -> float:
+    """Frames per second through an InferencePool (model loading excluded)"""
+    with InferencePool(workers=workers) as pool:
+        pool.warmup()
+        start = time.perf_counter()
+        pool.analyse_batch(frames)
+        return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=256, help="Frames per measurement")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to test")
+    args = parser.parse_args()
+
+    for name, stats in warmup_models().items():
+        print(f"{name:12s} {stats['status']}")
+    print(f"CPU cores: {os.cpu_count()}")
+
+    frames = make_frames(args.frames)
+    baseline = in_process_fps(frames)
+    print(f"\n{'workers':>8} {'fps':>10} {'speedup':>8} {'efficiency':>11}")
+    print(f"{'inline':>8} {baseline:>10.1f} {1.0:>8.2f} {'':>11}")
+
+    single = None
+    for workers in args.workers:
+        fps = pool_fps(frames, workers)
+        single = single or fps / workers
+        print(f"{workers:>8} {fps:>10.1f} {fps / baseline:>8.2f} {fps / (single * workers):>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,33 @@
 Traffic Analysis Component
 Image upload and traffic analysis interface
 """
+import hashlib
 import streamlit as st
-from PIL import Image
-from backend.models import predict_traffic, count_vehicles
-from backend.services import estimate_clear_time, analyze_traffic_condition
+from backend.models import analyze_image, get_cache_stats, get_model_stats, prepare_image
+from backend.services import estimate_clear_time, analyze_traffic_condition, record_observation
 from backend.utils import is_peak_hour, get_density_level, announce_voice
 
 
+def _prepare_once(source, slot: str):
+    """
+    Prepare an upload once and reuse it on later reruns
+
+    Args:
+        source: Streamlit UploadedFile (file uploader or camera)
+        slot: Which input it came from, so both inputs keep their own image
+
+    Returns:
+        PreparedImage, decoded again only when a different file arrives
+    """
+    key = getattr(source, "file_id", None) or hashlib.sha256(source.getvalue()).hexdigest()
+    prepared = st.session_state.setdefault("prepared_uploads", {})
+    entry = prepared.get(slot)
+    if entry is None or entry[0] != key:
+        entry = (key, prepare_image(source))
+        prepared[slot] = entry
+    return entry[1]
+
+
 def analysis_page():
     """Render traffic analysis page"""
     st.markdown('<div class="header-banner"><h1>📸 Traffic Image Analysis</h1></div>', unsafe_allow_html=True)
@@ -24,17 +44,16 @@ def analysis_page():
             help="Upload a traffic image for analysis"
         )
         if uploaded:
-            image = Image.open(uploaded)
-            st.session_state.image = image
-            st.image(image, caption="Uploaded Image", use_container_width=True)
+            # Decode once per file; both models share the prepared arrays
+            st.session_state.image = _prepare_once(uploaded, "upload")
+            st.image(uploaded, caption="Uploaded Image", use_container_width=True)
     
     with c2:
         st.markdown("### 📷 Live Camera")
         camera = st.camera_input("Capture from camera")
         if camera:
-            image = Image.open(camera)
-            st.session_state.image = image
-            st.image(image, caption="Camera Capture", use_container_width=True)
+            st.session_state.image = _prepare_once(camera, "camera")
+            st.image(camera, caption="Camera Capture", use_container_width=True)
     
     # Analysis Section
     if st.session_state.image:
@@ -58,11 +77,11 @@ def analysis_page():
         
         if analyze_btn:
             with st.spinner("🤖 Analyzing traffic image..."):
-                # Predict traffic type
-                traffic_type, confidence = predict_traffic(st.session_state.image)
-                
-                # Count vehicles
-                vehicle_count = count_vehicles(st.session_state.image)
+                # Predict traffic type and count vehicles (cached by image content)
+                result = analyze_image(st.session_state.image)
+                traffic_type = result["traffic_type"]
+                confidence = result["confidence"]
+                vehicle_count = result["vehicle_count"]
                 
                 # Check peak hour
                 peak, _ = is_peak_hour()
@@ -74,9 +93,15 @@ def analysis_page():
                 st.session_state.traffic_type = traffic_type
                 st.session_state.confidence = confidence
                 st.session_state.vehicle_count = vehicle_count
+                st.session_state.vehicle_details = result["vehicles"]
                 st.session_state.clear_time = clear_time
                 st.session_state.analysis_done = True
                 
+                # Attach the result to road segments near the current location; a cached
+                # result is an image already recorded, so re-clicking adds nothing
+                if not result["cached"]:
+                    record_observation(st.session_state.location, traffic_type, vehicle_count, clear_time)
+                
                 # Voice announcement
                 announce_voice(
                     f"Traffic analysis complete. {traffic_type} detected with {int(confidence*100)} percent confidence.",
@@ -84,6 +109,24 @@ def analysis_page():
                 )
                 
                 st.success("✅ Analysis Complete!")
+        
+        # Model load status
+        with st.expander("⚙️ Model Status"):
+            for name, stats in get_model_stats().items():
+                if stats["status"] == "loaded":
+                    st.caption(
+                        f"**{name}** — loaded in {stats['load_time']:.2f}s, "
+                        f"{stats['memory_bytes'] / 1e6:.1f} MB"
+                    )
+                else:
+                    st.caption(f"**{name}** — {stats['status']} (using demo predictions)")
+            
+            cache = get_cache_stats()
+            st.caption(
+                f"**Result cache** — {cache['entries']} entries, "
+                f"{cache['memory_hits']} memory hits, {cache['disk_hits']} disk hits, "
+                f"{cache['misses']} misses"
+            )
     
     # Display Results
     if st.session_state.analysis_done:
@@ -6,60 +6,12 @@ import streamlit as st
 import folium
 from streamlit_folium import st_folium
 from datetime import datetime
-import requests
+from backend.services import geocode_location, get_route
 from backend.services.chatbot import get_chatbot, TrafficChatbot
+from backend.utils.geometry import prepare_polylines
 
-
-def geocode_location(location_name):
-    """Convert location name to coordinates using OpenStreetMap Nominatim"""
-    try:
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {
-            "q": location_name,
-            "format": "json",
-            "limit": 1
-        }
-        headers = {"User-Agent": "SmartTrafficSystem/1.0"}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        data = response.json()
-        if data:
-            return {
-                "lat": float(data[0]["lat"]),
-                "lon": float(data[0]["lon"]),
-                "display_name": data[0]["display_name"]
-            }
-        return None
-    except Exception as e:
-        return None
-
-
-def get_route(start_coords, end_coords, alternatives=True):
-    """Get actual road route using OSRM (Open Source Routing Machine)"""
-    try:
-        url = f"https://router.project-osrm.org/route/v1/driving/{start_coords['lon']},{start_coords['lat']};{end_coords['lon']},{end_coords['lat']}"
-        params = {
-            "overview": "full",
-            "geometries": "geojson",
-            "alternatives": "true" if alternatives else "false"
-        }
-        response = requests.get(url, params=params, timeout=15)
-        data = response.json()
-        
-        if data["code"] == "Ok":
-            routes = []
-            for i, route in enumerate(data["routes"]):
-                coords = route["geometry"]["coordinates"]
-                path = [[coord[1], coord[0]] for coord in coords]
-                routes.append({
-                    "path": path,
-                    "distance": route["distance"] / 1000,
-                    "duration": route["duration"] / 60,
-                    "is_primary": i == 0
-                })
-            return routes
-        return None
-    except Exception as e:
-        return None
+# Initial zoom of the chat route map; drawn routes are simplified for this level
+CHAT_MAP_ZOOM = 12
 
 
 def calculate_and_display_route(destination: str, start_location: dict = None):
@@ -93,13 +45,13 @@ def calculate_and_display_route(destination: str, start_location: dict = None):
 
 
 def render_route_map(routes, start_coords, end_coords, start_name, dest_name):
-    """Render a route map in the chat"""
+    """Render a route map in the chat, returning the map and simplification stats"""
     center_lat = (start_coords['lat'] + end_coords['lat']) / 2
     center_lon = (start_coords['lon'] + end_coords['lon']) / 2
     
     m = folium.Map(
         location=[center_lat, center_lon],
-        zoom_start=12,
+        zoom_start=CHAT_MAP_ZOOM,
         tiles='OpenStreetMap'
     )
     
@@ -118,11 +70,14 @@ def render_route_map(routes, start_coords, end_coords, start_name, dest_name):
     ).add_to(m)
     
     # Draw routes
+    simplify_stats = None
     if routes:
+        polylines, simplify_stats = prepare_polylines([route["path"] for route in routes], CHAT_MAP_ZOOM)
+        
         # Primary route in green
         primary_route = routes[0]
         folium.PolyLine(
-            primary_route["path"],
+            polylines[0],
             color='green', weight=6, opacity=0.8,
             popup=f"✅ Shortest Route: {primary_route['distance']:.1f} km, {primary_route['duration']:.0f} min"
         ).add_to(m)
@@ -130,12 +85,12 @@ def render_route_map(routes, start_coords, end_coords, start_name, dest_name):
         # Alternate routes in blue
         for i, route in enumerate(routes[1:], 1):
             folium.PolyLine(
-                route["path"],
+                polylines[i],
                 color='blue', weight=4, opacity=0.5,
                 popup=f"Alternate Route {i}: {route['distance']:.1f} km, {route['duration']:.0f} min"
             ).add_to(m)
     
-    return m
+    return m, simplify_stats
 
 
 def init_chat_session():
@@ -336,7 +291,7 @@ Where would you like to go today? 🚗"""
         st.markdown("### 🗺️ Route Map")
         
         # Render the map
-        route_map = render_route_map(
+        route_map, simplify_stats = render_route_map(
             route_data["routes"],
             route_data["start_coords"],
             route_data["end_coords"],
@@ -345,6 +300,12 @@ Where would you like to go today? 🚗"""
         )
         st_folium(route_map, width=None, height=400)
         
+        if simplify_stats:
+            st.caption(
+                f"Route geometry: {simplify_stats['points_before']:,} → {simplify_stats['points_after']:,} points, "
+                f"≈{simplify_stats['bytes_before'] / 1024:.0f} KB → {simplify_stats['bytes_after'] / 1024:.0f} KB"
+            )
+        
         # Route details
         st.markdown("#### 📊 Route Details")
         for i, route in enumerate(route_data["routes"]):
@@ -4,55 +4,56 @@ Traffic density visualization on map
 """
 import streamlit as st
 import folium
+from folium.plugins import HeatMap
 from streamlit_folium import st_folium
-from datetime import datetime
-import random
+from backend.config import config
+from backend.services import get_heatmap_grid, heatmap_cells
 
 
-def generate_heatmap_data(center_lat: float, center_lon: float):
+def _add_heat_layer(m: folium.Map, cells: list):
     """
-    Generate heatmap data points around center location
+    Add the grid as a single HeatMap layer
+    
+    The page payload is one [lat, lon, intensity] triple per grid cell, so
+    it is bounded by the grid size rather than the number of observations.
+    
+    Args:
+        m: Map to draw on
+        cells: Non-empty grid cells from heatmap_cells
+    """
+    if not cells:
+        return
+    
+    # Intensity 1.0 is the high-traffic threshold; colour stops follow the legend
+    low_stop = config.LOW_TRAFFIC_THRESHOLD / config.MEDIUM_TRAFFIC_THRESHOLD
+    HeatMap(
+        [[round(cell['lat'], 5), round(cell['lon'], 5), round(cell['intensity'], 3)] for cell in cells],
+        name="Traffic density",
+        min_opacity=0.3,
+        radius=20,
+        blur=15,
+        gradient={0.0: 'green', low_stop: 'orange', 1.0: 'red'}
+    ).add_to(m)
+
+
+def _add_cell_markers(m: folium.Map, cells: list):
+    """
+    Add one CircleMarker with a details popup per grid cell
     
     Args:
-        center_lat: Center latitude
-        center_lon: Center longitude
-        
-    Returns:
-        List of data points with location and intensity
+        m: Map to draw on
+        cells: Non-empty grid cells from heatmap_cells
     """
-    data_points = []
-    
-    # Use time-based seed for consistent data per minute
-    random.seed(int(datetime.now().timestamp() // 60))
-    
-    for _ in range(40):
-        lat_offset = random.uniform(-0.05, 0.05)
-        lon_offset = random.uniform(-0.05, 0.05)
-        lat = center_lat + lat_offset
-        lon = center_lon + lon_offset
-        
-        # Calculate intensity based on distance from center
-        distance = (lat_offset**2 + lon_offset**2)**0.5
-        intensity = max(0.3, 1.0 - (distance * 12))
-        
-        # Determine color and label based on intensity
-        if intensity > 0.7:
-            color, label = 'red', 'High Traffic'
-        elif intensity > 0.5:
-            color, label = 'orange', 'Medium Traffic'
-        else:
-            color, label = 'green', 'Low Traffic'
-        
-        data_points.append({
-            'lat': lat,
-            'lon': lon,
-            'intensity': intensity,
-            'color': color,
-            'label': label
-        })
-    
-    random.seed()  # Reset seed
-    return data_points
+    for point in cells:
+        folium.CircleMarker(
+            [point['lat'], point['lon']],
+            radius=max(point['intensity'], 0.25) * 12,
+            popup=f"{point['label']}: {point['vehicles']:.0f} vehicles ({point['count']} reports)",
+            color=point['color'],
+            fill=True,
+            fillColor=point['color'],
+            fillOpacity=0.4
+        ).add_to(m)
 
 
 def heatmap_page():
@@ -67,36 +68,26 @@ def heatmap_page():
             st.rerun()
         return
     
-    # Initialize heatmap data in session state
-    current_minute = int(datetime.now().timestamp() // 60)
-    
-    # Check if we need to refresh data (every 1 minute)
-    needs_refresh = (
-        'heatmap_data' not in st.session_state or
-        'heatmap_timestamp' not in st.session_state or
-        st.session_state.heatmap_timestamp != current_minute or
-        'heatmap_location' not in st.session_state or
-        st.session_state.heatmap_location != st.session_state.location
-    )
-    
-    if needs_refresh:
-        st.session_state.heatmap_data = generate_heatmap_data(
-            st.session_state.location['lat'],
-            st.session_state.location['lon']
-        )
-        st.session_state.heatmap_timestamp = current_minute
-        st.session_state.heatmap_location = st.session_state.location.copy()
-    
-    # Calculate time until next refresh
-    seconds_until_refresh = 60 - (int(datetime.now().timestamp()) % 60)
+    # Aggregation is incremental, so the grid is rebuilt on every rerun
+    grid = get_heatmap_grid(st.session_state.location['lat'], st.session_state.location['lon'])
+    st.session_state.heatmap_data = heatmap_cells(grid)
     
     # Info bar
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([3, 1, 1])
     with col1:
-        st.info(f"🎨 Real-time traffic density visualization • Auto-refresh in {seconds_until_refresh}s")
+        st.info(
+            f"🎨 Traffic density from {int(grid['count'].sum())} analysed images • "
+            f"Recent reports count more (half-life {config.HEATMAP_HALF_LIFE // 60} min)"
+        )
     with col2:
+        render_mode = st.radio(
+            "Display",
+            ["Heat layer", "Area markers"],
+            key="heatmap_render_mode",
+            help="Area markers show per-area details but are heavier to draw"
+        )
+    with col3:
         if st.button("🔄 Refresh Now", use_container_width=True):
-            st.session_state.heatmap_timestamp = None  # Force refresh
             st.rerun()
     
     # Create map
@@ -106,17 +97,11 @@ def heatmap_page():
         tiles='CartoDB dark_matter' if st.session_state.theme == 'dark' else 'OpenStreetMap'
     )
     
-    # Add heatmap circles
-    for point in st.session_state.heatmap_data:
-        folium.CircleMarker(
-            [point['lat'], point['lon']],
-            radius=point['intensity'] * 12,
-            popup=point['label'],
-            color=point['color'],
-            fill=True,
-            fillColor=point['color'],
-            fillOpacity=0.4
-        ).add_to(m)
+    # Add traffic density
+    if render_mode == "Heat layer":
+        _add_heat_layer(m, st.session_state.heatmap_data)
+    else:
+        _add_cell_markers(m, st.session_state.heatmap_data)
     
     # Add user location marker
     folium.Marker(
@@ -163,13 +148,15 @@ def heatmap_page():
     low_traffic = sum(1 for p in st.session_state.heatmap_data if p['color'] == 'green')
     
     stat_cols = st.columns(4)
-    stat_cols[0].metric("📍 Total Points", len(st.session_state.heatmap_data))
+    stat_cols[0].metric("📍 Active Areas", len(st.session_state.heatmap_data))
     stat_cols[1].metric("🔴 High Traffic", high_traffic)
     stat_cols[2].metric("🟠 Medium Traffic", medium_traffic)
     stat_cols[3].metric("🟢 Low Traffic", low_traffic)
     
     # Overall assessment
-    if high_traffic > medium_traffic + low_traffic:
+    if not st.session_state.heatmap_data:
+        st.info("ℹ️ No recent traffic reports nearby. Analyse traffic images to populate the map.")
+    elif high_traffic > medium_traffic + low_traffic:
         st.error("⚠️ High congestion in the area. Consider alternate routes.")
     elif medium_traffic > low_traffic:
         st.warning("🟡 Moderate traffic in the area. Some delays expected.")
@@ -2,11 +2,89 @@
 Route Planning Component
 Smart route planning with real-time traffic integration
 """
+import csv
+import io
 import streamlit as st
 import folium
 from streamlit_folium import st_folium
-from backend.services import geocode_location, get_route, should_reroute
+from backend.services import autocomplete_locality, geocode_many, lookup_locality, plan_route, rank_routes
 from backend.utils import announce_voice
+from backend.utils.geometry import prepare_polylines
+
+# Initial zoom of the route map; drawn routes are simplified for this level
+MAP_ZOOM = 13
+
+# Rows geocoded per CSV import (Nominatim allows one uncached lookup per second)
+MAX_IMPORT_ADDRESSES = 500
+
+
+def _show_suggestions(text: str):
+    """Show offline locality suggestions under a location input"""
+    if not text or lookup_locality(text):
+        return
+    suggestions = autocomplete_locality(text, limit=5)
+    if suggestions:
+        st.caption("💡 Did you mean: " + ", ".join(suggestions))
+
+
+def _read_addresses(uploaded) -> list:
+    """Addresses from an uploaded CSV: the 'address' column if there is one, else each whole row"""
+    rows = list(csv.reader(io.StringIO(uploaded.getvalue().decode("utf-8-sig"))))
+    header = [cell.strip().lower() for cell in rows[0]] if rows else []
+    if "address" in header:
+        column = header.index("address")
+        addresses = [row[column] for row in rows[1:] if len(row) > column]
+    else:
+        # Unquoted addresses ("Dadar, Mumbai") split into cells; join them back
+        addresses = [", ".join(cell.strip() for cell in row if cell.strip()) for row in rows]
+    return [address.strip() for address in addresses if address.strip()]
+
+
+def _address_import_section():
+    """Geocode a CSV of addresses, streaming progress as each lookup resolves"""
+    with st.expander("📥 Geocode a list of addresses (CSV)"):
+        uploaded = st.file_uploader(
+            "CSV of addresses",
+            type=['csv', 'txt'],
+            key="address_import_file",
+            help="One address per row, or a column named 'address'"
+        )
+        if not uploaded or not st.button("📍 Geocode addresses", key="address_import_btn"):
+            return
+        
+        queries = _read_addresses(uploaded)
+        if len(queries) > MAX_IMPORT_ADDRESSES:
+            st.warning(f"⚠️ Only the first {MAX_IMPORT_ADDRESSES} of {len(queries)} addresses are geocoded")
+            queries = queries[:MAX_IMPORT_ADDRESSES]
+        if not queries:
+            st.warning("⚠️ No addresses found in the file")
+            return
+        
+        # Known and cached places resolve at once; the rest follow at Nominatim's rate
+        bar = st.progress(0.0, text="Geocoding...")
+        
+        def progress(done, total, query, result):
+            bar.progress(done / total, text=f"{done}/{total} — {query}")
+        
+        results = geocode_many(queries, progress=progress)
+        rows = [
+            {
+                "address": query,
+                "lat": result["lat"] if result else None,
+                "lon": result["lon"] if result else None,
+                "display_name": result["display_name"] if result else ""
+            }
+            for query, result in zip(queries, results)
+        ]
+        found = sum(1 for result in results if result)
+        st.success(f"✅ Found {found} of {len(queries)} address(es)")
+        st.dataframe(rows, use_container_width=True)
+        
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=["address", "lat", "lon", "display_name"])
+        writer.writeheader()
+        writer.writerows(rows)
+        st.download_button("⬇️ Download results", out.getvalue(), "geocoded_addresses.csv", "text/csv")
 
 
 def route_planning_page():
@@ -32,6 +110,7 @@ def route_planning_page():
             key="start_location_input",
             help="Enter city, landmark, or address"
         )
+        _show_suggestions(start_input)
     
     with c2:
         st.markdown("### 🎯 Destination")
@@ -41,13 +120,15 @@ def route_planning_page():
             key="dest_location_input",
             help="Enter city, landmark, or address"
         )
+        _show_suggestions(dest_input)
     
     # Find Route Button
     if st.button("🔍 Find Best Route", type="primary", use_container_width=True):
         if start_input and dest_input:
-            with st.spinner("🔄 Searching locations..."):
-                start_geo = geocode_location(start_input)
-                dest_geo = geocode_location(dest_input)
+            with st.spinner("🔄 Searching locations and calculating routes..."):
+                # Start and destination are geocoded concurrently, then routed
+                plan = plan_route(start_input, dest_input, alternatives=True)
+                start_geo, dest_geo = plan["start"], plan["dest"]
                 
                 if start_geo and dest_geo:
                     st.session_state.route_start = {"lat": start_geo["lat"], "lon": start_geo["lon"]}
@@ -56,19 +137,21 @@ def route_planning_page():
                     st.session_state.dest_name = dest_geo["display_name"]
                     st.session_state.location = st.session_state.route_start
                     
-                    # Get actual routes from OSRM
-                    with st.spinner("🛣️ Calculating optimal routes..."):
-                        routes = get_route(
-                            st.session_state.route_start,
-                            st.session_state.route_dest,
-                            alternatives=True
-                        )
-                        st.session_state.routes = routes
+                    routes = plan["routes"]
+                    st.session_state.routes = routes
                     
                     if routes:
                         st.success(f"✅ Found {len(routes)} route(s)!")
                     else:
                         st.warning("⚠️ Could not find routes. Showing direct path.")
+                    
+                    # Recent analyses around each endpoint (looked up alongside the route)
+                    for label, summary in (("start", plan["traffic"]["start"]), ("destination", plan["traffic"]["dest"])):
+                        if summary:
+                            st.caption(
+                                f"🚦 Near the {label}: {summary['traffic_type']} — {summary['count']} recent "
+                                f"report(s), ~{summary['avg_vehicles']:.0f} vehicles on average"
+                            )
                 else:
                     if not start_geo:
                         st.error(f"❌ Could not find location: {start_input}")
@@ -88,14 +171,11 @@ def route_planning_page():
         if st.session_state.dest_name:
             st.info(f"🎯 **Destination:** {st.session_state.dest_name[:100]}")
         
-        # Check if rerouting needed based on traffic analysis
-        needs_reroute = (
-            st.session_state.analysis_done and
-            should_reroute(
-                st.session_state.get('traffic_type', ''),
-                st.session_state.get('vehicle_count', 0)
-            )
-        )
+        # Re-rank the stored routes against live per-segment congestion
+        # (cheap, so it runs on every rerun and picks up new analyses)
+        routes = rank_routes(st.session_state.routes) if st.session_state.routes else None
+        needs_reroute = bool(routes) and not routes[0]["is_primary"]
+        primary_delay = next((r["traffic_delay"] for r in routes or [] if r["is_primary"]), 0.0)
         
         # Calculate map center
         center_lat = (st.session_state.route_start['lat'] + st.session_state.route_dest['lat']) / 2
@@ -104,7 +184,7 @@ def route_planning_page():
         # Create map
         m = folium.Map(
             location=[center_lat, center_lon],
-            zoom_start=13,
+            zoom_start=MAP_ZOOM,
             tiles='CartoDB dark_matter' if st.session_state.theme == 'dark' else 'OpenStreetMap'
         )
         
@@ -122,53 +202,44 @@ def route_planning_page():
             icon=folium.Icon(color='red', icon='stop')
         ).add_to(m)
         
-        # Draw routes
-        if st.session_state.routes:
-            routes = st.session_state.routes
+        # Draw routes (simplified copies; full geometry stays in session state)
+        simplify_stats = None
+        if routes:
+            polylines, simplify_stats = prepare_polylines([route["path"] for route in routes], MAP_ZOOM)
             
-            if needs_reroute and len(routes) > 1:
-                # Primary route is jammed (red), show alternates (green)
-                primary_route = routes[0]
-                folium.PolyLine(
-                    primary_route["path"],
-                    color='red',
-                    weight=6,
-                    opacity=0.7,
-                    popup=f"❌ Jammed Route: {primary_route['distance']:.1f} km, {primary_route['duration']:.0f} min"
-                ).add_to(m)
+            # Draw the recommended route last so it sits on top
+            for i in reversed(range(len(routes))):
+                route = routes[i]
+                if i == 0:
+                    color, label = 'green', "✅ Recommended Route"
+                elif route["traffic_delay"] > 0:
+                    color, label = 'red', "❌ Congested Route"
+                else:
+                    color, label = 'blue', f"Alternate Route {i}"
                 
-                # Alternate routes in green
-                for i, route in enumerate(routes[1:], 1):
-                    folium.PolyLine(
-                        route["path"],
-                        color='green',
-                        weight=6,
-                        opacity=0.8,
-                        popup=f"✅ Alternate Route {i}: {route['distance']:.1f} km, {route['duration']:.0f} min"
-                    ).add_to(m)
+                popup = f"{label}: {route['distance']:.1f} km, {route['actual_duration']:.0f} min"
+                if route["traffic_delay"]:
+                    popup += f" (+{route['traffic_delay']:.0f} min traffic)"
                 
-                # Add traffic marker
-                mid_idx = len(primary_route["path"]) // 2
-                mid_point = primary_route["path"][mid_idx]
-                folium.Marker(
-                    mid_point,
-                    popup="⚠️ Traffic/Incident",
-                    icon=folium.Icon(color='orange', icon='exclamation-triangle', prefix='fa')
+                folium.PolyLine(
+                    polylines[i],
+                    color=color,
+                    weight=6 if i == 0 else 4,
+                    opacity=0.8 if i == 0 else 0.6,
+                    popup=popup
                 ).add_to(m)
-            else:
-                # All routes clear
-                for i, route in enumerate(routes):
-                    color = 'green' if i == 0 else 'blue'
-                    weight = 6 if i == 0 else 4
-                    opacity = 0.8 if i == 0 else 0.5
-                    label = "Primary Route" if i == 0 else f"Alternate Route {i}"
-                    
-                    folium.PolyLine(
-                        route["path"],
-                        color=color,
-                        weight=weight,
-                        opacity=opacity,
-                        popup=f"{label}: {route['distance']:.1f} km, {route['duration']:.0f} min"
+            
+            # Mark every reported incident that touches a route
+            seen = set()
+            for route in routes:
+                for obs in route["hotspots"]:
+                    if (obs["lat"], obs["lon"]) in seen:
+                        continue
+                    seen.add((obs["lat"], obs["lon"]))
+                    folium.Marker(
+                        [obs["lat"], obs["lon"]],
+                        popup=f"⚠️ {obs['traffic_type']}: {obs['vehicle_count']} vehicles, ~{obs['delay']:.0f} min delay",
+                        icon=folium.Icon(color='orange', icon='exclamation-triangle', prefix='fa')
                     ).add_to(m)
         else:
             # Fallback: direct line
@@ -184,32 +255,34 @@ def route_planning_page():
         # Display map
         st_folium(m, width=None, height=500)
         
+        if simplify_stats:
+            st.caption(
+                f"Route geometry: {simplify_stats['points_before']:,} → {simplify_stats['points_after']:,} points, "
+                f"≈{simplify_stats['bytes_before'] / 1024:.0f} KB → {simplify_stats['bytes_after'] / 1024:.0f} KB"
+            )
+        
         # Route Information
-        if st.session_state.routes:
+        if routes:
             st.markdown("### 📊 Route Details")
             
-            for i, route in enumerate(st.session_state.routes):
+            for i, route in enumerate(routes):
+                name = "Primary Route" if route["is_primary"] else "Alternate Route"
+                summary = (f'{route["distance"]:.1f} km | {route["actual_duration"]:.0f} min'
+                           + (f' (incl. {route["traffic_delay"]:.0f} min traffic delay)' if route["traffic_delay"] else ''))
+                
                 if i == 0:
-                    if needs_reroute:
-                        st.markdown(
-                            f'<div class="danger-box">❌ <strong>Primary Route (Jammed):</strong> '
-                            f'{route["distance"]:.1f} km | {route["duration"]:.0f} min</div>',
-                            unsafe_allow_html=True
-                        )
-                    else:
-                        st.markdown(
-                            f'<div class="success-box">✅ <strong>Recommended Route:</strong> '
-                            f'{route["distance"]:.1f} km | {route["duration"]:.0f} min</div>',
-                            unsafe_allow_html=True
-                        )
+                    st.markdown(
+                        f'<div class="success-box">✅ <strong>Recommended — {name}:</strong> {summary}</div>',
+                        unsafe_allow_html=True
+                    )
+                elif route["traffic_delay"] > 0:
+                    st.markdown(
+                        f'<div class="danger-box">❌ <strong>{name} (Congested):</strong> {summary}</div>',
+                        unsafe_allow_html=True
+                    )
                 else:
-                    box_class = "success-box" if needs_reroute else "info-box"
-                    icon = "✅" if needs_reroute else "ℹ️"
-                    label = "RECOMMENDED" if needs_reroute else "Option"
-                    
                     st.markdown(
-                        f'<div class="{box_class}">{icon} <strong>Alternate Route {i} ({label}):</strong> '
-                        f'{route["distance"]:.1f} km | {route["duration"]:.0f} min</div>',
+                        f'<div class="info-box">ℹ️ <strong>{name} (Option):</strong> {summary}</div>',
                         unsafe_allow_html=True
                     )
         
@@ -220,14 +293,20 @@ def route_planning_page():
                 unsafe_allow_html=True
             )
             st.markdown(
-                '<div class="danger-box">⚠️ <strong>Primary route has issues</strong> '
-                '— Take alternate route (GREEN path)</div>',
+                f'<div class="danger-box">⚠️ <strong>Primary route is delayed by ~{primary_delay:.0f} min</strong> '
+                '— Take the recommended alternate route (GREEN path)</div>',
                 unsafe_allow_html=True
             )
             announce_voice(
                 "Main route is jammed. Taking alternate route shown in green.",
                 st.session_state.voice_enabled
             )
+        elif routes and routes[0]["traffic_delay"] > 0:
+            st.markdown(
+                f'<div class="warning-box">⚠️ Traffic reported on the route (~{routes[0]["traffic_delay"]:.0f} min delay) '
+                '— no faster alternative found</div>',
+                unsafe_allow_html=True
+            )
         else:
             st.markdown(
                 '<div class="success-box">✅ Route is clear — Proceed on the recommended path</div>',
@@ -249,3 +328,5 @@ def route_planning_page():
         )
         
         st.info("ℹ️ Routes calculated using OpenStreetMap routing engine (OSRM)")
+    
+    _address_import_section()
@@ -0,0 +1,82 @@
+"""Contraction-hierarchy queries against plain Dijkstra"""
+import math
+import numpy as np
+import pytest
+from backend.services.contraction import ContractionHierarchy
+from backend.services.local_routing import dijkstra_many
+from backend.services.road_graph import RoadGraph, haversine_m, make_sample_graph
+
+
+def _random_graph(nodes=120, edges=300, seed=11):
+    """Sparse random directed graph; some pairs are unreachable"""
+    rng = np.random.default_rng(seed)
+    lat = 19.0 + rng.random(nodes) * 0.05
+    lon = 72.8 + rng.random(nodes) * 0.05
+    src = rng.integers(0, nodes, edges)
+    dst = rng.integers(0, nodes, edges)
+    src, dst = src[src != dst], dst[src != dst]
+    length = haversine_m(lat[src], lon[src], lat[dst], lon[dst])
+    return RoadGraph.from_edges(lat, lon, src, dst, length, length / rng.uniform(5.0, 15.0, len(src)))
+
+
+@pytest.fixture(scope="module", params=["sample", "random"])
+def graph(request):
+    if request.param == "sample":
+        return make_sample_graph(rows=12, cols=12, seed=3)
+    return _random_graph()
+
+
+@pytest.fixture(scope="module")
+def hierarchy(graph):
+    return ContractionHierarchy.build(graph)
+
+
+def _path_cost(graph, path):
+    """Cost of a node path using the cheapest edge between consecutive nodes"""
+    total = 0.0
+    for u, v in zip(path, path[1:]):
+        edges = [e for e in range(graph.indptr[u], graph.indptr[u + 1]) if graph.indices[e] == v]
+        assert edges, f"no edge {u} -> {v}"
+        total += min(float(graph.duration_s[e]) for e in edges)
+    return total
+
+
+def test_query_matches_dijkstra(graph, hierarchy):
+    rng = np.random.default_rng(0)
+    for source in rng.choice(graph.num_nodes, 10, replace=False):
+        source = int(source)
+        expected = dijkstra_many(graph, source, list(range(graph.num_nodes)))
+
+        for target in range(graph.num_nodes):
+            cost, path = hierarchy.query(source, target)
+            if math.isinf(expected[target]):
+                assert math.isinf(cost) and path is None
+                continue
+
+            assert cost == pytest.approx(expected[target], rel=1e-5)
+            assert path[0] == source and path[-1] == target
+            # The unpacked path is a real path in the original graph with the same cost
+            assert _path_cost(graph, path) == pytest.approx(expected[target], rel=1e-5)
+
+
+def test_many_to_many_matches_dijkstra(graph, hierarchy):
+    rng = np.random.default_rng(1)
+    sources = [int(node) for node in rng.choice(graph.num_nodes, 8, replace=False)]
+    targets = [int(node) for node in rng.choice(graph.num_nodes, 12, replace=False)]
+
+    matrix = hierarchy.many_to_many(sources, targets)
+    expected = np.array([dijkstra_many(graph, source, targets) for source in sources])
+
+    assert matrix.shape == (len(sources), len(targets))
+    np.testing.assert_array_equal(np.isinf(matrix), np.isinf(expected))
+    finite = np.isfinite(expected)
+    np.testing.assert_allclose(matrix[finite], expected[finite], rtol=1e-5)
+
+
+def test_save_load_round_trip(tmp_path, graph, hierarchy):
+    path = tmp_path / "ch.npz"
+    hierarchy.save(path)
+    loaded = ContractionHierarchy.load(path)
+
+    for target in range(0, graph.num_nodes, 13):
+        assert loaded.query(0, target)[0] == pytest.approx(hierarchy.query(0, target)[0])
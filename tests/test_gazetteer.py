@@ -0,0 +1,68 @@
+"""Gazetteer matching and its use in front of Nominatim"""
+import pytest
+from backend.config import config
+from backend.services import geocoding
+from backend.services.gazetteer import Gazetteer
+from backend.utils.cache import LRUCache, TieredCache
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer.load(config.GAZETTEER_PATH)
+
+
+@pytest.mark.parametrize("query, name", [
+    ("Andheri", "Andheri"),
+    ("kanjur marg, Mumbai", "Kanjurmarg"),
+    ("CST", "Chhatrapati Shivaji Maharaj Terminus"),
+    ("ghatkoper", "Ghatkopar"),
+    ("lowr parel", "Lower Parel"),
+    ("vileparle", "Vile Parle")
+])
+def test_fuzzy_lookup_matches_names_and_typos(gazetteer, query, name):
+    result = gazetteer.fuzzy_lookup(query)
+    assert result is not None
+    assert result["display_name"].startswith(f"{name},")
+
+
+@pytest.mark.parametrize("query", ["Andheri East", "Juhu Beach", "Powai Lake", "station", "Dadar Station", "Mumbai"])
+def test_fuzzy_lookup_leaves_more_specific_places_alone(gazetteer, query):
+    assert gazetteer.fuzzy_lookup(query) is None
+
+
+@pytest.mark.parametrize("text, name", [
+    ("traffic near ghatkoper?", "Ghatkopar"),
+    ("how is the road to kanjur marg", "Kanjurmarg"),
+    ("jam at lokandwala", "Lokhandwala")
+])
+def test_find_in_text(gazetteer, text, name):
+    assert gazetteer.find_in_text(text) == name
+
+
+@pytest.mark.parametrize("text", [
+    "what's the status at the station",
+    "is the west road clear",
+    "traffic in nagar"
+])
+def test_find_in_text_ignores_generic_words(gazetteer, text):
+    assert gazetteer.find_in_text(text) is None
+
+
+@pytest.fixture
+def nominatim(monkeypatch):
+    """Record queries that reach Nominatim instead of sending them"""
+    queries = []
+    monkeypatch.setattr(geocoding, "_cache", TieredCache(LRUCache(max_entries=16)))
+    monkeypatch.setattr(geocoding, "_fetch_search", lambda query: queries.append(query) or {"query": query})
+    return queries
+
+
+@pytest.mark.parametrize("query", ["Andheri East", "Juhu Beach", "Powai Lake", "station"])
+def test_geocode_location_sends_specific_queries_to_nominatim(nominatim, query):
+    assert geocoding.geocode_location(query) == {"query": query}
+    assert nominatim == [query]
+
+
+def test_geocode_location_answers_localities_offline(nominatim):
+    assert geocoding.geocode_location("Ghatkoper, Mumbai")["display_name"].startswith("Ghatkopar,")
+    assert nominatim == []
@@ -0,0 +1,43 @@
+"""Batch geocoding"""
+import pytest
+from backend.services import geocoding
+from backend.utils.cache import LRUCache, TieredCache
+
+
+@pytest.fixture
+def nominatim(monkeypatch):
+    """Record queries that reach Nominatim instead of sending them"""
+    queries = []
+
+    def fetch(query):
+        queries.append(query)
+        result = None if query == "Nowhere" else {"lat": 19.0, "lon": 72.9, "display_name": query}
+        geocoding._store(geocoding._search_key(query), result)
+        return result
+
+    monkeypatch.setattr(geocoding, "_cache", TieredCache(LRUCache(max_entries=16)))
+    monkeypatch.setattr(geocoding, "_fetch_search", fetch)
+    return queries
+
+
+def test_geocode_many_dedupes_and_keeps_order(nominatim):
+    updates = []
+    queries = ["Powai Lake", "Ghatkopar", "powai lake ", "Nowhere", "Powai Lake"]
+
+    results = geocoding.geocode_many(queries, progress=lambda *args: updates.append(args))
+
+    # Gazetteer hits never reach Nominatim; repeated queries are fetched once
+    assert sorted(nominatim) == ["Nowhere", "Powai Lake"]
+    assert results[1]["display_name"].startswith("Ghatkopar,")
+    assert results[0] == results[2] == results[4] == {"lat": 19.0, "lon": 72.9, "display_name": "Powai Lake"}
+    assert results[3] is None
+
+    # One update per unique query, counting up to the total
+    assert [(done, total) for done, total, _, _ in updates] == [(1, 3), (2, 3), (3, 3)]
+    assert updates[0][2] == "Ghatkopar"
+
+
+def test_geocode_many_serves_cached_results(nominatim):
+    geocoding.geocode_many(["Powai Lake"])
+    assert geocoding.geocode_many(["Powai Lake"])[0]["display_name"] == "Powai Lake"
+    assert nominatim == ["Powai Lake"]
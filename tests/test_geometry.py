@@ -0,0 +1,102 @@
+"""Route geometry helpers: polyline decoding and simplification"""
+import numpy as np
+import pytest
+from backend.utils.geometry import RouteGeometry, _project, decode_polyline, douglas_peucker
+
+
+def _encode_polyline(coords, precision):
+    """Reference encoder from the Google polyline algorithm description"""
+    out = []
+    previous = (0, 0)
+    for lat, lon in coords:
+        point = (int(round(lat * 10 ** precision)), int(round(lon * 10 ** precision)))
+        for value in (point[0] - previous[0], point[1] - previous[1]):
+            value = ~(value << 1) if value < 0 else value << 1
+            while value >= 0x20:
+                out.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            out.append(chr(value + 63))
+        previous = point
+    return "".join(out)
+
+
+def _random_walk(n, seed=0):
+    """A wiggly (lat, lon) path of n points around central Mumbai"""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(scale=2e-4, size=(n, 2))
+    return np.array([19.07, 72.87]) + np.cumsum(steps, axis=0)
+
+
+def _max_deviation(coords, keep):
+    """Largest distance in metres from a dropped point to its simplified segment"""
+    xy = _project(coords)
+    kept = np.flatnonzero(keep)
+    worst = 0.0
+    for start, end in zip(kept, kept[1:]):
+        seg = xy[end] - xy[start]
+        for point in xy[start + 1:end]:
+            rel = point - xy[start]
+            seg_len = np.hypot(*seg)
+            if seg_len == 0:
+                dist = np.hypot(*rel)
+            else:
+                dist = abs(seg[0] * rel[1] - seg[1] * rel[0]) / seg_len
+            worst = max(worst, dist)
+    return worst
+
+
+def test_decode_polyline_reference_example():
+    # Example from the Google encoded polyline documentation
+    coords = decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@", precision=5)
+    np.testing.assert_allclose(coords, [[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]])
+
+
+@pytest.mark.parametrize("precision", [5, 6])
+def test_decode_polyline_round_trip(precision):
+    coords = np.round(_random_walk(500, seed=precision), precision)
+    # Include large jumps and both hemispheres so multi-chunk varints are exercised
+    coords = np.vstack((coords, [[-33.8688, 151.2093], [0.0, 0.0], [89.9, -179.9]]))
+
+    decoded = decode_polyline(_encode_polyline(coords, precision), precision)
+    assert decoded.shape == coords.shape
+    np.testing.assert_allclose(decoded, coords, atol=0.5 / 10 ** precision)
+
+
+def test_decode_polyline_empty():
+    assert decode_polyline("").shape == (0, 2)
+
+
+@pytest.mark.parametrize("encoded", ["_p~iF", "_p~iF~ps|U_", " "])
+def test_decode_polyline_rejects_malformed(encoded):
+    with pytest.raises(ValueError):
+        decode_polyline(encoded)
+
+
+def test_douglas_peucker_drops_collinear_points():
+    coords = np.column_stack((np.linspace(19.0, 19.1, 50), np.linspace(72.8, 72.9, 50)))
+    keep = douglas_peucker(coords, 1.0)
+    assert keep.tolist() == [True] + [False] * 48 + [True]
+
+
+@pytest.mark.parametrize("tolerance_m", [1.0, 5.0, 25.0])
+def test_douglas_peucker_stays_within_tolerance(tolerance_m):
+    coords = _random_walk(400)
+    keep = douglas_peucker(coords, tolerance_m)
+
+    assert keep[0] and keep[-1]
+    assert 2 <= keep.sum() < len(coords)
+    assert _max_deviation(coords, keep) <= tolerance_m
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_douglas_peucker_keeps_short_paths(n):
+    assert douglas_peucker(_random_walk(n), 10.0).all()
+
+
+def test_simplify_keeps_endpoints():
+    path = RouteGeometry(_random_walk(200, seed=1))
+    simplified = path.simplify(10.0)
+
+    assert len(simplified) < len(path)
+    np.testing.assert_array_equal(simplified.coords[0], path.coords[0])
+    np.testing.assert_array_equal(simplified.coords[-1], path.coords[-1])
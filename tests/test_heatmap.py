@@ -0,0 +1,99 @@
+"""Heat map aggregation against a brute-force histogram"""
+import math
+import time
+import numpy as np
+import pytest
+from backend.services.heatmap import HeatmapAggregator, heatmap_cells
+from backend.services.observations import ObservationStore
+from backend.utils.geo import METERS_PER_DEGREE
+
+CENTER = (19.07, 72.87)
+HALF_LIFE = 1800.0
+
+
+def _add_random(store, n, now, seed):
+    """Add n observations scattered around CENTER (some outside the window)"""
+    rng = np.random.default_rng(seed)
+    lat = CENTER[0] + rng.normal(scale=0.03, size=n)
+    lon = CENTER[1] + rng.normal(scale=0.03, size=n)
+    vehicles = rng.integers(0, 60, size=n)
+    ages = rng.uniform(0, 3 * HALF_LIFE, size=n)
+    for i in range(n):
+        store.add(float(lat[i]), float(lon[i]), int(vehicles[i]), "Normal Traffic", timestamp=now - float(ages[i]))
+
+
+def _aggregator(store):
+    return HeatmapAggregator(store, grid_size=20, extent_m=8000, half_life=HALF_LIFE, rebuild_interval=600)
+
+
+def _brute_force(store, grid, now):
+    """Per-cell count, decayed weight and weighted mean vehicles with np.histogram2d"""
+    columns = store.columns_since(0)
+    bins = [grid["lat_edges"], grid["lon_edges"]]
+    decay = np.exp((columns["timestamp"] - now) / (HALF_LIFE / math.log(2)))
+
+    count, _, _ = np.histogram2d(columns["lat"], columns["lon"], bins=bins)
+    weight, _, _ = np.histogram2d(columns["lat"], columns["lon"], bins=bins, weights=decay)
+    weighted, _, _ = np.histogram2d(
+        columns["lat"], columns["lon"], bins=bins, weights=decay * columns["vehicle_count"]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vehicles = np.where(weight > 0, weighted / weight, 0.0)
+    return count, weight, vehicles
+
+
+@pytest.fixture
+def store():
+    return ObservationStore(precision=6, retention=24 * 3600)
+
+
+def test_grid_matches_histogram(store):
+    now = time.time()
+    _add_random(store, 3000, now, seed=1)
+
+    grid = _aggregator(store).grid(*CENTER, now=now)
+    count, weight, vehicles = _brute_force(store, grid, now)
+
+    assert grid["count"].shape == (20, 20)
+    assert 0 < grid["count"].sum() < 3000
+    np.testing.assert_array_equal(grid["count"], count)
+    np.testing.assert_allclose(grid["weight"], weight, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(grid["vehicles"], vehicles, rtol=1e-9, atol=1e-9)
+    assert ((grid["intensity"] >= 0) & (grid["intensity"] <= 1)).all()
+
+
+def test_incremental_update_matches_rebuild(store):
+    now = time.time()
+    aggregator = _aggregator(store)
+    _add_random(store, 1000, now, seed=2)
+    aggregator.grid(*CENTER, now=now)
+
+    # Within the rebuild interval only the new observations are binned
+    later = now + 120
+    _add_random(store, 1000, later, seed=3)
+    updated = aggregator.grid(*CENTER, now=later)
+    rebuilt = _aggregator(store).grid(*CENTER, now=later)
+
+    np.testing.assert_array_equal(updated["count"], rebuilt["count"])
+    np.testing.assert_allclose(updated["weight"], rebuilt["weight"], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(updated["vehicles"], rebuilt["vehicles"], rtol=1e-9, atol=1e-9)
+
+
+def test_weight_halves_after_half_life(store):
+    now = time.time()
+    store.add(*CENTER, 40, "Normal Traffic", timestamp=now)
+    aggregator = _aggregator(store)
+
+    fresh = aggregator.grid(*CENTER, now=now)
+    assert fresh["weight"].sum() == pytest.approx(1.0)
+    assert aggregator.grid(*CENTER, now=now + HALF_LIFE)["weight"].sum() == pytest.approx(0.5)
+
+
+def test_heatmap_cells(store):
+    now = time.time()
+    store.add(*CENTER, 40, "Normal Traffic", timestamp=now)
+
+    cells = heatmap_cells(_aggregator(store).grid(*CENTER, now=now))
+    assert len(cells) == 1
+    assert cells[0]["count"] == 1 and cells[0]["vehicles"] == pytest.approx(40)
+    assert abs(cells[0]["lat"] - CENTER[0]) < 8000 / 20 / METERS_PER_DEGREE
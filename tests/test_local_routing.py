@@ -0,0 +1,50 @@
+"""Local routing over an in-process road graph"""
+import math
+import pytest
+from backend.services import local_routing
+from backend.services.road_graph import make_sample_graph
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return make_sample_graph(rows=12, cols=12, seed=3)
+
+
+@pytest.fixture
+def local_graph(monkeypatch, graph):
+    """Route over the sample graph with A* (no contraction hierarchy)"""
+    monkeypatch.setattr(local_routing, "get_road_graph", lambda: graph)
+    monkeypatch.setattr(local_routing, "get_contraction_hierarchy", lambda: None)
+    return graph
+
+
+def _coords(graph, node):
+    return {"lat": float(graph.lat[node]), "lon": float(graph.lon[node])}
+
+
+def test_astar_matches_dijkstra(graph):
+    costs = local_routing.dijkstra_many(graph, 0, list(range(graph.num_nodes)))
+    for target in range(0, graph.num_nodes, 7):
+        path, cost = local_routing.astar(graph, 0, target)
+        assert cost == pytest.approx(costs[target])
+        if not math.isinf(cost):
+            assert path[0] == 0 and path[-1] == target
+
+
+def test_get_local_route(local_graph):
+    routes = local_routing.get_local_route(_coords(local_graph, 0), _coords(local_graph, 143))
+
+    assert routes[0]["is_primary"]
+    assert routes[0]["distance"] > 0 and routes[0]["duration"] > 0
+    assert len(routes[0]["path"]) >= 2
+
+
+def test_get_local_route_same_node_is_zero_length(local_graph):
+    point = _coords(local_graph, 40)
+    nearby = {"lat": point["lat"] + 1e-6, "lon": point["lon"]}
+
+    routes = local_routing.get_local_route(point, nearby)
+
+    assert len(routes) == 1
+    assert routes[0]["distance"] == 0 and routes[0]["duration"] == 0
+    assert routes[0]["path"].to_list() == [[point["lat"], point["lon"]]]
@@ -0,0 +1,35 @@
+"""Analysis result cache keys and lookups"""
+import numpy as np
+import pytest
+from backend.models import result_cache
+from backend.models.preprocessing import PreparedImage
+from backend.models.result_cache import AnalysisCache, analyze_image, image_key
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Use a fresh memory-only cache instead of the shared one"""
+    cache = AnalysisCache(max_entries=16, disk_dir=None)
+    monkeypatch.setattr(result_cache, "analysis_cache", cache)
+    return cache
+
+
+def _array_image(seed: int) -> PreparedImage:
+    rng = np.random.default_rng(seed)
+    return PreparedImage.from_array(rng.integers(0, 256, (224, 224, 3), dtype=np.uint8))
+
+
+def test_image_key_for_array_images():
+    assert image_key(_array_image(0), "v1") == image_key(_array_image(0), "v1")
+    assert image_key(_array_image(0), "v1") != image_key(_array_image(1), "v1")
+    assert image_key(_array_image(0), "v1") != image_key(_array_image(0), "v2")
+
+
+def test_analyze_image_accepts_array_images(memory_cache):
+    first = analyze_image(_array_image(0))
+    second = analyze_image(_array_image(0))
+
+    assert set(first) >= {"traffic_type", "confidence", "vehicle_count", "vehicles", "cached"}
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert dict(second, cached=False) == first
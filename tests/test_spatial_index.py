@@ -0,0 +1,77 @@
+"""Geohash index queries against brute force"""
+import math
+import numpy as np
+import pytest
+from backend.utils.geo import METERS_PER_DEGREE
+from backend.utils.spatial_index import GeohashIndex, geohash_encode
+
+
+@pytest.fixture(scope="module")
+def points():
+    """(lat, lon, timestamp) triples around central Mumbai, out of time order"""
+    rng = np.random.default_rng(5)
+    lat = 19.07 + rng.normal(scale=0.03, size=2000)
+    lon = 72.87 + rng.normal(scale=0.03, size=2000)
+    timestamps = rng.uniform(0, 1000, size=2000)
+    return list(zip(lat.tolist(), lon.tolist(), timestamps.tolist()))
+
+
+@pytest.fixture(scope="module")
+def index(points):
+    index = GeohashIndex(precision=6)
+    for i, (lat, lon, timestamp) in enumerate(points):
+        index.insert(lat, lon, i, timestamp)
+    return index
+
+
+def _distance_m(lat1, lon1, lat2, lon2):
+    return METERS_PER_DEGREE * math.hypot(lat2 - lat1, (lon2 - lon1) * math.cos(math.radians(lat1)))
+
+
+@pytest.mark.parametrize("lat, lon, expected", [
+    (42.605, -5.603, "ezs42"),
+    (57.64911, 10.40744, "u4pruydqqvj")
+])
+def test_geohash_encode_reference_values(lat, lon, expected):
+    assert geohash_encode(lat, lon, precision=len(expected)) == expected
+
+
+@pytest.mark.parametrize("radius_m, since", [(150.0, None), (800.0, None), (2500.0, None), (2500.0, 600.0)])
+def test_query_radius_matches_brute_force(points, index, radius_m, since):
+    rng = np.random.default_rng(int(radius_m))
+    for lat, lon in zip(19.07 + rng.normal(scale=0.03, size=20), 72.87 + rng.normal(scale=0.03, size=20)):
+        expected = {
+            i for i, (p_lat, p_lon, timestamp) in enumerate(points)
+            if _distance_m(lat, lon, p_lat, p_lon) <= radius_m and (since is None or timestamp >= since)
+        }
+        results = index.query_radius(lat, lon, radius_m, since=since)
+
+        assert {item for item, _ in results} == expected
+        distances = [dist for _, dist in results]
+        assert distances == sorted(distances)
+
+
+def test_query_bbox_matches_brute_force(points, index):
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        min_lat, max_lat = sorted(19.07 + rng.normal(scale=0.03, size=2))
+        min_lon, max_lon = sorted(72.87 + rng.normal(scale=0.03, size=2))
+        since = float(rng.uniform(0, 1000))
+        expected = {
+            i for i, (lat, lon, timestamp) in enumerate(points)
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon and timestamp >= since
+        }
+        assert set(index.query_bbox(min_lat, min_lon, max_lat, max_lon, since=since)) == expected
+
+
+def test_drop_before(points):
+    index = GeohashIndex(precision=6)
+    for i, (lat, lon, timestamp) in enumerate(points):
+        index.insert(lat, lon, i, timestamp)
+
+    removed = index.drop_before(500.0)
+    assert removed == sum(timestamp < 500.0 for _, _, timestamp in points)
+    assert len(index) == len(points) - removed
+    assert set(index.query_bbox(-90, -180, 90, 180)) == {
+        i for i, (_, _, timestamp) in enumerate(points) if timestamp >= 500.0
+    }